@@ -13,10 +13,16 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import importlib.util
 import mimetypes
 import os
 import re
 import shutil
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import aclosing, nullcontext
 from typing import Optional
 
 # Replace smolagents imports with simple implementations
@@ -52,17 +58,25 @@ class MemoryStep:
 class MultiStepAgent:
     pass
 
+def is_action_step(step_log):
+    # smolagents' own ActionStep is not the stand-in class above
+    return isinstance(step_log, ActionStep) or type(step_log).__name__ == "ActionStep"
+
 def handle_agent_output_types(output):
     if isinstance(output, str):
         return AgentText(output)
     return output
 
+def render_for_display(answer):
+    """Render structured tool results as rich markdown; anything else as text."""
+    raw = answer.to_raw() if hasattr(answer, "to_raw") else answer
+    if hasattr(raw, "render"):
+        return raw.render("markdown")
+    return str(answer)
+
 def _is_package_available(package_name):
-    try:
-        __import__(package_name)
-        return True
-    except ImportError:
-        return False
+    # Look the package up without importing it; importing gradio takes seconds
+    return importlib.util.find_spec(package_name) is not None
 
 def pull_messages_from_step(
     step_log: MemoryStep,
@@ -70,7 +84,7 @@ def pull_messages_from_step(
     """Extract ChatMessage objects from agent steps with proper nesting"""
     import gradio as gr
 
-    if isinstance(step_log, ActionStep):
+    if is_action_step(step_log):
         # Output the step number
         step_number = f"Step {step_log.step_number}" if step_log.step_number is not None else ""
         yield {"role": "assistant", "content": f"**{step_number}**"}
@@ -149,7 +163,7 @@ def pull_messages_from_step(
 
         # Calculate duration and token information
         step_footnote = f"{step_number}"
-        if hasattr(step_log, "input_token_count") and hasattr(step_log, "output_token_count"):
+        if getattr(step_log, "input_token_count", None) is not None and getattr(step_log, "output_token_count", None) is not None:
             token_str = (
                 f" | Input-tokens:{step_log.input_token_count:,} | Output-tokens:{step_log.output_token_count:,}"
             )
@@ -158,19 +172,191 @@ def pull_messages_from_step(
             if step_log.duration:
                 step_duration = f" | Duration: {round(float(step_log.duration), 2)}"
                 step_footnote += step_duration
+        cache_status = getattr(getattr(step_log, "model_output_message", None), "cache_status", None)
+        if cache_status:
+            step_footnote += f" | LLM cache: {cache_status}"
         step_footnote = f"""<span style="color: #bbbbc2; font-size: 12px;">{step_footnote}</span> """
         yield {"role": "assistant", "content": f"{step_footnote}"}
         yield {"role": "assistant", "content": "-----"}
 
 
+class ChatTimings:
+    """
+    Time to first message and to the last message of recent chats, in milliseconds.
+    """
+
+    def __init__(self, window: int = 500):
+        self.first_message = deque(maxlen=window)
+        self.last_message = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, started: float, first: Optional[float]):
+        finished = time.perf_counter()
+        first = first or finished
+        with self._lock:
+            self.first_message.append((first - started) * 1000)
+            self.last_message.append((finished - started) * 1000)
+        print(f"Chat timing: first message after {(first - started) * 1000:.0f} ms, "
+              f"last after {(finished - started) * 1000:.0f} ms ({self.report()})")
+
+    @staticmethod
+    def percentile(values, fraction: float):
+        ordered = sorted(values)
+        return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+    def report(self):
+        with self._lock:
+            first, last = list(self.first_message), list(self.last_message)
+        return (f"first message p50 {self.percentile(first, 0.5):.0f} ms, p95 {self.percentile(first, 0.95):.0f} ms; "
+                f"last message p50 {self.percentile(last, 0.5):.0f} ms over {len(first)} chats")
+
+
+chat_timings = ChatTimings()
+
+
+def is_follow_up(agent, reset_agent_memory: bool = False):
+    """
+    Whether the task continues a conversation the agent remembers, so that
+    its answer may depend on earlier turns.
+    """
+    return not reset_agent_memory and any(type(step).__name__ == "TaskStep" for step in agent.memory.steps)
+
+
+def remember_reply(agent, task: str, answer: str):
+    """
+    Add a question answered without the agent to its memory, as a task and
+    its final answer, so that later turns can refer back to it.
+    """
+    from smolagents.memory import ActionStep as MemoryActionStep, TaskStep
+
+    now = time.time()
+    agent.memory.steps.append(TaskStep(task=task))
+    agent.memory.steps.append(MemoryActionStep(step_number=1, start_time=now, end_time=now, duration=0,
+                                               model_output=answer, action_output=answer))
+
+
+def quick_reply(task: str, answer_cache=None, intent_router=None, follow_up: bool = False):
+    """
+    Answer greetings, single-tool questions and near-duplicates of earlier
+    questions without the agent. Returns None when the agent is needed.
+    """
+    # Special handling for greetings
+    greeting_patterns = ["hi", "hello", "hey", "greetings", "howdy"]
+    if task.lower().strip() in greeting_patterns or task.lower().strip() + "!" in greeting_patterns:
+        return {"role": "assistant", "content": "Hello! I'm your USA Travel Guide Assistant. How can I help you plan your trip today? I can provide information about destinations, accommodation, transportation, attractions, and more!"}
+
+    # Only the first turn: "and the weather?" means nothing without the turns before it
+    if intent_router is not None and not follow_up:
+        routed = intent_router.answer(task)
+        if routed is not None:
+            return {"role": "assistant", "content": f"**Final answer:**\n{render_for_display(routed.result)}\n"}
+
+    # Follow-ups are never stored, and one that shares words with another chat's question is not a repeat of it
+    if answer_cache is not None and not follow_up:
+        cached = answer_cache.lookup(task)
+        if cached is not None:
+            return {"role": "assistant", "content": f"**Final answer** (cached answer to a similar question: \"{cached.task}\", {cached.similarity:.0%} match):\n{cached.answer}\n"}
+    return None
+
+
+def agent_messages(agent, task: str, reset_agent_memory: bool = False, additional_args: Optional[dict] = None, answer_cache=None):
+    """
+    Run the agent on the task and yield each step as chat messages as soon as
+    it finishes, then the final answer.
+    """
+    # Answers that may build on earlier turns are not reusable by other chats
+    follow_up = is_follow_up(agent, reset_agent_memory)
+        
+    # Run the agent on the task; the last item it yields is the answer. Only
+    # the steps of this run come back, however long the conversation is
+    response = None
+    for step_log in agent.run(task, stream=True, reset=reset_agent_memory, additional_args=additional_args):
+        response = step_log
+        if is_action_step(step_log) and getattr(agent.model, "last_input_token_count", None) is not None:
+            step_log.input_token_count = agent.model.last_input_token_count
+            step_log.output_token_count = agent.model.last_output_token_count
+        for message in pull_messages_from_step(step_log):
+            yield message
+            
+    # Runs that ended in an error (e.g. max steps reached) are not worth reusing
+    last_step = agent.memory.steps[-1] if agent.memory.steps else None
+    cache_answer = answer_cache is not None and not follow_up and getattr(last_step, "error", None) is None
+
+    # Final answer if available
+    if hasattr(agent, "final_answer") and agent.final_answer:
+        answer = render_for_display(agent.final_answer)
+        if cache_answer:
+            answer_cache.store(task, answer)
+        yield {"role": "assistant", "content": f"**Final answer:**\n{answer}\n"}
+    else:
+        # Include the response from agent.run as a fallback if final_answer isn't available
+        if response:
+            answer = render_for_display(response)
+            if cache_answer:
+                answer_cache.store(task, answer)
+            yield {"role": "assistant", "content": answer}
+        else:
+            yield {"role": "assistant", "content": "I processed your request, but couldn't generate a final answer. Can you provide more details or ask your question differently?"}
+
+
+def chat_messages(agent, task: str, reset_agent_memory: bool = False, additional_args: Optional[dict] = None, answer_cache=None, intent_router=None):
+    """
+    Answer the task without the agent when ``quick_reply`` can, otherwise
+    run the agent. Past the first turn of a conversation only greetings
+    skip it, since a follow-up like "what about hotels there?" needs the
+    earlier turns.
+    """
+    reply = quick_reply(task, answer_cache, intent_router, is_follow_up(agent, reset_agent_memory))
+    if reply is None:
+        yield from agent_messages(agent, task, reset_agent_memory, additional_args, answer_cache)
+        return
+    # A run that resets memory would drop the reply anyway, and another chat may be using the agent
+    if not reset_agent_memory:
+        remember_reply(agent, task, reply["content"])
+    yield reply
+
+
+def error_reply(e: Exception):
+    """
+    Log an agent failure and return a user-friendly message for it.
+    """
+    import traceback
+    error_details = traceback.format_exc()
+    print(f"Error in agent interaction: {str(e)}")
+    print(f"Error details: {error_details}")
+    
+    # Provide a user-friendly error message
+    if "final_answer" in str(e):
+        return {"role": "assistant", "content": "I'm having trouble processing your request. Let me try a simpler response: How can I help you plan your USA trip today?"}
+    return {"role": "assistant", "content": f"I encountered an error while processing your request. Please try again with a more specific travel-related question."}
+
+
+def report_http_pool(http_pool):
+    """
+    Log how many HTTP calls so far reused a pooled connection.
+    """
+    metrics = http_pool.metrics()
+    print(f"HTTP pool: {metrics['requests']} requests, {metrics['new_connections']} connections opened, "
+          f"{metrics['reuse_rate']:.0%} reused")
+
+
 def stream_to_gradio(
     agent,
     task: str,
     reset_agent_memory: bool = False,
     additional_args: Optional[dict] = None,
+    answer_cache=None,
+    intent_router=None,
+    http_pool=None,
 ):
     """
     Stream agent responses to Gradio.
+
+    With an ``intent_router``, single-tool questions are answered by calling
+    the tool directly. With an ``answer_cache``, a task that is a
+    near-duplicate of an earlier one is answered from the cache. Both skip
+    the agent. With an ``http_pool``, its connection reuse is logged after
+    each chat.
     """
     if not _is_package_available("gradio"):
         raise ModuleNotFoundError(
@@ -178,57 +364,79 @@ def stream_to_gradio(
         )
     import gradio as gr
 
+    started, first = time.perf_counter(), None
     try:
-        # Special handling for greetings
-        greeting_patterns = ["hi", "hello", "hey", "greetings", "howdy"]
-        if task.lower().strip() in greeting_patterns or task.lower().strip() + "!" in greeting_patterns:
-            yield {"role": "assistant", "content": "Hello! I'm your USA Travel Guide Assistant. How can I help you plan your trip today? I can provide information about destinations, accommodation, transportation, attractions, and more!"}
-            return
-        
-        # Actual implementation using the agent
-        if reset_agent_memory:
-            agent.memory.reset()
-            
-        # Run the agent on the task
-        response = agent.run(task, additional_args=additional_args)
-        
-        # Process each step from the agent's memory
-        for step_log in agent.memory.steps:
-            for message in pull_messages_from_step(step_log):
-                yield message
-                
-        # Final answer if available
-        if hasattr(agent, "final_answer") and agent.final_answer:
-            yield {"role": "assistant", "content": f"**Final answer:**\n{agent.final_answer}\n"}
-        else:
-            # Include the response from agent.run as a fallback if final_answer isn't available
-            if response:
-                yield {"role": "assistant", "content": f"{response}"}
-            else:
-                yield {"role": "assistant", "content": "I processed your request, but couldn't generate a final answer. Can you provide more details or ask your question differently?"}
+        for message in chat_messages(agent, task, reset_agent_memory, additional_args, answer_cache, intent_router):
+            first = first or time.perf_counter()
+            yield message
+        if http_pool is not None:
+            report_http_pool(http_pool)
         
     except Exception as e:
-        import traceback
-        error_details = traceback.format_exc()
-        print(f"Error in agent interaction: {str(e)}")
-        print(f"Error details: {error_details}")
-        
-        # Provide a user-friendly error message
-        if "final_answer" in str(e):
-            yield {"role": "assistant", "content": "I'm having trouble processing your request. Let me try a simpler response: How can I help you plan your USA trip today?"}
-        else:
-            yield {"role": "assistant", "content": f"I encountered an error while processing your request. Please try again with a more specific travel-related question."}
+        first = first or time.perf_counter()
+        yield error_reply(e)
+    chat_timings.record(started, first)
+
+
+async def astream_to_gradio(
+    runner,
+    task: str,
+    reset_agent_memory: bool = False,
+    additional_args: Optional[dict] = None,
+    answer_cache=None,
+    intent_router=None,
+    session_id: Optional[str] = None,
+    http_pool=None,
+):
+    """
+    Async version of ``stream_to_gradio`` that runs the task on the agent
+    ``runner`` (an ``AsyncAgentRunner``) keeps for ``session_id``, so many
+    sessions can wait on one event loop without sharing memory.
+    """
+    if not _is_package_available("gradio"):
+        raise ModuleNotFoundError(
+            "Please install 'gradio' extra to use the GradioUI: `pip install 'gradio'`"
+        )
+
+    started, first = time.perf_counter(), None
+    try:
+        # The session's agent tells whether this is a follow-up, so check it out before any quick reply
+        async with runner.agent(session_id) as agent:
+            # Closing the stream early must stop the run before the agent goes back
+            async with aclosing(runner.iterate(
+                lambda: chat_messages(agent, task, reset_agent_memory, additional_args, answer_cache, intent_router)
+            )) as messages:
+                async for message in messages:
+                    first = first or time.perf_counter()
+                    yield message
+        metrics = runner.metrics()
+        print(f"Agent pool: {metrics['in_use']} in use, {metrics['waiting']} waiting, "
+              f"{metrics['sessions']} sessions on {metrics['pool_size']} agents, "
+              f"{metrics['evicted'] + metrics['idle_evicted']} evicted")
+        if http_pool is not None:
+            report_http_pool(http_pool)
+
+    except Exception as e:
+        first = first or time.perf_counter()
+        yield error_reply(e)
+    chat_timings.record(started, first)
 
 
 class GradioUI:
     """A one-line interface to launch your agent in Gradio"""
 
-    def __init__(self, agent: MultiStepAgent, file_upload_folder: str | None = None):
+    def __init__(self, agent: MultiStepAgent, file_upload_folder: str | None = None, answer_cache=None, intent_router=None, runner=None, http_pool=None):
         if not _is_package_available("gradio"):
             raise ModuleNotFoundError(
                 "Please install 'gradio' extra to use the GradioUI: `pip install 'gradio'`"
             )
         self.agent = agent
+        self.answer_cache = answer_cache
+        self.intent_router = intent_router
+        # With an AsyncAgentRunner, chats run concurrently on pooled agents
+        self.runner = runner
+        # Optional HttpPool whose connection reuse is logged after each chat
+        self.http_pool = http_pool
         self.file_upload_folder = file_upload_folder
         if self.file_upload_folder is not None:
             if not os.path.exists(file_upload_folder):
@@ -239,7 +447,20 @@ class GradioUI:
 
         messages.append({"role": "user", "content": prompt})
         yield messages
-        for msg in stream_to_gradio(self.agent, task=prompt, reset_agent_memory=False):
+        # The single agent is shared by every chat, so each run starts afresh
+        for msg in stream_to_gradio(self.agent, task=prompt, reset_agent_memory=True,
+                                    answer_cache=self.answer_cache, intent_router=self.intent_router,
+                                    http_pool=self.http_pool):
+            messages.append(msg)
+            yield messages
+        yield messages
+
+    async def ainteract_with_agent(self, prompt, messages, session_id=None):
+        messages.append({"role": "user", "content": prompt})
+        yield messages
+        async for msg in astream_to_gradio(self.runner, task=prompt, reset_agent_memory=False,
+                                           answer_cache=self.answer_cache, intent_router=self.intent_router,
+                                           session_id=session_id, http_pool=self.http_pool):
             messages.append(msg)
             yield messages
         yield messages
@@ -303,38 +524,65 @@ class GradioUI:
             "",
         )
 
-    def launch(self, **kwargs):
-        import gradio as gr
+    def launch(self, bootstrap=None, **kwargs):
+        """Build the chat UI and serve it until the process stops.
 
-        with gr.Blocks() as demo:
-            stored_messages = gr.State([])
-            file_uploads_log = gr.State([])
-            chatbot = gr.Chatbot(
-                label="Agent",
-                avatar_images=(
-                    None,
-                    "https://huggingface.co/datasets/agents-course/course-images/resolve/main/en/communication/Alfred.png",
-                ),
-                scale=1,
-                type='messages'
-            )
-            # If an upload folder is provided, enable the upload feature
-            if self.file_upload_folder is not None:
-                upload_file = gr.File(label="Upload a file")
-                upload_status = gr.Textbox(label="Upload Status", interactive=False, visible=False)
-                upload_file.change(
-                    self.upload_file,
-                    [upload_file, file_uploads_log],
-                    [upload_status, file_uploads_log],
+        Args:
+            bootstrap: Startup timer of the app. When given, building and starting
+                the UI are timed as its "ui" stage, ``GET /ready`` answers readiness
+                probes, and the app is marked ready once the server is up.
+            **kwargs: Passed on to ``gr.Blocks.launch``.
+        """
+        with bootstrap.stage("ui") if bootstrap is not None else nullcontext():
+            import gradio as gr
+
+            with gr.Blocks() as demo:
+                stored_messages = gr.State([])
+                file_uploads_log = gr.State([])
+                # Called per browser session, so each chat keeps its own pooled agent
+                session_id = gr.State(lambda: uuid.uuid4().hex)
+                chatbot = gr.Chatbot(
+                    label="Agent",
+                    avatar_images=(
+                        None,
+                        "https://huggingface.co/datasets/agents-course/course-images/resolve/main/en/communication/Alfred.png",
+                    ),
+                    scale=1,
+                    type='messages'
+                )
+                # If an upload folder is provided, enable the upload feature
+                if self.file_upload_folder is not None:
+                    upload_file = gr.File(label="Upload a file")
+                    upload_status = gr.Textbox(label="Upload Status", interactive=False, visible=False)
+                    upload_file.change(
+                        self.upload_file,
+                        [upload_file, file_uploads_log],
+                        [upload_status, file_uploads_log],
+                    )
+                text_input = gr.Textbox(lines=1, label="Chat Message")
+                text_input.submit(
+                    self.log_user_message,
+                    [text_input, file_uploads_log],
+                    [stored_messages, text_input],
+                ).then(
+                    self.ainteract_with_agent if self.runner is not None else self.interact_with_agent,
+                    [stored_messages, chatbot, session_id] if self.runner is not None else [stored_messages, chatbot],
+                    [chatbot],
+                    # Async runs wait on the event loop, so Gradio need not serialize them
+                    concurrency_limit=None if self.runner is not None else "default",
                 )
-            text_input = gr.Textbox(lines=1, label="Chat Message")
-            text_input.submit(
-                self.log_user_message,
-                [text_input, file_uploads_log],
-                [stored_messages, text_input],
-            ).then(self.interact_with_agent, [stored_messages, chatbot], [chatbot])
 
-        demo.launch(debug=True, **kwargs)
+        if bootstrap is None:
+            demo.launch(debug=True, **kwargs)
+            return
+
+        # Serve the readiness probe from the UI's own server, and block only once it is up
+        app_kwargs = dict(kwargs.pop("app_kwargs", None) or {})
+        app_kwargs["routes"] = [*app_kwargs.get("routes", []), bootstrap.route()]
+        with bootstrap.stage("ui"):
+            demo.launch(prevent_thread_lock=True, app_kwargs=app_kwargs, **kwargs)
+        bootstrap.mark_ready()
+        demo.block_thread()
 
 
-__all__ = ["stream_to_gradio", "GradioUI"]
\ No newline at end of file
+__all__ = ["stream_to_gradio", "astream_to_gradio", "chat_timings", "GradioUI"]
\ No newline at end of file
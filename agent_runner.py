@@ -0,0 +1,254 @@
+"""Run many chat sessions concurrently from one event loop.
+
+smolagents agents are synchronous: ``agent.run`` blocks on every model and
+tool call, and an agent's memory belongs to one run at a time.
+:class:`AsyncAgentRunner` keeps a bounded pool of agents built by a factory.
+Each chat session checks out its own agent and keeps it between turns, so
+sessions never share memory or interpreter variables. An agent whose session
+has gone idle, or is the least recently used one when the pool is full, is
+reset and handed to the next session. The blocking run goes to a thread pool
+sized to the concurrency limit, so sessions wait on the event loop rather
+than holding a Gradio worker thread. Resetting an agent and dropping its
+archived turns run on that pool too, and finish before the agent or the
+session is used again.
+"""
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+
+def reset_agent(agent):
+    """Forget everything an agent kept from earlier runs: memory, state and interpreter variables."""
+    agent.memory.reset()
+    getattr(agent, "state", {}).clear()
+    executor = getattr(agent, "python_executor", None)
+    if executor is not None:
+        executor.state.clear()
+        getattr(executor, "custom_tools", {}).clear()
+
+
+class _Session:
+    def __init__(self, agent=None):
+        self.agent = agent
+        self.busy = False
+        self.last_used = time.monotonic()
+
+
+class AsyncAgentRunner:
+    """Pool of per-session agents driven from asyncio.
+
+    All pool state is changed on the event loop only.
+
+    Args:
+        agent_factory: Called with no arguments to build another agent. Agents
+            should share the model and tools so that each one stays cheap.
+        max_concurrency: Agent runs in flight at once; more sessions queue.
+        agents: Already built agents to seed the pool with.
+        max_agents: Agents the pool may hold; defaults to ``max_concurrency``.
+        idle_seconds: A session unused for this long gives its agent back.
+        archive: Optional ``StepArchive`` that older turns of a session are
+            moved to after each run.
+    """
+
+    def __init__(self, agent_factory, max_concurrency=32, agents=(), max_agents=None, idle_seconds=1800, archive=None):
+        self.agent_factory = agent_factory
+        self.max_concurrency = max_concurrency
+        self.max_agents = max(max_agents or max_concurrency, max_concurrency)
+        self.idle_seconds = idle_seconds
+        self.archive = archive
+        self._idle = list(agents)
+        self._created = len(self._idle)
+        self._sessions = OrderedDict()
+        # Agent -> (session_id, future) of the reset started when it was given back
+        self._cleanups = {}
+        self._semaphore = None
+        self._available = None
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="agent-run")
+        self.stats = {"runs": 0, "active": 0, "peak_active": 0, "waiting": 0, "total_wait_ms": 0.0,
+                      "evicted": 0, "idle_evicted": 0}
+
+    def _clean(self, session_id, agent):
+        reset_agent(agent)
+        if self.archive is not None and session_id is not None:
+            try:
+                self.archive.drop(session_id)
+            except Exception as e:
+                print(f"Error dropping archived steps of session {session_id}: {str(e)}")
+
+    def _release(self, session_id, agent):
+        """Start resetting ``agent`` on the runner's threads and put it back in the pool."""
+        cleanup = asyncio.get_running_loop().run_in_executor(self._pool, self._clean, session_id, agent)
+        self._cleanups[agent] = (session_id, cleanup)
+        self._idle.append(agent)
+
+    def _pending_cleanups(self, session_id, agent):
+        """Resets that must finish before ``session_id`` runs on ``agent``."""
+        pending = [self._cleanups.pop(agent)[1]] if agent in self._cleanups else []
+        if session_id is not None:
+            # The session's turns archived under its previous agent
+            pending += [cleanup for owner, cleanup in self._cleanups.values() if owner == session_id]
+        return pending
+
+    def _evict(self, session_id, reason):
+        session = self._sessions.pop(session_id)
+        self._release(session_id, session.agent)
+        self.stats[reason] += 1
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_seconds
+        for session_id, session in list(self._sessions.items()):
+            if not session.busy and session.agent is not None and session.last_used < cutoff:
+                self._evict(session_id, "idle_evicted")
+
+    def _evict_least_recent(self):
+        # Sessions are kept in order of last checkout
+        for session_id, session in self._sessions.items():
+            if not session.busy and session.agent is not None:
+                self._evict(session_id, "evicted")
+                return True
+        return False
+
+    async def _checkout(self, session_id):
+        async with self._available:
+            while True:
+                self._evict_idle()
+                session = self._sessions.get(session_id) if session_id is not None else None
+                if session is not None:
+                    # The same session sent another message; runs of one session take turns
+                    if not session.busy:
+                        break
+                elif self._idle or self._created < self.max_agents or self._evict_least_recent():
+                    session = _Session(self._idle.pop() if self._idle else None)
+                    if session.agent is None:
+                        self._created += 1
+                    if session_id is not None:
+                        self._sessions[session_id] = session
+                    break
+                await self._available.wait()
+            session.busy = True
+            if session_id is not None:
+                self._sessions.move_to_end(session_id)
+            pending = self._pending_cleanups(session_id, session.agent)
+        if pending:
+            try:
+                # Shielded: other checkouts may be waiting on the same reset
+                await asyncio.shield(asyncio.gather(*pending))
+            except BaseException:
+                await self._checkin(session_id, session, built=False)
+                raise
+        if session.agent is None:
+            try:
+                session.agent = await self.call(self.agent_factory)
+            except BaseException:
+                await self._checkin(session_id, session, built=False)
+                raise
+        return session
+
+    async def _checkin(self, session_id, session, built=True):
+        async with self._available:
+            session.busy = False
+            session.last_used = time.monotonic()
+            if not built:
+                self._created -= 1
+                self._sessions.pop(session_id, None)
+            elif session_id is None:
+                # Runs without a session leave nothing behind for the next one
+                self._release(None, session.agent)
+            self._available.notify_all()
+
+    @asynccontextmanager
+    async def agent(self, session_id=None):
+        """Check out the agent of ``session_id`` for one run.
+
+        Waits while ``max_concurrency`` runs are active, while the session's
+        previous run is still going, or while every agent is busy. Without a
+        ``session_id`` the run gets a freshly reset agent.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._available = asyncio.Condition()
+        started = time.perf_counter()
+        self.stats["waiting"] += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                session = await self._checkout(session_id)
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.stats["waiting"] -= 1
+        self.stats["total_wait_ms"] += (time.perf_counter() - started) * 1000
+        self.stats["active"] += 1
+        self.stats["peak_active"] = max(self.stats["peak_active"], self.stats["active"])
+        try:
+            yield session.agent
+        finally:
+            self.stats["active"] -= 1
+            self.stats["runs"] += 1
+            if self.archive is not None and session_id is not None:
+                try:
+                    await self.call(self.archive.archive, session_id, session.agent)
+                except Exception as e:
+                    print(f"Error archiving steps of session {session_id}: {str(e)}")
+            await self._checkin(session_id, session)
+            self._semaphore.release()
+
+    async def call(self, function, *args, **kwargs):
+        """Run a blocking ``function`` on the runner's threads and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, lambda: function(*args, **kwargs))
+
+    async def iterate(self, make_iterator):
+        """Consume a blocking iterator on the runner's threads, yielding each item as soon as it exists.
+
+        If the consumer stops early, the iterator is closed at its next item
+        and this waits for that, so the agent is never handed on mid-step.
+
+        Args:
+            make_iterator: Called on a runner thread to create the iterator.
+        """
+        loop = asyncio.get_running_loop()
+        items = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            iterator = iter(())
+            try:
+                iterator = iter(make_iterator())
+                for item in iterator:
+                    loop.call_soon_threadsafe(items.put_nowait, item)
+                    if stop.is_set():
+                        break
+            finally:
+                getattr(iterator, "close", lambda: None)()
+                loop.call_soon_threadsafe(items.put_nowait, done)
+
+        producer = loop.run_in_executor(self._pool, produce)
+        try:
+            while True:
+                item = await items.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            stop.set()
+            # Re-raises whatever the iterator raised
+            await producer
+
+    async def run(self, task, session_id=None, **kwargs):
+        """Run ``task`` on the agent of ``session_id`` and return its answer."""
+        async with self.agent(session_id) as agent:
+            return await self.call(agent.run, task, **kwargs)
+
+    def pool_size(self):
+        return self._created
+
+    def metrics(self):
+        """Pool counters plus a snapshot of agents in use and sessions holding one."""
+        return {**self.stats, "in_use": self.stats["active"], "sessions": len(self._sessions),
+                "pool_size": self._created, "idle_agents": len(self._idle)}
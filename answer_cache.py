@@ -0,0 +1,272 @@
+"""Near-duplicate answer cache for agent tasks.
+
+Users often reword the same question ("best hotels in austin on a budget"
+vs "budget hotels austin?"), and each one would run the full multi-step
+agent loop. :class:`AnswerCache` lowercases a task, drops filler words, cuts
+the remaining words into character shingles and MinHashes them. A banded
+LSH index then finds earlier tasks that are likely similar. Candidates are
+confirmed by the exact Jaccard similarity of their shingles, so the index
+only has to be fast, not exact.
+
+Tasks must also carry exactly the same guards, since a word or two can
+change the question while barely moving the shingles: the same numbers
+("2 people" is not "4 people"), the same word after "from" and "to"
+("new york to chicago" is not "chicago to new york"), the same negations
+("unsafe" is not "safe"), the same cities as resolved by the catalog
+("Chicago" is not "Austin", "NYC" is "New York") and the same other
+capitalized names ("Union Square" is not "Times Square").
+Tasks asking about the current time, weather or alerts are never cached,
+because their answers go stale long before an entry expires.
+"""
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+# Mersenne prime for the universal hash family; a * x stays below 2 ** 63
+_PRIME = (1 << 31) - 1
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset("""
+    a an and any are about at be can could do does for from give have how i in is it list
+    me my of on or our please show some tell the there to us want we what where which
+    with would you your
+""".split())
+
+# Words whose successor gives a task its direction
+_DIRECTIONS = ("from", "to")
+
+# Words that flip the meaning of a task; "don't" is read as "don" and "t"
+_NEGATIONS = frozenset("""
+    no not never without unsafe avoid except nor cannot cant don dont doesn doesnt isn isnt
+    aren arent won wont
+""".split())
+
+# Words and sentence ends of a task in their original case
+_NAME_TOKEN = re.compile(r"[A-Za-z0-9]+|[.!?]")
+
+_VOLATILE = frozenset("""
+    now today tonight current currently time weather forecast alert alerts
+""".split())
+
+CachedAnswer = namedtuple("CachedAnswer", ["task", "answer", "similarity"])
+
+
+def task_words(task):
+    """Lowercased words of ``task`` without filler words."""
+    return [word for word in _WORD.findall(task.lower()) if word not in _STOPWORDS]
+
+
+def proper_nouns(task):
+    """Lowercased capitalized words of ``task`` that are not filler words.
+
+    The first word of a sentence only counts when the next word is
+    capitalized too, as in "Times Square restaurants".
+    """
+    tokens = _NAME_TOKEN.findall(task)
+    names = set()
+    for position, token in enumerate(tokens):
+        word = token.lower()
+        if not token[0].isupper() or word in _STOPWORDS or word in _NEGATIONS:
+            continue
+        if position == 0 or tokens[position - 1] in ".!?":
+            following = tokens[position + 1] if position + 1 < len(tokens) else ""
+            if not following[:1].isupper():
+                continue
+        names.add(word)
+    return names
+
+
+def task_guards(task, places=()):
+    """Tokens two tasks must share exactly to be the same question.
+
+    Args:
+        task: The task text.
+        places: ``(city, span)`` pairs of the cities mentioned in the task,
+            as returned by ``TravelCatalog.find_cities``. Capitalized words of
+            a span are covered by its city and are not guards themselves.
+    """
+    words = _WORD.findall(task.lower())
+    guards = {word for word in words if word.isdigit()}
+    guards.update(f"{word}>{after}" for word, after in zip(words, words[1:]) if word in _DIRECTIONS)
+    guards.update(f"not:{word}" for word in words if word in _NEGATIONS)
+    place_words = set()
+    for city, span in places:
+        guards.add(f"city:{city}")
+        place_words.update(_WORD.findall(span.lower()))
+    guards.update(f"name:{name}" for name in proper_nouns(task) - place_words)
+    return frozenset(guards)
+
+
+def shingles(words, size=3):
+    """Character shingles of each word; words shorter than ``size`` are kept whole.
+
+    Shingling word by word makes the set independent of word order.
+    """
+    result = set()
+    for word in words:
+        if len(word) <= size:
+            result.add(word)
+        else:
+            result.update(word[i:i + size] for i in range(len(word) - size + 1))
+    return frozenset(result)
+
+
+class MinHasher:
+    """MinHash signatures of shingle sets.
+
+    Args:
+        num_perm: Signature length (number of hash functions).
+        seed: Seed of the hash function parameters.
+    """
+
+    def __init__(self, num_perm=64, seed=1):
+        generator = np.random.default_rng(seed)
+        self.a = generator.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self.b = generator.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set):
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingle_set), dtype=np.uint64,
+                             count=len(shingle_set))
+        # One row of hash values per permutation; the minimum of each row is its signature value
+        return ((self.a[:, None] * (hashes[None, :] % _PRIME) + self.b[:, None]) % _PRIME).min(axis=1)
+
+
+class AnswerCache:
+    """In-memory LSH index of final answers keyed by the task that produced them.
+
+    Args:
+        threshold: Minimum Jaccard similarity of two tasks' shingles for a hit.
+        bands: LSH bands; more bands find less similar candidates.
+        rows: Signature values per band; the signature length is bands * rows.
+        max_entries: Answers kept before the least recently used is evicted.
+        ttl_seconds: Age after which an answer is no longer served.
+        version: Optional callable; when its value changes (e.g. the catalog
+            was reloaded) every cached answer is dropped.
+        find_places: Optional callable returning the ``(city, span)`` pairs
+            mentioned in a task, e.g. ``TravelCatalog.find_cities``; tasks
+            must name the same cities to share an answer.
+    """
+
+    def __init__(self, threshold=0.8, bands=16, rows=4, max_entries=1000, ttl_seconds=3600, version=None,
+                 find_places=None):
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = rows
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._version = version
+        self._seen_version = version() if version is not None else None
+        self._find_places = find_places
+        self._hasher = MinHasher(bands * rows)
+        self._entries = OrderedDict()
+        self._buckets = [{} for _ in range(bands)]
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "skipped": 0, "stores": 0, "evictions": 0, "invalidations": 0}
+
+    def _features(self, task):
+        """Return ``(shingles, guards)`` of a task, or None if it must not be cached."""
+        words = task_words(task)
+        if not words or _VOLATILE.intersection(words):
+            return None
+        places = self._find_places(task) if self._find_places is not None else ()
+        return shingles(words), task_guards(task, places)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _check_version(self):
+        # Called with the lock held
+        if self._version is None:
+            return
+        version = self._version()
+        if version != self._seen_version:
+            self._seen_version = version
+            if self._entries:
+                self.stats["invalidations"] += 1
+                self._entries.clear()
+                self._buckets = [{} for _ in range(self.bands)]
+
+    def _remove(self, entry_id):
+        entry = self._entries.pop(entry_id)
+        for band, key in enumerate(entry["bands"]):
+            bucket = self._buckets[band][key]
+            bucket.discard(entry_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def lookup(self, task):
+        """Return the :class:`CachedAnswer` of the most similar earlier task, or None."""
+        features = self._features(task)
+        if features is None:
+            with self._lock:
+                self.stats["skipped"] += 1
+            return None
+        task_shingles, guards = features
+        band_keys = self._band_keys(self._hasher.signature(task_shingles))
+        now = time.monotonic()
+
+        with self._lock:
+            self._check_version()
+            candidates = set()
+            for band, key in enumerate(band_keys):
+                candidates.update(self._buckets[band].get(key, ()))
+            best, best_similarity = None, self.threshold
+            for entry_id in candidates:
+                entry = self._entries[entry_id]
+                if entry["expires_at"] <= now:
+                    self._remove(entry_id)
+                    continue
+                if entry["guards"] != guards:
+                    continue
+                similarity = len(task_shingles & entry["shingles"]) / len(task_shingles | entry["shingles"])
+                if similarity >= best_similarity:
+                    best, best_similarity = entry_id, similarity
+            if best is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(best)
+            self.stats["hits"] += 1
+            entry = self._entries[best]
+            return CachedAnswer(entry["task"], entry["answer"], best_similarity)
+
+    def store(self, task, answer):
+        """Remember the final answer of ``task``; uncacheable tasks are ignored."""
+        features = self._features(task)
+        if features is None:
+            return
+        task_shingles, guards = features
+        band_keys = self._band_keys(self._hasher.signature(task_shingles))
+
+        with self._lock:
+            self._check_version()
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = {
+                "task": task,
+                "answer": answer,
+                "shingles": task_shingles,
+                "guards": guards,
+                "bands": band_keys,
+                "expires_at": time.monotonic() + self.ttl_seconds,
+            }
+            for band, key in enumerate(band_keys):
+                self._buckets[band].setdefault(key, set()).add(entry_id)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._buckets = [{} for _ in range(self.bands)]
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
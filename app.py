@@ -1,14 +1,28 @@
-from smolagents import CodeAgent, DuckDuckGoSearchTool, HfApiModel, load_tool, tool, FinalAnswerTool
-from tools.final_answer import MemoryStep, final_answer
-import datetime
-import requests
-import pytz
-import yaml
-import json
 import os
-import time
-from dotenv import load_dotenv
-from Gradio_UI import GradioUI
+from bootstrap import Bootstrap
+
+# Time startup stage by stage against a budget; GET /ready answers 503 until the UI is serving
+bootstrap = Bootstrap(budget_seconds=float(os.getenv("STARTUP_BUDGET_SECONDS", "20")))
+
+with bootstrap.stage("imports"):
+    from smolagents import CodeAgent, DuckDuckGoSearchTool, HfApiModel, load_tool, tool
+    from tools.final_answer import final_answer
+    import datetime
+    import threading
+    import yaml
+    from dotenv import load_dotenv
+    from travel_catalog import get_catalog
+    from travel_catalog.budget import cheapest as cheapest_combination
+    from travel_catalog.geo import KM_PER_MILE
+    from travel_catalog.routes import OBJECTIVES as ROUTE_OBJECTIVES, format_duration
+    from tool_results import ToolResult, renderer
+    from llm_cache import CachingModel, CompletionCache
+    from memory_budget import CompactingModel
+    from tool_cache import DAY, HOUR, MINUTE, cached_tool, normalize_text
+    from concurrent_tools import enable_concurrent_tools
+    from agent_runner import AsyncAgentRunner
+    from http_pool import HttpPool
+    from lazy_tools import LazyTool
 
 
 load_dotenv()
@@ -24,6 +38,69 @@ os.environ["HF_TOKEN"] = HUGGING_FACE_TOKEN
 os.environ["HUGGINGFACE_HUB_TOKEN"] = HUGGING_FACE_TOKEN  # This is the most common environment variable name
 os.environ["HF_API_TOKEN"] = HUGGING_FACE_TOKEN
 
+# Pool and keep alive the connections of the model client, Hub downloads and web search
+with bootstrap.stage("http_pool"):
+    http_pool = HttpPool(
+        max_per_host=int(os.getenv("HTTP_POOL_PER_HOST", "32")),
+        max_hosts=int(os.getenv("HTTP_POOL_HOSTS", "10")),
+        connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5")),
+        read_timeout=float(os.getenv("HTTP_READ_TIMEOUT", "120")),
+        keepalive_seconds=float(os.getenv("HTTP_KEEPALIVE_SECONDS", "60")),
+        http2=os.getenv("HTTP2", "1") != "0",
+    )
+    http_pool.use_for_hub()
+
+# Build the shared travel catalog once at startup; every tool reads from it
+with bootstrap.stage("catalog"):
+    get_catalog()
+
+def city_key(location):
+    """Cache key form of a city argument, so 'Miami, FL' and 'miami' share entries."""
+    return get_catalog().resolve_city(location)
+
+def catalog_version():
+    # Part of every catalog tool's cache key, so a reloaded catalog is never served stale
+    return get_catalog().version
+
+def is_cacheable(result):
+    """Keep error messages out of tool caches so the next call retries."""
+    return not result.startswith(("Error", "Sorry"))
+
+# Forecasts come from the catalog's mock data, or from an Open-Meteo style API
+# (WEATHER_API_URL may point at weather_standin.py) with WEATHER_PROVIDER=open-meteo.
+# Either way they are cached per city for the hour, and weather calls that arrive
+# while another is in progress are fetched together
+weather_service = None
+weather_service_lock = threading.Lock()
+
+def get_weather_service():
+    """The weather service, built on the first forecast so that startup does not import it."""
+    global weather_service
+    if weather_service is None:
+        with weather_service_lock:
+            if weather_service is None:
+                from weather_provider import CatalogWeatherProvider, OpenMeteoProvider, WeatherService
+
+                if os.getenv("WEATHER_PROVIDER", "catalog") == "open-meteo":
+                    provider = OpenMeteoProvider(
+                        lambda city: get_catalog().gazetteer.center(city),
+                        base_url=os.getenv("WEATHER_API_URL", "https://api.open-meteo.com"),
+                        session=http_pool.session(),
+                        batch_size=int(os.getenv("WEATHER_BATCH_SIZE", "50")),
+                        timeout=float(os.getenv("WEATHER_TIMEOUT_SECONDS", "10")),
+                    )
+                    batch_window = float(os.getenv("WEATHER_BATCH_WINDOW_MS", "20")) / 1000
+                else:
+                    provider = CatalogWeatherProvider(get_catalog)
+                    batch_window = 0.0  # in-memory data gains nothing from batching
+                weather_service = WeatherService(
+                    provider,
+                    batch_window=batch_window,
+                    max_batch=int(os.getenv("WEATHER_BATCH_SIZE", "50")),
+                    version=catalog_version,
+                )
+    return weather_service
+
 # Current time in timezone tool
 @tool
 def get_current_time_in_timezone(timezone: str) -> str:
@@ -32,6 +109,8 @@ def get_current_time_in_timezone(timezone: str) -> str:
     Args:
         timezone: A string representing a valid US timezone (e.g., 'America/New_York', 'America/Chicago').
     """
+    import pytz
+
     try:
         # Create timezone object
         tz = pytz.timezone(timezone)
@@ -42,6 +121,7 @@ def get_current_time_in_timezone(timezone: str) -> str:
         return f"Error fetching time for timezone '{timezone}': {str(e)}"
 
 # Weather information tool with alert capabilities
+# Not memoized with cached_tool: weather_service already caches forecasts by city and hour
 @tool
 def get_weather_forecast(location: str) -> str:
     """Fetches current weather, forecast, and any weather alerts for a US location.
@@ -49,70 +129,46 @@ def get_weather_forecast(location: str) -> str:
     Args:
         location: A string representing a US city or place (e.g., 'New York, NY', 'Austin, TX')
     """
-    # In production: Use a weather API like OpenWeatherMap, Weather.gov (NWS), or AccuWeather
-    # This is a mock implementation for demonstration
     try:
-        # Check if there are any mock alerts for this location
-        weather_alerts = {
-            "miami": "Hurricane Warning: Category 2 hurricane approaching. Prepare for evacuation.",
-            "new orleans": "Flood Warning: Heavy rainfall expected over the next 48 hours.",
-            "los angeles": "Heat Advisory: Temperatures expected to reach 100°F over the next 3 days."
-        }
-
-        # Mock weather data
-        weather_data = {
-            "new york": {
-                "current": {"temp": 72, "condition": "Partly Cloudy", "humidity": 65},
-                "forecast": [
-                    {"day": "Tomorrow", "temp": 75, "condition": "Sunny"},
-                    {"day": "Day 2", "temp": 70, "condition": "Light Rain"},
-                    {"day": "Day 3", "temp": 68, "condition": "Cloudy"}
-                ]
-            },
-            "austin": {
-                "current": {"temp": 85, "condition": "Sunny", "humidity": 45},
-                "forecast": [
-                    {"day": "Tomorrow", "temp": 88, "condition": "Sunny"},
-                    {"day": "Day 2", "temp": 90, "condition": "Clear"},
-                    {"day": "Day 3", "temp": 89, "condition": "Partly Cloudy"}
-                ]
-            },
-            "chicago": {
-                "current": {"temp": 65, "condition": "Windy", "humidity": 55},
-                "forecast": [
-                    {"day": "Tomorrow", "temp": 63, "condition": "Partly Cloudy"},
-                    {"day": "Day 2", "temp": 58, "condition": "Rain"},
-                    {"day": "Day 3", "temp": 60, "condition": "Partly Cloudy"}
-                ]
-            }
-        }
-
-        # Normalize location
-        location_key = location.lower().split(",")[0].strip()
-
-        # Format response
-        response = f"Weather information for {location}:\n\n"
-
-        # Check for alerts first
-        if location_key in weather_alerts:
-            response += f"ALERT: {weather_alerts[location_key]}\n\n"
+        # Resolve aliases, state suffixes and typos to a catalog city
+        location_key = get_catalog().resolve_city(location)
 
-        # Add weather data if available
-        if location_key in weather_data:
-            current = weather_data[location_key]["current"]
-            response += f"Current: {current['temp']}°F, {current['condition']}, {current['humidity']}% humidity\n\nForecast:\n"
-
-            for day in weather_data[location_key]["forecast"]:
-                response += f"- {day['day']}: {day['temp']}°F, {day['condition']}\n"
-        else:
-            response += "Detailed weather data not available. In a real implementation, this would connect to a weather API."
-
-        return response
+        weather = get_weather_service().forecast(location_key) or {"alert": None, "current": None, "forecast": []}
+        return ToolResult("weather", {"location": location, **weather})
     except Exception as e:
         return f"Error fetching weather for '{location}': {str(e)}"
 
+@renderer("weather", "markdown")
+def render_weather_markdown(data):
+    parts = [f"Weather information for {data['location']}:\n\n"]
+    # Alerts come first
+    if data["alert"]:
+        parts.append(f"ALERT: {data['alert']}\n\n")
+    current = data["current"]
+    if current is not None:
+        parts.append(f"Current: {current['temp']}°F, {current['condition']}, {current['humidity']}% humidity\n\nForecast:\n")
+        for day in data["forecast"]:
+            parts.append(f"- {day['day']}: {day['temp']}°F, {day['condition']}\n")
+    else:
+        parts.append("Detailed weather data not available. In a real implementation, this would connect to a weather API.")
+    return "".join(parts)
+
+@renderer("weather", "compact")
+def render_weather_compact(data):
+    lines = [f"Weather {data['location']}"]
+    if data["alert"]:
+        lines.append(f"ALERT {data['alert']}")
+    current = data["current"]
+    if current is not None:
+        lines.append(f"now {current['temp']}F {current['condition']}, humidity {current['humidity']}%")
+        lines.append("; ".join(f"{day['day']} {day['temp']}F {day['condition']}" for day in data["forecast"]))
+    else:
+        lines.append("no detailed data")
+    return "\n".join(lines)
+
 # Budget estimation tool
 @tool
+@cached_tool(ttl_seconds=DAY, normalize={"destination": city_key}, version=catalog_version, cache_if=is_cacheable)
 def estimate_travel_budget(destination: str, num_people: int, num_days: int, accommodation_type: str = "budget") -> str:
     """Estimates a comprehensive travel budget for a US destination.
 
@@ -123,126 +179,12 @@ def estimate_travel_budget(destination: str, num_people: int, num_days: int, acc
         accommodation_type: Type of accommodation ('budget', 'mid-range', 'luxury')
     """
     try:
-        # Mock budget data for common US destinations
-        budget_data = {
-            "new york": {
-                "accommodation": {
-                    "budget": 150,    # Price per room per night
-                    "mid-range": 250,
-                    "luxury": 450
-                },
-                "food": {
-                    "budget": 40,     # Price per person per day
-                    "mid-range": 80,
-                    "luxury": 150
-                },
-                "local_transport": 15,  # Per person per day
-                "attractions": 25       # Per person per day
-            },
-            "los angeles": {
-                "accommodation": {
-                    "budget": 130,
-                    "mid-range": 230,
-                    "luxury": 400
-                },
-                "food": {
-                    "budget": 40,
-                    "mid-range": 75,
-                    "luxury": 140
-                },
-                "local_transport": 20,
-                "attractions": 30
-            },
-            "chicago": {
-                "accommodation": {
-                    "budget": 120,
-                    "mid-range": 220,
-                    "luxury": 350
-                },
-                "food": {
-                    "budget": 35,
-                    "mid-range": 70,
-                    "luxury": 130
-                },
-                "local_transport": 14,
-                "attractions": 22
-            },
-            "miami": {
-                "accommodation": {
-                    "budget": 130,
-                    "mid-range": 240,
-                    "luxury": 420
-                },
-                "food": {
-                    "budget": 38,
-                    "mid-range": 75,
-                    "luxury": 140
-                },
-                "local_transport": 16,
-                "attractions": 28
-            },
-            "austin": {
-                "accommodation": {
-                    "budget": 100,
-                    "mid-range": 180,
-                    "luxury": 320
-                },
-                "food": {
-                    "budget": 30,
-                    "mid-range": 65,
-                    "luxury": 120
-                },
-                "local_transport": 12,
-                "attractions": 20
-            },
-            "san francisco": {
-                "accommodation": {
-                    "budget": 160,
-                    "mid-range": 260,
-                    "luxury": 450
-                },
-                "food": {
-                    "budget": 45,
-                    "mid-range": 85,
-                    "luxury": 160
-                },
-                "local_transport": 18,
-                "attractions": 28
-            },
-            "nashville": {
-                "accommodation": {
-                    "budget": 110,
-                    "mid-range": 190,
-                    "luxury": 340
-                },
-                "food": {
-                    "budget": 35,
-                    "mid-range": 70,
-                    "luxury": 130
-                },
-                "local_transport": 12,
-                "attractions": 22
-            },
-            "new orleans": {
-                "accommodation": {
-                    "budget": 105,
-                    "mid-range": 185,
-                    "luxury": 330
-                },
-                "food": {
-                    "budget": 40,
-                    "mid-range": 75,
-                    "luxury": 140
-                },
-                "local_transport": 12,
-                "attractions": 20
-            }
-        }
+        catalog = get_catalog()
 
-        # Normalize destination
-        destination_key = destination.lower().split(",")[0].strip()
+        # Resolve aliases, state suffixes and typos to a catalog city
+        destination_key = catalog.resolve_city(destination)
 
-        if destination_key not in budget_data:
+        if destination_key not in catalog.budget:
             # Provide a generic budget if specific city isn't found
             return f"Specific budget data not available for {destination}. As a general estimate for a US city:\n\n" + \
                    f"For {num_people} people for {num_days} days with {accommodation_type} accommodations:\n" + \
@@ -254,35 +196,141 @@ def estimate_travel_budget(destination: str, num_people: int, num_days: int, acc
                    f"${(300 + 75 * num_people + 15 * num_people + 20 * num_people) * num_days}"
 
         # Calculate accommodation cost (assumes 2 people per room)
+        rates = catalog.budget[destination_key]
         rooms_needed = (num_people + 1) // 2  # Round up division
-        accommodation_cost = budget_data[destination_key]["accommodation"][accommodation_type] * rooms_needed * num_days
-
-        # Calculate food cost
-        food_cost = budget_data[destination_key]["food"][accommodation_type] * num_people * num_days
-
-        # Calculate transportation and attractions costs
-        transport_cost = budget_data[destination_key]["local_transport"] * num_people * num_days
-        attractions_cost = budget_data[destination_key]["attractions"] * num_people * num_days
+        costs = {
+            "accommodation": rates["accommodation"][accommodation_type] * rooms_needed * num_days,
+            "food": rates["food"][accommodation_type] * num_people * num_days,
+            "local_transport": rates["local_transport"] * num_people * num_days,
+            "attractions": rates["attractions"] * num_people * num_days,
+        }
 
-        # Calculate total cost
-        total_cost = accommodation_cost + food_cost + transport_cost + attractions_cost
+        return ToolResult("budget", {
+            "destination": destination,
+            "people": num_people,
+            "days": num_days,
+            "level": accommodation_type,
+            "rooms": rooms_needed,
+            "rates": {
+                "accommodation": rates["accommodation"][accommodation_type],
+                "food": rates["food"][accommodation_type],
+                "local_transport": rates["local_transport"],
+                "attractions": rates["attractions"],
+            },
+            "costs": costs,
+            "total": sum(costs.values()),
+        })
+    except Exception as e:
+        return f"Error calculating budget: {str(e)}"
 
-        # Format the response
-        response = f"Estimated Budget for {num_people} people in {destination} for {num_days} days ({accommodation_type} level):\n\n"
-        response += f"🏨 Accommodation: ${accommodation_cost} (${budget_data[destination_key]['accommodation'][accommodation_type]} per room × {rooms_needed} room(s) × {num_days} nights)\n\n"
-        response += f"🍽️ Food: ${food_cost} (${budget_data[destination_key]['food'][accommodation_type]} per person per day × {num_people} people × {num_days} days)\n\n"
-        response += f"🚌 Local Transportation: ${transport_cost} (${budget_data[destination_key]['local_transport']} per person per day × {num_people} people × {num_days} days)\n\n"
-        response += f"🎟️ Attractions: ${attractions_cost} (${budget_data[destination_key]['attractions']} per person per day × {num_people} people × {num_days} days)\n\n"
-        response += f"💰 Total Estimated Cost: ${total_cost}\n\n"
-        response += "Note: This is a base estimate. Actual costs may vary based on season, specific accommodations, dining preferences, and activities chosen."
+@renderer("budget", "markdown")
+def render_budget_markdown(data):
+    rates, costs = data["rates"], data["costs"]
+    people, days = data["people"], data["days"]
+    return "".join([
+        f"Estimated Budget for {people} people in {data['destination']} for {days} days ({data['level']} level):\n\n",
+        f"🏨 Accommodation: ${costs['accommodation']} (${rates['accommodation']} per room × {data['rooms']} room(s) × {days} nights)\n\n",
+        f"🍽️ Food: ${costs['food']} (${rates['food']} per person per day × {people} people × {days} days)\n\n",
+        f"🚌 Local Transportation: ${costs['local_transport']} (${rates['local_transport']} per person per day × {people} people × {days} days)\n\n",
+        f"🎟️ Attractions: ${costs['attractions']} (${rates['attractions']} per person per day × {people} people × {days} days)\n\n",
+        f"💰 Total Estimated Cost: ${data['total']}\n\n",
+        "Note: This is a base estimate. Actual costs may vary based on season, specific accommodations, dining preferences, and activities chosen.",
+    ])
+
+@renderer("budget", "compact")
+def render_budget_compact(data):
+    rates, costs = data["rates"], data["costs"]
+    return "\n".join([
+        f"Budget {data['destination']}, {data['people']} people, {data['days']} days, {data['level']}: total ${data['total']}",
+        f"lodging ${costs['accommodation']} ({data['rooms']} room x ${rates['accommodation']}/night)",
+        f"food ${costs['food']} (${rates['food']}/person/day)",
+        f"local transport ${costs['local_transport']} (${rates['local_transport']}/person/day)",
+        f"attractions ${costs['attractions']} (${rates['attractions']}/person/day)",
+        "base estimate; varies by season and choices",
+    ])
+
+# Batch budget comparison tool
+@tool
+@cached_tool(ttl_seconds=DAY, normalize={"destinations": normalize_text, "accommodation_types": normalize_text}, version=catalog_version, cache_if=is_cacheable)
+def compare_travel_budgets(destinations: str, party_sizes: str = "2", day_counts: str = "3", accommodation_types: str = "budget,mid-range,luxury") -> str:
+    """Compares estimated total trip costs across several destinations, party sizes, trip lengths and accommodation levels in one call.
 
-        return response
+    Args:
+        destinations: Comma-separated US cities (e.g., 'New York, Austin, Miami')
+        party_sizes: Comma-separated numbers of travelers (e.g., '1,2,4')
+        day_counts: Comma-separated trip lengths in days (e.g., '3,5,7')
+        accommodation_types: Comma-separated levels from 'budget', 'mid-range', 'luxury'
+    """
+    try:
+        catalog = get_catalog()
+
+        # Parse the comparison axes, keeping the user's spelling of each city
+        names = {}
+        for destination in destinations.split(","):
+            if destination.strip():
+                names.setdefault(catalog.resolve_city(destination), destination.strip())
+        people = [int(p) for p in party_sizes.split(",") if p.strip()]
+        days = [int(n) for n in day_counts.split(",") if n.strip()]
+        tiers = [t.strip().lower() for t in accommodation_types.split(",") if t.strip()]
+
+        rates = catalog.budget_rates
+        rate_rows, known, unknown = rates.rows(list(names))
+        if not known:
+            return f"Specific budget data not available for {destinations}. Try estimate_travel_budget for a general estimate."
+        if not people or not days or min(people) < 1 or min(days) < 1:
+            return "Party sizes and day counts must be positive whole numbers."
+
+        # One broadcast computes every destination x party x days x tier combination
+        totals = rates.estimate(rate_rows, people, days, rates.columns(tiers))["total"]
+
+        lines = []
+        for d, city in enumerate(known):
+            for p, party in enumerate(people):
+                for n, length in enumerate(days):
+                    lines.append([names[city], party, length, [int(cost) for cost in totals[d, p, n]]])
+
+        d, p, n, t = cheapest_combination(totals)
+        return ToolResult("budget_comparison", {
+            "tiers": tiers,
+            "rows": lines,
+            "cheapest": {"destination": names[known[d]], "people": people[p], "days": days[n],
+                         "level": tiers[t], "total": int(totals[d, p, n, t])},
+            "unknown": [names[city] for city in unknown],
+        })
     except Exception as e:
-        return f"Error calculating budget: {str(e)}"
+        return f"Error comparing budgets: {str(e)}"
+
+@renderer("budget_comparison", "markdown")
+def render_budget_comparison_markdown(data):
+    tiers = data["tiers"]
+    lines = [f"Estimated total trip cost in USD ({len(data['rows']) * len(tiers)} combinations):", ""]
+    lines.append("| Destination | People | Days | " + " | ".join(tiers) + " |")
+    lines.append("|---|---|---|" + "---|" * len(tiers))
+    for name, party, length, costs in data["rows"]:
+        lines.append(f"| {name} | {party} | {length} | " + " | ".join(f"{cost:,}" for cost in costs) + " |")
+
+    cheapest = data["cheapest"]
+    lines.append("")
+    lines.append(f"Cheapest: {cheapest['destination']}, {cheapest['people']} people, {cheapest['days']} days, {cheapest['level']}: ${cheapest['total']:,}")
+    if data["unknown"]:
+        lines.append(f"No budget data for: {', '.join(data['unknown'])}")
+    return "\n".join(lines)
+
+@renderer("budget_comparison", "compact")
+def render_budget_comparison_compact(data):
+    lines = ["Trip cost USD: destination,people,days," + ",".join(data["tiers"])]
+    for name, party, length, costs in data["rows"]:
+        lines.append(f"{name},{party},{length}," + ",".join(str(cost) for cost in costs))
+    cheapest = data["cheapest"]
+    lines.append(f"cheapest: {cheapest['destination']}, {cheapest['people']} people, {cheapest['days']} days, {cheapest['level']} ${cheapest['total']}")
+    if data["unknown"]:
+        lines.append(f"no data: {', '.join(data['unknown'])}")
+    return "\n".join(lines)
 
 # Hotel recommendation tool
 @tool
-def find_hotels(location: str, check_in: str, check_out: str, num_people: int, budget_level: str, preferences: str = "") -> str:
+@cached_tool(ttl_seconds=HOUR, normalize={"location": city_key, "preferences": normalize_text}, version=catalog_version, cache_if=is_cacheable)
+def find_hotels(location: str, check_in: str, check_out: str, num_people: int, budget_level: str, preferences: str = "", max_price: float = 0, min_rating: float = 0, sort_by: str = "price", limit: int = 5) -> str:
     """Finds hotel accommodations based on traveler preferences.
 
     Args:
@@ -291,221 +339,97 @@ def find_hotels(location: str, check_in: str, check_out: str, num_people: int, b
         check_out: Check-out date (YYYY-MM-DD)
         num_people: Number of guests
         budget_level: 'budget', 'mid-range', or 'luxury'
-        preferences: String of comma-separated preferences (e.g., 'breakfast,pet-friendly,pool')
+        preferences: String of comma-separated amenities or room types (e.g., 'breakfast,pet-friendly,pool,gym,spa,wifi,king')
+        max_price: Maximum price per night in USD (0 for no limit)
+        min_rating: Minimum guest rating out of 5 (0 for no minimum)
+        sort_by: Rank results by 'price' (cheapest first) or 'rating' (best rated first)
+        limit: Maximum number of hotels to return
     """
     try:
+        catalog = get_catalog()
+
         # Parse preferences
         pref_list = [p.strip().lower() for p in preferences.split(",") if p.strip()]
 
-        # Mock hotel database
-        hotel_db = {
-            "new york": [
-                {
-                    "name": "Budget Inn NYC",
-                    "level": "budget",
-                    "price": 129,
-                    "rating": 3.5,
-                    "features": ["wifi", "air conditioning"],
-                    "breakfast": False,
-                    "pet_friendly": False,
-                    "check_in": "3:00 PM",
-                    "check_out": "11:00 AM",
-                    "deposit": "First night's stay",
-                    "cancellation": "24 hours before check-in",
-                    "address": "123 Budget St, New York, NY",
-                    "room_types": ["Queen", "Double Twin"]
-                },
-                {
-                    "name": "Midtown Comfort Hotel",
-                    "level": "mid-range",
-                    "price": 229,
-                    "rating": 4.2,
-                    "features": ["wifi", "gym", "air conditioning"],
-                    "breakfast": True,
-                    "pet_friendly": True,
-                    "pet_fee": 50,
-                    "check_in": "4:00 PM",
-                    "check_out": "12:00 PM",
-                    "deposit": "First night's stay",
-                    "cancellation": "48 hours before check-in",
-                    "address": "456 Midtown Ave, New York, NY",
-                    "room_types": ["Queen", "King", "Double Queen"]
-                },
-                {
-                    "name": "Grand Manhattan Hotel",
-                    "level": "luxury",
-                    "price": 450,
-                    "rating": 4.8,
-                    "features": ["wifi", "spa", "gym", "pool", "concierge", "room service"],
-                    "breakfast": True,
-                    "pet_friendly": True,
-                    "pet_fee": 100,
-                    "check_in": "3:00 PM",
-                    "check_out": "12:00 PM",
-                    "deposit": "First night's stay",
-                    "cancellation": "72 hours before check-in",
-                    "address": "789 Luxury Blvd, New York, NY",
-                    "room_types": ["King", "Junior Suite", "Executive Suite"]
-                }
-            ],
-            "chicago": [
-                {
-                    "name": "Windy City Budget Stay",
-                    "level": "budget",
-                    "price": 99,
-                    "rating": 3.6,
-                    "features": ["wifi", "air conditioning"],
-                    "breakfast": False,
-                    "pet_friendly": False,
-                    "check_in": "3:00 PM",
-                    "check_out": "11:00 AM",
-                    "deposit": "First night's stay",
-                    "cancellation": "24 hours before check-in",
-                    "address": "123 Economy Ave, Chicago, IL",
-                    "room_types": ["Queen", "Double Twin"]
-                },
-                {
-                    "name": "Lakeside Inn",
-                    "level": "mid-range",
-                    "price": 189,
-                    "rating": 4.3,
-                    "features": ["wifi", "gym", "air conditioning", "restaurant"],
-                    "breakfast": True,
-                    "pet_friendly": True,
-                    "pet_fee": 40,
-                    "check_in": "3:00 PM",
-                    "check_out": "12:00 PM",
-                    "deposit": "First night's stay",
-                    "cancellation": "48 hours before check-in",
-                    "address": "456 Lakeview Dr, Chicago, IL",
-                    "room_types": ["Queen", "King", "Double Queen"]
-                },
-                {
-                    "name": "The Chicago Grand Hotel",
-                    "level": "luxury",
-                    "price": 350,
-                    "rating": 4.7,
-                    "features": ["wifi", "spa", "gym", "pool", "concierge", "room service"],
-                    "breakfast": True,
-                    "pet_friendly": True,
-                    "pet_fee": 75,
-                    "check_in": "4:00 PM",
-                    "check_out": "12:00 PM",
-                    "deposit": "First night's stay",
-                    "cancellation": "72 hours before check-in",
-                    "address": "789 Magnificent Mile, Chicago, IL",
-                    "room_types": ["King", "Junior Suite", "Executive Suite"]
-                }
-            ],
-            "austin": [
-                {
-                    "name": "Austin Budget Inn",
-                    "level": "budget",
-                    "price": 89,
-                    "rating": 3.4,
-                    "features": ["wifi", "air conditioning", "free parking"],
-                    "breakfast": False,
-                    "pet_friendly": True,
-                    "pet_fee": 25,
-                    "check_in": "3:00 PM",
-                    "check_out": "11:00 AM",
-                    "deposit": "First night's stay",
-                    "cancellation": "24 hours before check-in",
-                    "address": "123 Budget Ln, Austin, TX",
-                    "room_types": ["Queen", "Double Twin"]
-                },
-                {
-                    "name": "Riverside Hotel Austin",
-                    "level": "mid-range",
-                    "price": 169,
-                    "rating": 4.3,
-                    "features": ["wifi", "pool", "gym", "air conditioning", "restaurant"],
-                    "breakfast": True,
-                    "pet_friendly": True,
-                    "pet_fee": 35,
-                    "check_in": "3:00 PM",
-                    "check_out": "12:00 PM",
-                    "deposit": "First night's stay",
-                    "cancellation": "48 hours before check-in",
-                    "address": "456 Riverside Dr, Austin, TX",
-                    "room_types": ["Queen", "King", "Double Queen"]
-                },
-                {
-                    "name": "Austin Luxury Resort",
-                    "level": "luxury",
-                    "price": 320,
-                    "rating": 4.6,
-                    "features": ["wifi", "spa", "gym", "pool", "concierge", "room service", "golf"],
-                    "breakfast": True,
-                    "pet_friendly": True,
-                    "pet_fee": 50,
-                    "check_in": "4:00 PM",
-                    "check_out": "11:00 AM",
-                    "deposit": "50% of total stay",
-                    "cancellation": "72 hours before check-in",
-                    "address": "789 Luxury Way, Austin, TX",
-                    "room_types": ["King", "Junior Suite", "Executive Suite"]
-                }
-            ]
-        }
-
-        # Normalize location
-        location_key = location.lower().split(",")[0].strip()
+        # Resolve aliases, state suffixes and typos to a catalog city
+        location_key = catalog.resolve_city(location)
 
-        if location_key not in hotel_db:
+        if location_key not in catalog.hotel_indexes:
             return f"Hotel information not available for {location}. In a real implementation, this would connect to a hotel API."
 
-        # Filter hotels by budget level
-        matching_hotels = [h for h in hotel_db[location_key] if h["level"] == budget_level]
-
-        # Filter by preferences if provided
-        if "breakfast" in pref_list:
-            matching_hotels = [h for h in matching_hotels if h.get("breakfast", False)]
-
-        if "pet-friendly" in pref_list:
-            matching_hotels = [h for h in matching_hotels if h.get("pet_friendly", False)]
-
-        if "pool" in pref_list:
-            matching_hotels = [h for h in matching_hotels if "pool" in h.get("features", [])]
+        # Resolve every preference against the city's attribute bitsets
+        hotel_index = catalog.hotel_indexes[location_key]
+        amenities, room_types, unknown_prefs = hotel_index.resolve_preferences(pref_list)
+        matching_hotels = hotel_index.search(
+            level=budget_level,
+            amenities=amenities,
+            room_types=room_types,
+            max_price=max_price if max_price and max_price > 0 else None,
+            min_rating=min_rating if min_rating and min_rating > 0 else None,
+            sort_by=sort_by,
+            limit=limit,
+        )
 
         # Prepare response
         if not matching_hotels:
             return f"No hotels found in {location} matching your criteria. Try adjusting your preferences or budget level."
 
-        # Format response
-        response = f"Hotels in {location} ({budget_level}):\n\n"
-
-        for hotel in matching_hotels:
-            response += f"🏨 {hotel['name']} - ${hotel['price']} per night\n"
-            response += f"⭐ Rating: {hotel['rating']}/5\n"
-            response += f"📍 Address: {hotel['address']}\n"
-
-            features_str = ", ".join(hotel['features'])
-            response += f"✨ Features: {features_str}\n"
-
-            room_types_str = ", ".join(hotel['room_types'])
-            response += f"🛏️ Room Types: {room_types_str}\n"
-
-            response += f"🕒 Check-in: {hotel['check_in']}, Check-out: {hotel['check_out']}\n"
-
-            if hotel.get("breakfast", False):
-                response += "🍳 Breakfast included\n"
-
-            if hotel.get("pet_friendly", False):
-                response += f"🐾 Pet-friendly (Fee: ${hotel.get('pet_fee', 0)})\n"
-
-            response += f"💰 Deposit: {hotel['deposit']}\n"
-            response += f"❌ Cancellation: {hotel['cancellation']}\n"
-
-            response += "\n"
-
-        return response
+        return ToolResult("hotels", {
+            "location": location,
+            "level": budget_level,
+            "hotels": matching_hotels,
+            "ignored_preferences": unknown_prefs,
+        })
     except Exception as e:
         return f"Error finding hotels: {str(e)}"
 
+@renderer("hotels", "markdown")
+def render_hotels_markdown(data):
+    parts = [f"Hotels in {data['location']} ({data['level']}):\n\n"]
+    for hotel in data["hotels"]:
+        parts.append(f"🏨 {hotel['name']} - ${hotel['price']} per night\n")
+        parts.append(f"⭐ Rating: {hotel['rating']}/5\n")
+        parts.append(f"📍 Address: {hotel['address']}\n")
+        parts.append(f"✨ Features: {', '.join(hotel['features'])}\n")
+        parts.append(f"🛏️ Room Types: {', '.join(hotel['room_types'])}\n")
+        parts.append(f"🕒 Check-in: {hotel['check_in']}, Check-out: {hotel['check_out']}\n")
+        if hotel.get("breakfast", False):
+            parts.append("🍳 Breakfast included\n")
+        if hotel.get("pet_friendly", False):
+            parts.append(f"🐾 Pet-friendly (Fee: ${hotel.get('pet_fee', 0)})\n")
+        parts.append(f"💰 Deposit: {hotel['deposit']}\n")
+        parts.append(f"❌ Cancellation: {hotel['cancellation']}\n")
+        parts.append("\n")
+    if data["ignored_preferences"]:
+        parts.append(f"Note: no hotels here list {', '.join(data['ignored_preferences'])}, so those preferences were ignored.\n")
+    return "".join(parts)
+
+@renderer("hotels", "compact")
+def render_hotels_compact(data):
+    lines = [f"Hotels {data['location']} ({data['level']}):"]
+    for hotel in data["hotels"]:
+        extras = []
+        if hotel.get("breakfast", False):
+            extras.append("breakfast")
+        if hotel.get("pet_friendly", False):
+            extras.append(f"pets ${hotel.get('pet_fee', 0)}")
+        lines.append(" | ".join([
+            f"{hotel['name']} ${hotel['price']}/night {hotel['rating']}/5",
+            hotel["address"],
+            ", ".join(list(hotel["features"]) + extras),
+            "rooms: " + ", ".join(hotel["room_types"]),
+            f"in {hotel['check_in']} out {hotel['check_out']}",
+            f"deposit: {hotel['deposit']}",
+            f"cancel: {hotel['cancellation']}",
+        ]))
+    if data["ignored_preferences"]:
+        lines.append(f"ignored preferences: {', '.join(data['ignored_preferences'])}")
+    return "\n".join(lines)
+
 # Restaurant recommendation tool
 @tool
-def find_restaurants(location: str, cuisine_type: str = "", dietary_preferences: str = "", price_range: str = "", near_address: str = "") -> str:
+@cached_tool(ttl_seconds=HOUR, normalize={"location": city_key, "cuisine_type": normalize_text, "dietary_preferences": normalize_text, "near_address": normalize_text}, version=catalog_version, cache_if=is_cacheable)
+def find_restaurants(location: str, cuisine_type: str = "", dietary_preferences: str = "", price_range: str = "", near_address: str = "", limit: int = 5) -> str:
     """Finds restaurants based on location and dining preferences.
 
     Args:
@@ -514,289 +438,195 @@ def find_restaurants(location: str, cuisine_type: str = "", dietary_preferences:
         dietary_preferences: Dietary restrictions (e.g., 'vegetarian', 'halal', 'gluten-free')
         price_range: Budget level ('$', '$$', '$$$', '$$$$')
         near_address: Optional address to find nearby restaurants
+        limit: Maximum number of restaurants to return (nearest first with near_address, else best rated first)
     """
     try:
-        # Mock restaurant database
-        restaurant_db = {
-            "new york": [
-                {
-                    "name": "Little Italy Pizzeria",
-                    "cuisine": "Italian",
-                    "price_range": "$$",
-                    "rating": 4.3,
-                    "dietary_options": ["vegetarian"],
-                    "signature_dish": "Margherita Pizza",
-                    "address": "123 Little Italy St, New York, NY",
-                    "hours": "11:00 AM - 10:00 PM"
-                },
-                {
-                    "name": "Golden Dragon",
-                    "cuisine": "Chinese",
-                    "price_range": "$$",
-                    "rating": 4.1,
-                    "dietary_options": ["vegetarian"],
-                    "signature_dish": "Peking Duck",
-                    "address": "456 Chinatown Ave, New York, NY",
-                    "hours": "11:30 AM - 11:00 PM"
-                },
-                {
-                    "name": "Taj Mahal",
-                    "cuisine": "Indian",
-                    "price_range": "$$",
-                    "rating": 4.4,
-                    "dietary_options": ["vegetarian", "halal"],
-                    "signature_dish": "Butter Chicken",
-                    "address": "789 Curry Row, New York, NY",
-                    "hours": "12:00 PM - 10:30 PM"
-                },
-                {
-                    "name": "Le Bernardin",
-                    "cuisine": "French",
-                    "price_range": "$$$$",
-                    "rating": 4.8,
-                    "dietary_options": [],
-                    "signature_dish": "Seafood Tasting Menu",
-                    "address": "155 W 51st St, New York, NY",
-                    "hours": "5:00 PM - 10:00 PM"
-                },
-                {
-                    "name": "Green Garden",
-                    "cuisine": "Vegan",
-                    "price_range": "$$",
-                    "rating": 4.2,
-                    "dietary_options": ["vegetarian", "vegan", "gluten-free"],
-                    "signature_dish": "Buddha Bowl",
-                    "address": "321 Healthy Ave, New York, NY",
-                    "hours": "10:00 AM - 9:00 PM"
-                }
-            ],
-            "austin": [
-                {
-                    "name": "Texas BBQ House",
-                    "cuisine": "American",
-                    "price_range": "$$",
-                    "rating": 4.5,
-                    "dietary_options": [],
-                    "signature_dish": "Beef Brisket",
-                    "address": "123 BBQ Lane, Austin, TX",
-                    "hours": "11:00 AM - 10:00 PM"
-                },
-                {
-                    "name": "Taco Heaven",
-                    "cuisine": "Mexican",
-                    "price_range": "$",
-                    "rating": 4.4,
-                    "dietary_options": ["vegetarian"],
-                    "signature_dish": "Street Tacos",
-                    "address": "456 Taco St, Austin, TX",
-                    "hours": "10:00 AM - 11:00 PM"
-                },
-                {
-                    "name": "Sushi Ko",
-                    "cuisine": "Japanese",
-                    "price_range": "$$$",
-                    "rating": 4.6,
-                    "dietary_options": ["gluten-free"],
-                    "signature_dish": "Omakase",
-                    "address": "789 Sushi Blvd, Austin, TX",
-                    "hours": "12:00 PM - 10:30 PM"
-                },
-                {
-                    "name": "Veggie Paradise",
-                    "cuisine": "Vegetarian",
-                    "price_range": "$$",
-                    "rating": 4.2,
-                    "dietary_options": ["vegetarian", "vegan", "gluten-free"],
-                    "signature_dish": "Impossible Burger",
-                    "address": "101 Green St, Austin, TX",
-                    "hours": "11:00 AM - 9:00 PM"
-                },
-                {
-                    "name": "Halal Grill",
-                    "cuisine": "Middle Eastern",
-                    "price_range": "$$",
-                    "rating": 4.3,
-                    "dietary_options": ["halal"],
-                    "signature_dish": "Lamb Kebab",
-                    "address": "202 Halal Way, Austin, TX",
-                    "hours": "11:00 AM - 10:00 PM"
-                }
-            ],
-            "chicago": [
-                {
-                    "name": "Deep Dish Heaven",
-                    "cuisine": "American",
-                    "price_range": "$$",
-                    "rating": 4.6,
-                    "dietary_options": ["vegetarian"],
-                    "signature_dish": "Chicago Deep Dish Pizza",
-                    "address": "123 Pizza Ave, Chicago, IL",
-                    "hours": "11:00 AM - 11:00 PM"
-                },
-                {
-                    "name": "Windy City Steakhouse",
-                    "cuisine": "American",
-                    "price_range": "$$$$",
-                    "rating": 4.7,
-                    "dietary_options": [],
-                    "signature_dish": "Dry-aged Ribeye",
-                    "address": "456 Steak Blvd, Chicago, IL",
-                    "hours": "5:00 PM - 10:30 PM"
-                },
-                {
-                    "name": "Little Saigon",
-                    "cuisine": "Vietnamese",
-                    "price_range": "$$",
-                    "rating": 4.4,
-                    "dietary_options": ["gluten-free"],
-                    "signature_dish": "Pho",
-                    "address": "789 Vietnam St, Chicago, IL",
-                    "hours": "11:00 AM - 10:00 PM"
-                },
-                {
-                    "name": "Taste of India",
-                    "cuisine": "Indian",
-                    "price_range": "$$",
-                    "rating": 4.3,
-                    "dietary_options": ["vegetarian", "halal"],
-                    "signature_dish": "Chicken Tikka Masala",
-                    "address": "101 Curry Lane, Chicago, IL",
-                    "hours": "12:00 PM - 10:00 PM"
-                },
-                {
-                    "name": "Green Leaf",
-                    "cuisine": "Vegan",
-                    "price_range": "$$",
-                    "rating": 4.2,
-                    "dietary_options": ["vegetarian", "vegan", "gluten-free"],
-                    "signature_dish": "Vegan Chicago Dog",
-                    "address": "202 Healthy Way, Chicago, IL",
-                    "hours": "10:00 AM - 9:00 PM"
-                }
-            ]
-        }
+        catalog = get_catalog()
 
-        # Normalize location
-        location_key = location.lower().split(",")[0].strip()
+        # Resolve aliases, state suffixes and typos to a catalog city
+        location_key = catalog.resolve_city(location)
 
-        if location_key not in restaurant_db:
+        if location_key not in catalog.restaurant_indexes:
             return f"Restaurant information not available for {location}. In a real implementation, this would connect to a restaurant API."
 
-        # Get all restaurants in the location
-        restaurants = restaurant_db[location_key]
-
-        # Apply filters
-        if cuisine_type:
-            cuisine_list = [c.strip().lower() for c in cuisine_type.split(",")]
-            filtered_restaurants = []
-            for restaurant in restaurants:
-                if restaurant["cuisine"].lower() in cuisine_list:
-                    filtered_restaurants.append(restaurant)
-            restaurants = filtered_restaurants
-
-        if dietary_preferences:
-            dietary_list = [d.strip().lower() for d in dietary_preferences.split(",")]
-            filtered_restaurants = []
-            for restaurant in restaurants:
-                if any(diet in [opt.lower() for opt in restaurant["dietary_options"]] for diet in dietary_list):
-                    filtered_restaurants.append(restaurant)
-            restaurants = filtered_restaurants
-
-        if price_range:
-            restaurants = [r for r in restaurants if r["price_range"] == price_range]
+        # Look up matches in the precomputed index
+        cuisine_list = [c.strip() for c in cuisine_type.split(",") if c.strip()]
+        dietary_list = [d.strip() for d in dietary_preferences.split(",") if d.strip()]
+        restaurant_index = catalog.restaurant_indexes[location_key]
+        origin = catalog.locate(location_key, near_address) if near_address else None
+        distances = None
+
+        if origin is not None:
+            # Nearest matching restaurants first
+            matches = restaurant_index.match(cuisines=cuisine_list, dietary=dietary_list, price_range=price_range)
+            nearby = catalog.restaurant_locations[location_key].nearest(
+                origin[0],
+                origin[1],
+                k=limit if limit and limit > 0 else len(restaurant_index),
+                predicate=None if matches is None else matches.__contains__,
+            )
+            restaurants = [restaurant_index.restaurants[position] for _, position in nearby]
+            distances = [distance / KM_PER_MILE for distance, _ in nearby]
+        else:
+            # Best rated first
+            restaurants = restaurant_index.search(
+                cuisines=cuisine_list,
+                dietary=dietary_list,
+                price_range=price_range,
+                limit=limit,
+            )
 
         # Prepare response
         if not restaurants:
             return f"No restaurants found in {location} matching your criteria. Try adjusting your preferences."
 
-        # Format response
-        response = f"Restaurants in {location}:\n\n"
-
-        for restaurant in restaurants:
-            response += f"🍽️ {restaurant['name']} - {restaurant['price_range']}\n"
-            response += f"⭐ Rating: {restaurant['rating']}/5\n"
-            response += f"🍳 Cuisine: {restaurant['cuisine']}\n"
-            response += f"🏆 Signature Dish: {restaurant['signature_dish']}\n"
-            response += f"📍 Address: {restaurant['address']}\n"
-            response += f"🕒 Hours: {restaurant['hours']}\n"
-
-            if restaurant["dietary_options"]:
-                dietary_str = ", ".join(restaurant["dietary_options"])
-                response += f"🥗 Dietary options: {dietary_str}\n"
-
-            response += "\n"
-
-        return response
+        return ToolResult("restaurants", {
+            "location": location,
+            "near_address": near_address,
+            "restaurants": restaurants,
+            "distances_miles": distances,
+        })
     except Exception as e:
         return f"Error finding restaurants: {str(e)}"
 
+@renderer("restaurants", "markdown")
+def render_restaurants_markdown(data):
+    distances = data["distances_miles"]
+    if distances is not None:
+        parts = [f"Restaurants in {data['location']} near {data['near_address']}:\n\n"]
+    elif data["near_address"]:
+        parts = [f"Restaurants in {data['location']} (could not locate '{data['near_address']}', showing best rated):\n\n"]
+    else:
+        parts = [f"Restaurants in {data['location']}:\n\n"]
+
+    for i, restaurant in enumerate(data["restaurants"]):
+        parts.append(f"🍽️ {restaurant['name']} - {restaurant['price_range']}\n")
+        parts.append(f"⭐ Rating: {restaurant['rating']}/5\n")
+        parts.append(f"🍳 Cuisine: {restaurant['cuisine']}\n")
+        parts.append(f"🏆 Signature Dish: {restaurant['signature_dish']}\n")
+        parts.append(f"📍 Address: {restaurant['address']}\n")
+        if distances is not None:
+            parts.append(f"📏 Distance: {distances[i]:.1f} mi\n")
+        parts.append(f"🕒 Hours: {restaurant['hours']}\n")
+        if restaurant["dietary_options"]:
+            parts.append(f"🥗 Dietary options: {', '.join(restaurant['dietary_options'])}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+@renderer("restaurants", "compact")
+def render_restaurants_compact(data):
+    distances = data["distances_miles"]
+    if distances is not None:
+        lines = [f"Restaurants {data['location']} near {data['near_address']}:"]
+    elif data["near_address"]:
+        lines = [f"Restaurants {data['location']} ('{data['near_address']}' not found, best rated):"]
+    else:
+        lines = [f"Restaurants {data['location']}:"]
+    for i, restaurant in enumerate(data["restaurants"]):
+        fields = [
+            f"{restaurant['name']} {restaurant['price_range']} {restaurant['rating']}/5",
+            restaurant["cuisine"],
+            f"try {restaurant['signature_dish']}",
+            restaurant["address"] + (f" ({distances[i]:.1f} mi)" if distances is not None else ""),
+            restaurant["hours"],
+        ]
+        if restaurant["dietary_options"]:
+            fields.append(", ".join(restaurant["dietary_options"]))
+        lines.append(" | ".join(fields))
+    return "\n".join(lines)
+
 # Fast food/chain restaurant finder
 @tool
-def find_nearby_food_chains(location: str, chain_name: str = "", near_address: str = "") -> str:
+@cached_tool(ttl_seconds=HOUR, normalize={"location": city_key, "near_address": normalize_text}, version=catalog_version, cache_if=is_cacheable)
+def find_nearby_food_chains(location: str, chain_name: str = "", near_address: str = "", limit: int = 3, radius_miles: float = 0) -> str:
     """Finds nearby food chains and fast food restaurants.
 
     Args:
         location: US city or neighborhood (e.g., 'Las Vegas, NV')
         chain_name: Specific chain to search for (e.g., 'McDonald's', 'Starbucks')
-        near_address: Address or hotel name to find nearby options
+        near_address: Address, landmark or hotel name to find nearby options
+        limit: Number of nearest locations to return when near_address is given
+        radius_miles: Only return locations within this many miles of near_address (0 for no limit)
     """
     try:
-        # Mock food chain database
-        chain_db = {
-            "new york": {
-                "McDonald's": ["123 Broadway, New York, NY", "456 5th Ave, New York, NY", "789 Times Square, New York, NY"],
-                "Starbucks": ["111 Park Ave, New York, NY", "222 Broadway, New York, NY", "333 7th Ave, New York, NY"],
-                "Chipotle": ["444 8th Ave, New York, NY", "555 Broadway, New York, NY"],
-                "Subway": ["666 6th Ave, New York, NY", "777 Broadway, New York, NY"],
-                "Panda Express": ["888 Canal St, New York, NY"]
-            },
-            "chicago": {
-                "McDonald's": ["123 Michigan Ave, Chicago, IL", "456 State St, Chicago, IL"],
-                "Starbucks": ["111 Wacker Dr, Chicago, IL", "222 Michigan Ave, Chicago, IL"],
-                "Chipotle": ["444 State St, Chicago, IL"],
-                "Subway": ["666 Clark St, Chicago, IL", "777 Michigan Ave, Chicago, IL"],
-                "Portillo's": ["888 Clark St, Chicago, IL"]
-            },
-            "austin": {
-                "McDonald's": ["123 Congress Ave, Austin, TX", "456 Lamar Blvd, Austin, TX"],
-                "Starbucks": ["111 6th St, Austin, TX", "222 Congress Ave, Austin, TX"],
-                "Chipotle": ["444 Lamar Blvd, Austin, TX"],
-                "Subway": ["666 Congress Ave, Austin, TX"],
-                "Whataburger": ["888 Lamar Blvd, Austin, TX", "999 Congress Ave, Austin, TX"]
-            }
-        }
+        catalog = get_catalog()
 
-        # Normalize location
-        location_key = location.lower().split(",")[0].strip()
+        # Resolve aliases, state suffixes and typos to a catalog city
+        location_key = catalog.resolve_city(location)
 
-        if location_key not in chain_db:
+        if location_key not in catalog.food_chains:
             return f"Food chain information not available for {location}. In a real implementation, this would connect to a location API."
 
         # Filter by chain name if provided
         if chain_name:
             chain_name = chain_name.strip()
-            if chain_name not in chain_db[location_key]:
+            if chain_name not in catalog.food_chains[location_key]:
                 return f"{chain_name} locations not found in {location}."
 
-            chains = {chain_name: chain_db[location_key][chain_name]}
+            chains = {chain_name: catalog.food_chains[location_key][chain_name]}
         else:
-            chains = chain_db[location_key]
-
-        # Format response
-        response = f"Food chains in {location}:\n\n"
-
-        for chain, locations in chains.items():
-            response += f"🍔 {chain}\n"
-            for loc in locations:
-                response += f"  📍 {loc}\n"
-            response += "\n"
-
-        return response
+            chains = catalog.food_chains[location_key]
+
+        origin = catalog.locate(location_key, near_address) if near_address else None
+        if origin is not None:
+            # k-nearest query over the geocoded chain locations
+            nearby = catalog.food_chain_locations[location_key].nearest(
+                origin[0],
+                origin[1],
+                k=limit if limit and limit > 0 else 3,
+                radius_km=radius_miles * KM_PER_MILE if radius_miles and radius_miles > 0 else None,
+                predicate=lambda entry: entry[0] in chains,
+            )
+            if not nearby:
+                return f"No {chain_name or 'food chain'} locations found within {radius_miles} miles of {near_address}."
+
+            return ToolResult("food_chains", {
+                "location": location,
+                "near_address": near_address,
+                "nearest": [{"chain": chain, "address": loc, "distance_miles": distance / KM_PER_MILE}
+                            for distance, (chain, loc) in nearby],
+            })
+
+        return ToolResult("food_chains", {"location": location, "near_address": near_address, "chains": chains})
     except Exception as e:
         return f"Error finding food chains: {str(e)}"
 
+@renderer("food_chains", "markdown")
+def render_food_chains_markdown(data):
+    if "nearest" in data:
+        parts = [f"Food chains nearest to {data['near_address']} in {data['location']}:\n\n"]
+        for entry in data["nearest"]:
+            parts.append(f"🍔 {entry['chain']}\n")
+            parts.append(f"  📍 {entry['address']} ({entry['distance_miles']:.1f} mi)\n\n")
+        return "".join(parts)
+
+    if data["near_address"]:
+        parts = [f"Food chains in {data['location']} (could not locate '{data['near_address']}', showing all locations):\n\n"]
+    else:
+        parts = [f"Food chains in {data['location']}:\n\n"]
+    for chain, locations in data["chains"].items():
+        parts.append(f"🍔 {chain}\n")
+        for loc in locations:
+            parts.append(f"  📍 {loc}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+@renderer("food_chains", "compact")
+def render_food_chains_compact(data):
+    if "nearest" in data:
+        lines = [f"Food chains nearest {data['near_address']}, {data['location']}:"]
+        lines.extend(f"{entry['chain']} | {entry['address']} | {entry['distance_miles']:.1f} mi" for entry in data["nearest"])
+        return "\n".join(lines)
+    header = f"Food chains {data['location']}"
+    if data["near_address"]:
+        header += f" ('{data['near_address']}' not found, all locations)"
+    lines = [header + ":"]
+    lines.extend(f"{chain}: {'; '.join(locations)}" for chain, locations in data["chains"].items())
+    return "\n".join(lines)
+
 # US Attractions finder based on traveler profile and interests
 @tool
+@cached_tool(ttl_seconds=3 * DAY, normalize={"location": city_key, "interests": normalize_text}, version=catalog_version, cache_if=is_cacheable)
 def find_attractions(location: str, traveler_profile: str, interests: str = "") -> str:
     """Finds tourist attractions based on traveler profile and interests.
 
@@ -806,247 +636,201 @@ def find_attractions(location: str, traveler_profile: str, interests: str = "")
         interests: Comma-separated list of interests (e.g., 'adventure,history,nature')
     """
     try:
+        catalog = get_catalog()
+
         # Parse interests
         interest_list = [i.strip().lower() for i in interests.split(",") if i.strip()]
 
-        # Mock attractions database
-        attractions_db = {
-            "new york": {
-                "popular": ["Times Square", "Statue of Liberty", "Empire State Building", "Central Park", "Metropolitan Museum of Art"],
-                "history": ["Ellis Island", "9/11 Memorial & Museum", "American Museum of Natural History", "Tenement Museum"],
-                "culture": ["Broadway", "Metropolitan Opera", "Museum of Modern Art (MoMA)", "The High Line"],
-                "adventure": ["Hudson River Kayaking", "Coney Island", "Hell's Kitchen Food Tour"],
-                "nature": ["Central Park", "Brooklyn Botanic Garden", "Prospect Park"],
-                "romantic": ["Top of the Rock at sunset", "Central Park carriage ride", "Dinner cruise on Hudson River"],
-                "family": ["Central Park Zoo", "American Museum of Natural History", "Bronx Zoo", "Intrepid Sea, Air & Space Museum"],
-                "nightlife": ["Rooftop bars in Manhattan", "Comedy clubs", "Jazz clubs in Harlem", "Clubs in Meatpacking District"],
-                "shopping": ["Fifth Avenue", "SoHo", "Chelsea Market"]
-            },
-            "chicago": {
-                "popular": ["Millennium Park & Cloud Gate", "Navy Pier", "The Art Institute of Chicago", "Willis Tower Skydeck"],
-                "history": ["Chicago History Museum", "Field Museum", "Architecture River Cruise"],
-                "culture": ["The Art Institute of Chicago", "Symphony Center", "Chicago Theatre"],
-                "adventure": ["Lakefront Trail biking", "Chicago River kayaking", "Willis Tower Skydeck"],
-                "nature": ["Lincoln Park", "Garfield Park Conservatory", "Chicago Botanic Garden"],
-                "romantic": ["Navy Pier Ferris Wheel", "Signature Room at sunset", "Architecture River Cruise"],
-                "family": ["Shedd Aquarium", "Museum of Science and Industry", "Lincoln Park Zoo", "Navy Pier"],
-                "nightlife": ["River North bars", "Comedy clubs", "Jazz clubs", "Blue Chicago"],
-                "shopping": ["Magnificent Mile", "State Street", "Wicker Park boutiques"]
-            },
-            "miami": {
-                "popular": ["South Beach", "Art Deco Historic District", "Bayside Marketplace", "Wynwood Walls"],
-                "history": ["Vizcaya Museum & Gardens", "Freedom Tower", "Ancient Spanish Monastery"],
-                "culture": ["Pérez Art Museum", "Wynwood Walls", "Little Havana"],
-                "adventure": ["Everglades airboat tour", "Deep sea fishing", "Jet skiing", "Parasailing"],
-                "nature": ["Everglades National Park", "Biscayne National Park", "Miami Beach Botanical Garden"],
-                "romantic": ["South Beach sunset walk", "Dinner cruise on Biscayne Bay", "Vizcaya Gardens"],
-                "family": ["Miami Seaquarium", "Jungle Island", "Zoo Miami", "Miami Children's Museum"],
-                "nightlife": ["South Beach clubs", "Wynwood bars", "Ball & Chain in Little Havana"],
-                "shopping": ["Bayside Marketplace", "Aventura Mall", "Dolphin Mall"]
-            },
-            "austin": {
-                "popular": ["Texas State Capitol", "Lady Bird Lake", "Zilker Park", "South Congress Avenue"],
-                "history": ["Texas State Capitol", "Bullock Texas State History Museum", "LBJ Presidential Library"],
-                "culture": ["Austin City Limits Live", "The Contemporary Austin", "Live music on 6th Street"],
-                "adventure": ["Barton Springs Pool", "Lake Travis Zipline Adventures", "Paddleboarding on Lady Bird Lake"],
-                "nature": ["Zilker Park", "Lady Bird Johnson Wildflower Center", "Hamilton Pool Preserve"],
-                "romantic": ["Mount Bonnell at sunset", "Lake Austin dinner cruise", "Moonlight towers"],
-                "family": ["Thinkery Children's Museum", "Zilker Park Playground", "Austin Aquarium", "Texas Memorial Museum"],
-                "nightlife": ["6th Street bars", "Rainey Street", "Continental Club", "Antone's"],
-                "shopping": ["South Congress Avenue", "The Domain", "2nd Street District"]
-            },
-            "las vegas": {
-                "popular": ["The Strip", "Bellagio Fountains", "Fremont Street Experience", "High Roller Observation Wheel"],
-                "history": ["The Mob Museum", "Neon Museum", "Springs Preserve"],
-                "culture": ["Cirque du Soleil shows", "Bellagio Gallery of Fine Art", "Smith Center for the Performing Arts"],
-                "adventure": ["Grand Canyon helicopter tour", "Zip line on Fremont Street", "Dune buggy desert tour"],
-                "nature": ["Red Rock Canyon", "Valley of Fire State Park", "Hoover Dam"],
-                "romantic": ["Gondola ride at The Venetian", "Eiffel Tower viewing deck", "Bellagio Fountains at night"],
-                "family": ["Adventuredome at Circus Circus", "Shark Reef at Mandalay Bay", "Tournament of Kings"],
-                "nightlife": ["Casino nightclubs", "Fremont Street bars", "Rooftop lounges", "Magic shows"],
-                "shopping": ["The Forum Shops at Caesars", "Grand Canal Shoppes", "Las Vegas North Premium Outlets"]
-            }
-        }
-
-        # Normalize location
-        location_key = location.lower().split(",")[0].strip()
+        # Resolve aliases, state suffixes and typos to a catalog city
+        location_key = catalog.resolve_city(location)
 
-        if location_key not in attractions_db:
+        if location_key not in catalog.attractions:
             return f"Attraction information not available for {location}. In a real implementation, this would connect to a tourism API."
 
-        # Map traveler profile to interest categories
-        profile_to_interests = {
-            "single": ["popular", "adventure", "nightlife", "culture"],
-            "couple": ["romantic", "culture", "popular", "nightlife"],
-            "family_with_kids": ["family", "popular", "nature", "adventure"],
-            "seniors": ["history", "culture", "popular", "nature"]
-        }
-
         # Determine which categories to show based on profile
         selected_categories = []
 
         # Add profile-based categories
-        if traveler_profile in profile_to_interests:
-            selected_categories.extend(profile_to_interests[traveler_profile])
+        if traveler_profile in catalog.profile_interests:
+            selected_categories.extend(catalog.profile_interests[traveler_profile])
 
         # Add specific interest categories if provided
         for interest in interest_list:
-            if interest in attractions_db[location_key] and interest not in selected_categories:
+            if interest in catalog.attractions[location_key] and interest not in selected_categories:
                 selected_categories.append(interest)
 
         # Deduplicate and ensure "popular" is included
         if "popular" not in selected_categories:
             selected_categories.append("popular")
 
-        # Format response
-        response = f"Recommended attractions in {location} for {traveler_profile.replace('_', ' ')}:\n\n"
-
-        for category in selected_categories:
-            if category in attractions_db[location_key]:
-                response += f"--- {category.capitalize()} Attractions ---\n"
-                for attraction in attractions_db[location_key][category]:
-                    response += f"• {attraction}\n"
-                response += "\n"
-
-        return response
+        return ToolResult("attractions", {
+            "location": location,
+            "traveler_profile": traveler_profile,
+            "categories": {category: catalog.attractions[location_key][category]
+                           for category in selected_categories if category in catalog.attractions[location_key]},
+        })
     except Exception as e:
         return f"Error finding attractions: {str(e)}"
 
+@renderer("attractions", "markdown")
+def render_attractions_markdown(data):
+    parts = [f"Recommended attractions in {data['location']} for {data['traveler_profile'].replace('_', ' ')}:\n\n"]
+    for category, attractions in data["categories"].items():
+        parts.append(f"--- {category.capitalize()} Attractions ---\n")
+        for attraction in attractions:
+            parts.append(f"• {attraction}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+@renderer("attractions", "compact")
+def render_attractions_compact(data):
+    lines = [f"Attractions {data['location']} for {data['traveler_profile'].replace('_', ' ')}:"]
+    lines.extend(f"{category}: {'; '.join(attractions)}" for category, attractions in data["categories"].items())
+    return "\n".join(lines)
+
 # Transportation route planner
 @tool
-def plan_transportation(from_city: str, to_city: str, transport_mode: str = "all") -> str:
+@cached_tool(ttl_seconds=HOUR, normalize={"from_city": city_key, "to_city": city_key}, version=catalog_version, cache_if=is_cacheable)
+def plan_transportation(from_city: str, to_city: str, transport_mode: str = "all", optimize: str = "") -> str:
     """Plans transportation between US cities with multiple options.
 
     Args:
         from_city: Starting city (e.g., 'Austin, TX')
         to_city: Destination city (e.g., 'New York, NY')
         transport_mode: Type of transportation ('air', 'train', 'bus', 'car', or 'all')
+        optimize: Plan a multi-leg route that is 'fastest', 'cheapest' or has 'fewest_transfers' (empty lists direct options, or all three routes when there is no direct connection)
     """
     try:
-        # Mock transportation database
-        transport_db = {
-            "austin-new york": {
-                "air": [
-                    {"airline": "American Airlines", "duration": "3h 50m", "price_range": "$200-450", "direct": True},
-                    {"airline": "Delta", "duration": "3h 45m", "price_range": "$220-480", "direct": True},
-                    {"airline": "United", "duration": "5h 30m", "price_range": "$180-350", "direct": False}
-                ],
-                "train": [
-                    {"operator": "Amtrak", "duration": "2d 5h", "price_range": "$280-450", "transfers": 2}
-                ],
-                "bus": [
-                    {"operator": "Greyhound", "duration": "1d 18h", "price_range": "$180-250", "transfers": 2}
-                ],
-                "car": {
-                    "distance": "1,742 miles",
-                    "duration": "26h (non-stop)",
-                    "estimated_fuel": "$230-290",
-                    "route": "I-35 N, I-40 E, I-81 N, I-78 E"
-                }
-            },
-            "new york-chicago": {
-                "air": [
-                    {"airline": "United", "duration": "2h 20m", "price_range": "$150-300", "direct": True},
-                    {"airline": "American Airlines", "duration": "2h 25m", "price_range": "$160-320", "direct": True}
-                ],
-                "train": [
-                    {"operator": "Amtrak", "duration": "19h 30m", "price_range": "$120-210", "transfers": 0}
-                ],
-                "bus": [
-                    {"operator": "Greyhound", "duration": "18h", "price_range": "$90-150", "transfers": 0},
-                    {"operator": "Megabus", "duration": "17h 30m", "price_range": "$80-140", "transfers": 0}
-                ],
-                "car": {
-                    "distance": "790 miles",
-                    "duration": "12h (non-stop)",
-                    "estimated_fuel": "$100-130",
-                    "route": "I-80 W, I-90 W"
-                }
-            },
-            "los angeles-las vegas": {
-                "air": [
-                    {"airline": "Southwest", "duration": "1h 10m", "price_range": "$80-180", "direct": True},
-                    {"airline": "Spirit", "duration": "1h 15m", "price_range": "$60-150", "direct": True}
-                ],
-                "train": [],  # No direct train service
-                "bus": [
-                    {"operator": "Greyhound", "duration": "5h 30m", "price_range": "$30-60", "transfers": 0},
-                    {"operator": "Megabus", "duration": "5h 45m", "price_range": "$25-55", "transfers": 0},
-                    {"operator": "Flixbus", "duration": "5h", "price_range": "$20-50", "transfers": 0}
-                ],
-                "car": {
-                    "distance": "270 miles",
-                    "duration": "4h (non-stop)",
-                    "estimated_fuel": "$35-45",
-                    "route": "I-15 N"
-                }
-            }
-        }
+        catalog = get_catalog()
 
-        # Normalize city names and create route key
-        from_key = from_city.lower().split(",")[0].strip()
-        to_key = to_city.lower().split(",")[0].strip()
+        # Resolve city names and create route key
+        from_key = catalog.resolve_city(from_city)
+        to_key = catalog.resolve_city(to_city)
         route_key = f"{from_key}-{to_key}"
 
-        # Check if route exists
-        if route_key not in transport_db:
-            # Try reverse route
-            route_key = f"{to_key}-{from_key}"
-            if route_key not in transport_db:
-                return f"Transportation information not available for route between {from_city} and {to_city}. In a real implementation, this would connect to transportation APIs."
-
         # Filter by transport mode
         if transport_mode != "all" and transport_mode not in ["air", "train", "bus", "car"]:
             return f"Invalid transport mode. Please choose from 'air', 'train', 'bus', 'car', or 'all'."
 
-        # Format response
-        response = f"Transportation options from {from_city} to {to_city}:\n\n"
+        if optimize and optimize not in ROUTE_OBJECTIVES:
+            return f"Invalid optimize value. Please choose from {', '.join(repr(o) for o in ROUTE_OBJECTIVES)}."
 
-        modes_to_show = [transport_mode] if transport_mode != "all" else ["air", "train", "bus", "car"]
+        # Check if a direct route exists
+        if route_key not in catalog.intercity_routes:
+            # Try reverse route
+            route_key = f"{to_key}-{from_key}"
+            if route_key not in catalog.intercity_routes:
+                route_key = None
+
+        if route_key is None or optimize:
+            # Multi-leg itineraries over the route graph
+            labels = {}
+            for objective in [optimize] if optimize else ROUTE_OBJECTIVES:
+                itinerary = catalog.route_graph.route(from_key, to_key, objective, transport_mode)
+                if itinerary is not None:
+                    # The same itinerary can win several objectives
+                    labels.setdefault(itinerary, []).append(objective.replace("_", " "))
+
+            if not labels:
+                return f"Transportation information not available for route between {from_city} and {to_city}. In a real implementation, this would connect to transportation APIs."
+            return ToolResult("itineraries", {
+                "from": from_city,
+                "to": to_city,
+                "itineraries": [
+                    {
+                        "objectives": objectives,
+                        "minutes": itinerary.minutes,
+                        "price_low": itinerary.price_low,
+                        "price_high": itinerary.price_high,
+                        "transfers": itinerary.transfers,
+                        "legs": [leg._asdict() for leg in itinerary.legs],
+                    }
+                    for itinerary, objectives in labels.items()
+                ],
+            })
 
-        for mode in modes_to_show:
-            if mode == "car":
-                car_info = transport_db[route_key]["car"]
-                response += f"🚗 By Car:\n"
-                response += f"  • Distance: {car_info['distance']}\n"
-                response += f"  • Driving time: {car_info['duration']}\n"
-                response += f"  • Estimated fuel cost: {car_info['estimated_fuel']}\n"
-                response += f"  • Suggested route: {car_info['route']}\n\n"
-            else:
-                options = transport_db[route_key].get(mode, [])
-
-                if not options:
-                    response += f"No direct {mode} service available for this route.\n\n"
-                    continue
-
-                if mode == "air":
-                    response += f"✈️ By Air:\n"
-                elif mode == "train":
-                    response += f"🚄 By Train:\n"
-                elif mode == "bus":
-                    response += f"🚌 By Bus:\n"
-
-                for option in options:
-                    if mode == "air":
-                        response += f"  • {option['airline']} - {option['duration']} "
-                        response += f"({'Direct' if option['direct'] else 'Connecting'})\n"
-                        response += f"    Price range: {option['price_range']}\n"
-                    elif mode in ["train", "bus"]:
-                        response += f"  • {option['operator']} - {option['duration']} "
-                        if option['transfers'] > 0:
-                            response += f"({option['transfers']} transfer{'s' if option['transfers'] > 1 else ''})\n"
-                        else:
-                            response += "(Direct)\n"
-                        response += f"    Price range: {option['price_range']}\n"
-
-                response += "\n"
-
-        return response
+        modes_to_show = [transport_mode] if transport_mode != "all" else ["air", "train", "bus", "car"]
+        return ToolResult("transport_options", {
+            "from": from_city,
+            "to": to_city,
+            "modes": {mode: catalog.intercity_routes[route_key][mode] if mode == "car" else catalog.intercity_routes[route_key].get(mode, [])
+                      for mode in modes_to_show},
+        })
     except Exception as e:
         return f"Error planning transportation: {str(e)}"
 
+@renderer("itineraries", "markdown")
+def render_itineraries_markdown(data):
+    parts = [f"Routes from {data['from']} to {data['to']}:\n\n"]
+    for itinerary in data["itineraries"]:
+        transfers = itinerary["transfers"]
+        parts.append(f"{' / '.join(itinerary['objectives']).capitalize()}: {format_duration(itinerary['minutes'])} total, ")
+        parts.append(f"${itinerary['price_low']}-{itinerary['price_high']}, ")
+        parts.append(f"{transfers} transfer{'s' if transfers != 1 else ''}\n")
+        for i, leg in enumerate(itinerary["legs"], 1):
+            parts.append(f"  {i}. {leg['origin'].title()} → {leg['destination'].title()}: ")
+            parts.append(f"{leg['mode']} - {leg['carrier']} ({leg['duration']}, {leg['price_range']})\n")
+        parts.append("\n")
+    return "".join(parts)
+
+@renderer("itineraries", "compact")
+def render_itineraries_compact(data):
+    lines = [f"Routes {data['from']} to {data['to']}:"]
+    for itinerary in data["itineraries"]:
+        legs = "; ".join(f"{leg['origin'].title()}-{leg['destination'].title()} {leg['mode']} {leg['carrier']} {leg['duration']} {leg['price_range']}"
+                         for leg in itinerary["legs"])
+        lines.append(f"{' / '.join(itinerary['objectives'])}: {format_duration(itinerary['minutes'])}, "
+                     f"${itinerary['price_low']}-{itinerary['price_high']}, {itinerary['transfers']} transfers | {legs}")
+    return "\n".join(lines)
+
+@renderer("transport_options", "markdown")
+def render_transport_options_markdown(data):
+    parts = [f"Transportation options from {data['from']} to {data['to']}:\n\n"]
+    for mode, options in data["modes"].items():
+        if mode == "car":
+            parts.append("🚗 By Car:\n")
+            parts.append(f"  • Distance: {options['distance']}\n")
+            parts.append(f"  • Driving time: {options['duration']}\n")
+            parts.append(f"  • Estimated fuel cost: {options['estimated_fuel']}\n")
+            parts.append(f"  • Suggested route: {options['route']}\n\n")
+            continue
+
+        if not options:
+            parts.append(f"No direct {mode} service available for this route.\n\n")
+            continue
+
+        parts.append({"air": "✈️ By Air:\n", "train": "🚄 By Train:\n", "bus": "🚌 By Bus:\n"}[mode])
+        for option in options:
+            if mode == "air":
+                parts.append(f"  • {option['airline']} - {option['duration']} ")
+                parts.append(f"({'Direct' if option['direct'] else 'Connecting'})\n")
+            else:
+                parts.append(f"  • {option['operator']} - {option['duration']} ")
+                if option['transfers'] > 0:
+                    parts.append(f"({option['transfers']} transfer{'s' if option['transfers'] > 1 else ''})\n")
+                else:
+                    parts.append("(Direct)\n")
+            parts.append(f"    Price range: {option['price_range']}\n")
+        parts.append("\n")
+    return "".join(parts)
+
+@renderer("transport_options", "compact")
+def render_transport_options_compact(data):
+    lines = [f"Transport {data['from']} to {data['to']}:"]
+    for mode, options in data["modes"].items():
+        if mode == "car":
+            lines.append(f"car: {options['distance']}, {options['duration']}, fuel {options['estimated_fuel']}, via {options['route']}")
+        elif not options:
+            lines.append(f"{mode}: no direct service")
+        elif mode == "air":
+            lines.append("air: " + "; ".join(f"{o['airline']} {o['duration']} {'direct' if o['direct'] else 'connecting'} {o['price_range']}" for o in options))
+        else:
+            lines.append(f"{mode}: " + "; ".join(f"{o['operator']} {o['duration']} {o['transfers']} transfers {o['price_range']}" for o in options))
+    return "\n".join(lines)
+
 # Local transportation options
 @tool
+@cached_tool(ttl_seconds=DAY, normalize={"city": city_key, "from_location": normalize_text, "to_location": normalize_text}, version=catalog_version, cache_if=is_cacheable)
 def get_local_transportation(city: str, from_location: str = "", to_location: str = "", transport_type: str = "") -> str:
     """Provides information about local transportation options within a US city.
 
@@ -1057,143 +841,15 @@ def get_local_transportation(city: str, from_location: str = "", to_location: st
         transport_type: Type of transportation ('subway', 'bus', 'rideshare', 'taxi', 'rental')
     """
     try:
-        # Mock local transportation database
-        transport_info = {
-            "new york": {
-                "subway": {
-                    "name": "New York City Subway",
-                    "fare": "$2.75 per ride",
-                    "pass_options": ["Day Pass: $13", "Week Pass: $33", "Month Pass: $127"],
-                    "hours": "24/7 service with late-night changes",
-                    "coverage": "Most parts of Manhattan, Brooklyn, Queens, and The Bronx",
-                    "app": "NYC Subway Map or Google Maps",
-                    "tips": "Subway is often the fastest way to move around Manhattan and between boroughs."
-                },
-                "bus": {
-                    "name": "MTA Bus",
-                    "fare": "$2.75 per ride",
-                    "pass_options": ["Same as subway passes"],
-                    "hours": "Varies by route, many run 24/7",
-                    "coverage": "All five boroughs",
-                    "app": "MTA Bus Time or Google Maps",
-                    "tips": "Buses are good for crosstown travel in Manhattan where subway options are limited."
-                },
-                "rideshare": {
-                    "options": ["Uber", "Lyft", "Via"],
-                    "estimated_cost": "$20-40 for most Manhattan rides",
-                    "availability": "Widely available 24/7",
-                    "tips": "Can be expensive during rush hour or bad weather. Shared rides available for lower costs."
-                },
-                "taxi": {
-                    "name": "Yellow Cab (in Manhattan) or Green Cab (outer boroughs)",
-                    "fare_structure": "Base fare $2.50 + $0.50 per 1/5 mile or per 60 seconds in slow traffic",
-                    "availability": "Abundant in Manhattan, less common in outer boroughs",
-                    "tips": "Hail on street or use Curb app. 15-20% tip expected."
-                },
-                "rental": {
-                    "car": ["Enterprise", "Hertz", "Avis", "Zipcar"],
-                    "bike": ["Citi Bike: $3.50 per 30-minute ride or $15/day pass"],
-                    "scooter": ["Lime", "Bird"],
-                    "tips": "Car rental not recommended due to traffic and expensive parking. Citi Bike is great for short trips."
-                },
-                "routes": {
-                    "times square-empire state building": {
-                        "subway": "Take the N, Q, R, or W train from Times Square to Herald Square, then walk east.",
-                        "bus": "Take the M42 crosstown bus east, then transfer to M5 southbound.",
-                        "walking": "20-minute walk (0.8 miles) down Broadway or 7th Avenue."
-                    },
-                    "central park-brooklyn bridge": {
-                        "subway": "Take the 4/5/6 train from 59th St-Lexington Ave to Brooklyn Bridge-City Hall.",
-                        "bus": "Take the M5 bus southbound.",
-                        "walking": "Long walk (4.5 miles) down 5th Avenue and Broadway."
-                    }
-                }
-            },
-            "chicago": {
-                "subway": {
-                    "name": "Chicago 'L' Train",
-                    "fare": "$2.50 per ride",
-                    "pass_options": ["Day Pass: $10", "3-Day Pass: $20", "Week Pass: $28"],
-                    "hours": "Varies by line, some 24/7",
-                    "coverage": "Downtown and many neighborhoods, airport connections",
-                    "app": "Ventra app or Google Maps",
-                    "tips": "The 'L' is great for travel to/from downtown and the airports."
-                },
-                "bus": {
-                    "name": "CTA Bus",
-                    "fare": "$2.25 per ride",
-                    "pass_options": ["Same as 'L' passes"],
-                    "hours": "Varies by route",
-                    "coverage": "Extensive coverage throughout the city",
-                    "app": "CTA Bus Tracker or Google Maps",
-                    "tips": "Buses fill gaps in the 'L' network and are good for east-west travel."
-                },
-                "rideshare": {
-                    "options": ["Uber", "Lyft"],
-                    "estimated_cost": "$15-30 for most city rides",
-                    "availability": "Widely available 24/7",
-                    "tips": "Good option during non-rush hour times."
-                },
-                "taxi": {
-                    "name": "Chicago Taxi",
-                    "fare_structure": "Base fare $3.25 + $2.25 per mile",
-                    "availability": "Common in downtown and near hotels",
-                    "tips": "Hail on street or use Curb app. 15-20% tip expected."
-                },
-                "rental": {
-                    "car": ["Enterprise", "Hertz", "Avis", "Zipcar"],
-                    "bike": ["Divvy Bikes: $3.30 per 30-minute ride or $15/day pass"],
-                    "scooter": ["Lime", "Bird"],
-                    "tips": "Divvy bikes are great for lakefront trail and neighborhoods."
-                }
-            },
-            "san francisco": {
-                "subway": {
-                    "name": "BART (regional) and Muni Metro (city)",
-                    "fare": "BART: $2-12 depending on distance, Muni: $2.50 per ride",
-                    "pass_options": ["Muni Day Pass: $5", "Clipper Card for all systems"],
-                    "hours": "BART: 5am-midnight, Muni varies by line",
-                    "coverage": "BART connects to East Bay and airport, Muni serves city neighborhoods",
-                    "app": "BART app, Muni app, or Google Maps",
-                    "tips": "BART for longer trips, Muni for within city travel."
-                },
-                "bus": {
-                    "name": "Muni Bus",
-                    "fare": "$2.50 per ride",
-                    "pass_options": ["Muni Day Pass: $5", "Muni Monthly Pass: $81"],
-                    "hours": "Varies by route, some 24/7 routes",
-                    "coverage": "Extensive city coverage",
-                    "app": "Muni Mobile or Google Maps",
-                    "tips": "Buses go where BART and Muni Metro don't."
-                },
-                "rideshare": {
-                    "options": ["Uber", "Lyft"],
-                    "estimated_cost": "$15-35 for most city rides",
-                    "availability": "Widely available 24/7",
-                    "tips": "Can be expensive during peak times, but convenient for hills."
-                },
-                "taxi": {
-                    "name": "SF Taxi",
-                    "fare_structure": "Base fare $3.50 + $3.00 per mile",
-                    "availability": "Common downtown and in tourist areas",
-                    "tips": "Hail on street or use Flywheel app. 15-20% tip expected."
-                },
-                "rental": {
-                    "car": ["Enterprise", "Hertz", "Avis", "Zipcar"],
-                    "bike": ["Bay Wheels: $3.49 per 30-minute ride or $15/day pass"],
-                    "scooter": ["Lime", "Spin", "Bird"],
-                    "tips": "Car rental challenging due to hills and parking. Consider bike for Golden Gate Park and waterfront."
-                }
-            }
-        }
+        catalog = get_catalog()
 
-        # Normalize city
-        city_key = city.lower().split(",")[0].strip()
+        # Resolve aliases, state suffixes and typos to a catalog city
+        city_key = catalog.resolve_city(city)
 
-        if city_key not in transport_info:
+        if city_key not in catalog.local_transport:
             return f"Local transportation information not available for {city}. In a real implementation, this would connect to local transit APIs."
 
-        # Format response
+        route_not_found = False
         if from_location and to_location:
             # Normalize locations
             from_location_key = from_location.lower().strip()
@@ -1201,78 +857,108 @@ def get_local_transportation(city: str, from_location: str = "", to_location: st
             route_key = f"{from_location_key}-{to_location_key}"
 
             # Check if we have specific route information
-            if "routes" in transport_info[city_key] and route_key in transport_info[city_key]["routes"]:
-                route_info = transport_info[city_key]["routes"][route_key]
-
-                response = f"How to get from {from_location} to {to_location} in {city}:\n\n"
-
-                for mode, instruction in route_info.items():
-                    if mode == "subway":
-                        response += f"🚇 By Subway: {instruction}\n\n"
-                    elif mode == "bus":
-                        response += f"🚌 By Bus: {instruction}\n\n"
-                    elif mode == "walking":
-                        response += f"🚶 Walking: {instruction}\n\n"
-
-                return response
-            else:
-                # If specific route not found, provide general transportation info
-                response = f"Specific route information from {from_location} to {to_location} not available. Here are the general transportation options in {city}:\n\n"
-                transport_type = ""  # Show all options since specific route not found
-        else:
-            response = f"Local transportation options in {city}:\n\n"
+            if "routes" in catalog.local_transport[city_key] and route_key in catalog.local_transport[city_key]["routes"]:
+                return ToolResult("local_route", {
+                    "city": city,
+                    "from": from_location,
+                    "to": to_location,
+                    "steps": catalog.local_transport[city_key]["routes"][route_key],
+                })
+            # If specific route not found, provide general transportation info
+            route_not_found = True
+            transport_type = ""  # Show all options since specific route not found
 
         # Filter by transport type if specified
         transport_types = [transport_type] if transport_type else ["subway", "bus", "rideshare", "taxi", "rental"]
-
-        for t_type in transport_types:
-            if t_type in transport_info[city_key]:
-                info = transport_info[city_key][t_type]
-
-                if t_type == "subway":
-                    response += f"🚇 Subway/Metro: {info['name']}\n"
-                    response += f"  • Fare: {info['fare']}\n"
-                    response += f"  • Pass options: {', '.join(info['pass_options'])}\n"
-                    response += f"  • Hours: {info['hours']}\n"
-                    response += f"  • Coverage: {info['coverage']}\n"
-                    response += f"  • Recommended app: {info['app']}\n"
-                    response += f"  • Tip: {info['tips']}\n\n"
-
-                elif t_type == "bus":
-                    response += f"🚌 Bus: {info['name']}\n"
-                    response += f"  • Fare: {info['fare']}\n"
-                    response += f"  • Pass options: {', '.join(info['pass_options'])}\n"
-                    response += f"  • Hours: {info['hours']}\n"
-                    response += f"  • Coverage: {info['coverage']}\n"
-                    response += f"  • Recommended app: {info['app']}\n"
-                    response += f"  • Tip: {info['tips']}\n\n"
-
-                elif t_type == "rideshare":
-                    response += f"🚗 Rideshare Services:\n"
-                    response += f"  • Available options: {', '.join(info['options'])}\n"
-                    response += f"  • Estimated cost: {info['estimated_cost']}\n"
-                    response += f"  • Availability: {info['availability']}\n"
-                    response += f"  • Tip: {info['tips']}\n\n"
-
-                elif t_type == "taxi":
-                    response += f"🚕 Taxi: {info['name']}\n"
-                    response += f"  • Fare structure: {info['fare_structure']}\n"
-                    response += f"  • Availability: {info['availability']}\n"
-                    response += f"  • Tip: {info['tips']}\n\n"
-
-                elif t_type == "rental":
-                    response += f"🚲 Rental Options:\n"
-                    response += f"  • Car rental: {', '.join(info['car'])}\n"
-                    response += f"  • Bike sharing: {', '.join(info['bike'])}\n"
-                    response += f"  • Scooter sharing: {', '.join(info['scooter'])}\n"
-                    response += f"  • Tip: {info['tips']}\n\n"
-
-        return response
+        return ToolResult("local_transport", {
+            "city": city,
+            "unknown_route": [from_location, to_location] if route_not_found else None,
+            "services": {t_type: catalog.local_transport[city_key][t_type]
+                         for t_type in transport_types if t_type in catalog.local_transport[city_key]},
+        })
     except Exception as e:
         return f"Error getting local transportation information: {str(e)}"
 
+@renderer("local_route", "markdown")
+def render_local_route_markdown(data):
+    parts = [f"How to get from {data['from']} to {data['to']} in {data['city']}:\n\n"]
+    for mode, instruction in data["steps"].items():
+        if mode == "subway":
+            parts.append(f"🚇 By Subway: {instruction}\n\n")
+        elif mode == "bus":
+            parts.append(f"🚌 By Bus: {instruction}\n\n")
+        elif mode == "walking":
+            parts.append(f"🚶 Walking: {instruction}\n\n")
+    return "".join(parts)
+
+@renderer("local_route", "compact")
+def render_local_route_compact(data):
+    lines = [f"{data['from']} to {data['to']}, {data['city']}:"]
+    lines.extend(f"{mode}: {instruction}" for mode, instruction in data["steps"].items()
+                 if mode in ("subway", "bus", "walking"))
+    return "\n".join(lines)
+
+@renderer("local_transport", "markdown")
+def render_local_transport_markdown(data):
+    if data["unknown_route"]:
+        from_location, to_location = data["unknown_route"]
+        parts = [f"Specific route information from {from_location} to {to_location} not available. Here are the general transportation options in {data['city']}:\n\n"]
+    else:
+        parts = [f"Local transportation options in {data['city']}:\n\n"]
+
+    for t_type, info in data["services"].items():
+        if t_type in ("subway", "bus"):
+            parts.append(f"🚇 Subway/Metro: {info['name']}\n" if t_type == "subway" else f"🚌 Bus: {info['name']}\n")
+            parts.append(f"  • Fare: {info['fare']}\n")
+            parts.append(f"  • Pass options: {', '.join(info['pass_options'])}\n")
+            parts.append(f"  • Hours: {info['hours']}\n")
+            parts.append(f"  • Coverage: {info['coverage']}\n")
+            parts.append(f"  • Recommended app: {info['app']}\n")
+            parts.append(f"  • Tip: {info['tips']}\n\n")
+
+        elif t_type == "rideshare":
+            parts.append("🚗 Rideshare Services:\n")
+            parts.append(f"  • Available options: {', '.join(info['options'])}\n")
+            parts.append(f"  • Estimated cost: {info['estimated_cost']}\n")
+            parts.append(f"  • Availability: {info['availability']}\n")
+            parts.append(f"  • Tip: {info['tips']}\n\n")
+
+        elif t_type == "taxi":
+            parts.append(f"🚕 Taxi: {info['name']}\n")
+            parts.append(f"  • Fare structure: {info['fare_structure']}\n")
+            parts.append(f"  • Availability: {info['availability']}\n")
+            parts.append(f"  • Tip: {info['tips']}\n\n")
+
+        elif t_type == "rental":
+            parts.append("🚲 Rental Options:\n")
+            parts.append(f"  • Car rental: {', '.join(info['car'])}\n")
+            parts.append(f"  • Bike sharing: {', '.join(info['bike'])}\n")
+            parts.append(f"  • Scooter sharing: {', '.join(info['scooter'])}\n")
+            parts.append(f"  • Tip: {info['tips']}\n\n")
+    return "".join(parts)
+
+@renderer("local_transport", "compact")
+def render_local_transport_compact(data):
+    if data["unknown_route"]:
+        lines = [f"No route {data['unknown_route'][0]} to {data['unknown_route'][1]}; transport in {data['city']}:"]
+    else:
+        lines = [f"Transport in {data['city']}:"]
+    for t_type, info in data["services"].items():
+        if t_type in ("subway", "bus"):
+            lines.append(f"{t_type}: {info['name']} | fare {info['fare']} | passes: {', '.join(info['pass_options'])} | "
+                         f"{info['hours']} | {info['coverage']} | app {info['app']} | tip: {info['tips']}")
+        elif t_type == "rideshare":
+            lines.append(f"rideshare: {', '.join(info['options'])} | {info['estimated_cost']} | {info['availability']} | tip: {info['tips']}")
+        elif t_type == "taxi":
+            lines.append(f"taxi: {info['name']} | {info['fare_structure']} | {info['availability']} | tip: {info['tips']}")
+        elif t_type == "rental":
+            lines.append(f"rental: cars {', '.join(info['car'])} | bikes {', '.join(info['bike'])} | "
+                         f"scooters {', '.join(info['scooter'])} | tip: {info['tips']}")
+    return "\n".join(lines)
+
 # Crime and safety alerts
 @tool
+@cached_tool(ttl_seconds=30 * MINUTE, normalize={"city": city_key}, version=catalog_version, cache_if=is_cacheable)
 def get_safety_information(city: str) -> str:
     """Provides safety information and crime alerts for a US city.
 
@@ -1280,152 +966,92 @@ def get_safety_information(city: str) -> str:
         city: US city (e.g., 'Miami, FL')
     """
     try:
-        # Mock safety database
-        safety_db = {
-            "new york": {
-                "safety_rating": "Good",
-                "current_alerts": [
-                    "Increased pickpocketing in popular tourist areas",
-                    "Construction on Broadway between 42nd and 50th Streets"
-                ],
-                "safe_areas": ["Most of Manhattan", "Much of Brooklyn Heights", "Park Slope"],
-                "caution_areas": ["Parts of the Bronx at night", "Parts of East Harlem late at night"],
-                "emergency_numbers": {
-                    "police": "911",
-                    "tourist_police": "646-610-6655"
-                },
-                "tips": [
-                    "Be aware of your surroundings in crowded tourist areas",
-                    "Keep wallets and phones secure, especially on subway",
-                    "Use licensed yellow or green taxis, or reputable rideshare apps",
-                    "Be cautious with your belongings in Times Square and on the subway"
-                ]
-            },
-            "chicago": {
-                "safety_rating": "Good in tourist areas, variable elsewhere",
-                "current_alerts": [
-                    "Increased car break-ins in downtown parking garages",
-                    "Pickpocketing along Magnificent Mile"
-                ],
-                "safe_areas": ["Downtown/Loop", "North Michigan Ave", "Lincoln Park", "Lakeview"],
-                "caution_areas": ["Some South and West Side neighborhoods, especially at night"],
-                "emergency_numbers": {
-                    "police": "911",
-                    "non-emergency": "311"
-                },
-                "tips": [
-                    "Stay in well-lit, busy areas at night",
-                    "Use caution when using public transit late at night",
-                    "Keep valuables out of sight in parked cars",
-                    "Be aware of surroundings when using ATMs"
-                ]
-            },
-            "miami": {
-                "safety_rating": "Generally good in tourist areas",
-                "current_alerts": [
-                    "Increased vehicle break-ins in South Beach parking areas",
-                    "Be alert for hurricane warnings during season (June-November)"
-                ],
-                "safe_areas": ["South Beach (daytime)", "Downtown Miami", "Coral Gables", "Coconut Grove"],
-                "caution_areas": ["Liberty City", "Overtown", "Some areas of Little Haiti at night"],
-                "emergency_numbers": {
-                    "police": "911",
-                    "miami beach visitor center": "305-673-7400"
-                },
-                "tips": [
-                    "Be cautious of scooter rental scams",
-                    "Use hotel safes for valuables",
-                    "Be aware of rip currents at beaches",
-                    "Lock vehicles and don't leave valuables visible",
-                    "Stay hydrated in hot weather"
-                ]
-            },
-            "las vegas": {
-                "safety_rating": "Good on Strip and tourist areas",
-                "current_alerts": [
-                    "Street performers may be aggressive in soliciting tips",
-                    "Drink spiking incidents reported in some clubs"
-                ],
-                "safe_areas": ["The Strip", "Downtown (Fremont St)", "Most casino properties"],
-                "caution_areas": ["Areas north and east of downtown", "Some parts of North Las Vegas"],
-                "emergency_numbers": {
-                    "police": "911",
-                    "tourist safety hotline": "702-229-3111"
-                },
-                "tips": [
-                    "Stay hydrated and use sunscreen in hot weather",
-                    "Be cautious of 'card slappers' offering adult services",
-                    "Watch your drink at all times in bars and clubs",
-                    "Use casino ATMs rather than those on side streets",
-                    "Be wary of 'friendly strangers' offering deals or special access"
-                ]
-            }
-        }
+        catalog = get_catalog()
 
-        # Normalize city
-        city_key = city.lower().split(",")[0].strip()
+        # Resolve aliases, state suffixes and typos to a catalog city
+        city_key = catalog.resolve_city(city)
 
-        if city_key not in safety_db:
+        if city_key not in catalog.safety:
             return f"Safety information not available for {city}. In a real implementation, this would connect to safety and crime data APIs."
 
-        # Get safety info
-        info = safety_db[city_key]
-
-        # Format response
-        response = f"⚠️ Safety Information for {city} ⚠️\n\n"
-        response += f"Overall safety rating: {info['safety_rating']}\n\n"
-
-        response += "Current alerts:\n"
-        for alert in info['current_alerts']:
-            response += f"• {alert}\n"
-        response += "\n"
-
-        response += "Generally safe areas:\n"
-        for area in info['safe_areas']:
-            response += f"• {area}\n"
-        response += "\n"
-
-        response += "Areas to use caution:\n"
-        for area in info['caution_areas']:
-            response += f"• {area}\n"
-        response += "\n"
-
-        response += "Emergency numbers:\n"
-        for service, number in info['emergency_numbers'].items():
-            response += f"• {service.title()}: {number}\n"
-        response += "\n"
-
-        response += "Safety tips:\n"
-        for tip in info['tips']:
-            response += f"• {tip}\n"
-
-        return response
+        return ToolResult("safety", {"city": city, **catalog.safety[city_key]})
     except Exception as e:
         return f"Error retrieving safety information: {str(e)}"
 
-# Image generation for attractions
-image_generation_tool = load_tool("agents-course/text-to-image", trust_remote_code=True)
+@renderer("safety", "markdown")
+def render_safety_markdown(data):
+    parts = [f"⚠️ Safety Information for {data['city']} ⚠️\n\n"]
+    parts.append(f"Overall safety rating: {data['safety_rating']}\n\n")
+    for title, items in (("Current alerts", data["current_alerts"]),
+                         ("Generally safe areas", data["safe_areas"]),
+                         ("Areas to use caution", data["caution_areas"])):
+        parts.append(f"{title}:\n")
+        parts.extend(f"• {item}\n" for item in items)
+        parts.append("\n")
+
+    parts.append("Emergency numbers:\n")
+    parts.extend(f"• {service.title()}: {number}\n" for service, number in data["emergency_numbers"].items())
+    parts.append("\n")
+
+    parts.append("Safety tips:\n")
+    parts.extend(f"• {tip}\n" for tip in data["tips"])
+    return "".join(parts)
+
+@renderer("safety", "compact")
+def render_safety_compact(data):
+    return "\n".join([
+        f"Safety {data['city']}: {data['safety_rating']}",
+        f"alerts: {'; '.join(data['current_alerts'])}",
+        f"safe: {'; '.join(data['safe_areas'])}",
+        f"caution: {'; '.join(data['caution_areas'])}",
+        "emergency: " + "; ".join(f"{service} {number}" for service, number in data["emergency_numbers"].items()),
+        f"tips: {'; '.join(data['tips'])}",
+    ])
+
+# Image generation for attractions; fetched from the Hub on first use (or by a
+# background warm-up) so that it does not hold up startup
+image_generation_tool = LazyTool(
+    lambda: load_tool("agents-course/text-to-image", trust_remote_code=True),
+    name="image_generator",
+    description="This tool creates an image according to a prompt, which is a text description.",
+    inputs={
+        "prompt": {
+            "type": "string",
+            "description": "The image generator prompt. Don't hesitate to add details in the prompt to make the image look better, like 'high-res, photorealistic', etc.",
+        }
+    },
+    output_type="image",
+)
+if os.getenv("IMAGE_TOOL_WARMUP", "1") != "0":
+    bootstrap.track("image_tool", image_generation_tool.warm_up())
 
-# Create a custom DuckDuckGo search tool with rate limit handling
+# Create a custom DuckDuckGo search tool with rate limit handling: searches are
+# spaced out process-wide, identical ones in flight share a result, and rate
+# limits pause searching (failing fast) instead of sleeping on the worker thread
 class RateLimitHandledDuckDuckGoSearchTool(DuckDuckGoSearchTool):
+    def __init__(self, **backend_options):
+        from search_backend import SearchBackend
+
+        super().__init__()
+        self.backend = SearchBackend(super().__call__, **backend_options)
+
     def __call__(self, search_term: str) -> str:
-        try:
-            return super().__call__(search_term)
-        except Exception as e:
-            if "202 Ratelimit" in str(e):
-                # Add a delay and retry once
-                time.sleep(2)
-                try:
-                    return super().__call__(search_term)
-                except Exception:
-                    return f"Sorry, I couldn't perform the web search for '{search_term}' because of rate limiting. Please try again in a few minutes or try a different search term."
-            return f"Error performing search for '{search_term}': {str(e)}"
+        return self.backend.search(search_term)
 
 # Add the DuckDuckGo search tool for up-to-date tourist information
-search_tool = RateLimitHandledDuckDuckGoSearchTool()
+with bootstrap.stage("search"):
+    search_tool = RateLimitHandledDuckDuckGoSearchTool(
+        rate=float(os.getenv("SEARCH_RATE_PER_SECOND", "1")),
+        burst=int(os.getenv("SEARCH_BURST", "3")),
+        failure_threshold=int(os.getenv("SEARCH_FAILURE_THRESHOLD", "3")),
+        base_backoff=float(os.getenv("SEARCH_BACKOFF_SECONDS", "2")),
+        max_backoff=float(os.getenv("SEARCH_MAX_BACKOFF_SECONDS", "120")),
+    )
+    http_pool.use_for_search(search_tool)
 
 # Create a wrapper for the search_tool that accepts a query parameter
 @tool
+@cached_tool(ttl_seconds=HOUR, normalize={"query": normalize_text}, cache_if=is_cacheable)
 def web_search(query: str) -> str:
     """Search the web using DuckDuckGo.
 
@@ -1474,27 +1100,52 @@ class MockModel:
         return self.final_answer
 
 # Try to use HfApiModel, but fall back to MockModel if it fails
-try:
-    # Set up the model with appropriate parameters for a tourist agent
-    model = HfApiModel(
-        max_tokens=1024,
-        temperature=0.7,
-        model_id='Qwen/Qwen2.5-Coder-32B-Instruct',  # Using the Qwen model with 32B parameters
-        token=HUGGING_FACE_TOKEN  # Ensure the token is set correctly
-        # Removed is_chat_model parameter as it's not supported
-    )
+with bootstrap.stage("model"):
+    try:
+        # Set up the model with appropriate parameters for a tourist agent
+        model = HfApiModel(
+            max_tokens=1024,
+            temperature=0.7,
+            model_id='Qwen/Qwen2.5-Coder-32B-Instruct',  # Using the Qwen model with 32B parameters
+            token=HUGGING_FACE_TOKEN  # Ensure the token is set correctly
+            # Removed is_chat_model parameter as it's not supported
+        )
     
-    # Skip direct testing of the model as HfApiModel doesn't have a run method
-    # The model will be tested when used through the CodeAgent
-    print(f"Model initialized with: {model.model_id}")
+        # Skip direct testing of the model as HfApiModel doesn't have a run method
+        # The model will be tested when used through the CodeAgent
+        print(f"Model initialized with: {model.model_id}")
+
+        # Answer repeated prompts from a completion cache shared by all workers
+        if os.getenv("LLM_CACHE", "1") != "0":
+            model = CachingModel(
+                model,
+                CompletionCache(
+                    os.getenv("LLM_CACHE_PATH", ".cache/llm_completions.sqlite"),
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000")),
+                    ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+                ),
+                # Set to 1 to always sample fresh answers when temperature > 0
+                bypass_sampling=os.getenv("LLM_CACHE_BYPASS_SAMPLING", "0") == "1",
+            )
+
+        # Keep each call's input within a token budget as the conversation grows; 0 disables
+        if int(os.getenv("MEMORY_TOKEN_BUDGET", "8000")) > 0:
+            model = CompactingModel(
+                model,
+                budget=int(os.getenv("MEMORY_TOKEN_BUDGET", "8000")),
+                keep_steps=int(os.getenv("MEMORY_KEEP_STEPS", "3")),
+                clip_chars=int(os.getenv("MEMORY_CLIP_CHARS", "400")),
+                # Set to 1 to log each call's estimated input tokens
+                verbose=os.getenv("MEMORY_BUDGET_VERBOSE", "0") == "1",
+            )
     
-except Exception as e:
-    print(f"Error with HfApiModel: {str(e)}")
-    print("Falling back to mock model for demonstration purposes")
-    model = MockModel()
+    except Exception as e:
+        print(f"Error with HfApiModel: {str(e)}")
+        print("Falling back to mock model for demonstration purposes")
+        model = MockModel()
 
 # Load prompt templates
-with open("prompts.yaml", 'r') as stream:
+with bootstrap.stage("prompts"), open("prompts.yaml", 'r') as stream:
     prompt_templates = yaml.safe_load(stream)
 
 # Add customized greeting handling to the prompt templates
@@ -1546,32 +1197,113 @@ def python_interpreter(answer: str) -> str:
         return f"Error: {str(e)}"
 
 # Create the agent with all tourism-related tools
-agent = CodeAgent(
-    model=model,
-    tools=[
-        get_current_time_in_timezone,
-        get_weather_forecast,
-        estimate_travel_budget,
-        find_hotels,
-        find_restaurants,
-        find_nearby_food_chains,
-        find_attractions,
-        plan_transportation,
-        get_local_transportation,
-        get_safety_information,
-        python_interpreter,
-        web_search,
-        image_generation_tool,
-        final_answer  # Use the imported final_answer function, not final_answer_tool
-    ],
-    max_steps=8,  # Increased steps for more complex tourist queries
-    verbosity_level=1,
-    grammar=None,
-    planning_interval=None,
-    name="USATourGuide",
-    description="An AI travel assistant that helps tourists plan trips and navigate destinations within the United States.",
-    prompt_templates=prompt_templates
-)
+def build_agent():
+    """Create an agent with its own memory; the model and tools are shared."""
+    agent = CodeAgent(
+        model=model,
+        tools=[
+            get_current_time_in_timezone,
+            get_weather_forecast,
+            estimate_travel_budget,
+            compare_travel_budgets,
+            find_hotels,
+            find_restaurants,
+            find_nearby_food_chains,
+            find_attractions,
+            plan_transportation,
+            get_local_transportation,
+            get_safety_information,
+            python_interpreter,
+            web_search,
+            image_generation_tool,
+            final_answer  # Use the imported final_answer function, not final_answer_tool
+        ],
+        max_steps=8,  # Increased steps for more complex tourist queries
+        verbosity_level=1,
+        grammar=None,
+        planning_interval=None,
+        name="USATourGuide",
+        description="An AI travel assistant that helps tourists plan trips and navigate destinations within the United States.",
+        prompt_templates=prompt_templates,
+    )
+
+    # Start independent catalog calls of one code action together. web_search is left out: it is
+    # rate limited, and a started call is spent even when the code never reaches it
+    if int(os.getenv("TOOL_CONCURRENCY", "4")) > 0:
+        enable_concurrent_tools(
+            agent,
+            [
+                get_weather_forecast,
+                estimate_travel_budget,
+                compare_travel_budgets,
+                find_hotels,
+                find_restaurants,
+                find_nearby_food_chains,
+                find_attractions,
+                plan_transportation,
+                get_local_transportation,
+                get_safety_information,
+            ],
+            max_workers=int(os.getenv("TOOL_CONCURRENCY", "4")),
+        )
+    return agent
+
+with bootstrap.stage("agent"):
+    agent = build_agent()
+
+# Optionally move all but the last few turns of each chat out of agent memory
+step_archive = None
+if os.getenv("SESSION_ARCHIVE", "0") != "0":
+    from step_archive import StepArchive
+
+    step_archive = StepArchive(
+        os.getenv("SESSION_ARCHIVE_PATH", ".cache/sessions.sqlite"),
+        keep_turns=int(os.getenv("SESSION_ARCHIVE_KEEP_TURNS", "5")),
+    )
+
+# Serve concurrent chats from one event loop; each chat session checks out its own pooled
+# agent, which goes back to the pool after AGENT_IDLE_SECONDS. 0 keeps the single agent
+runner = None
+if int(os.getenv("AGENT_CONCURRENCY", "32")) > 0:
+    runner = AsyncAgentRunner(
+        build_agent,
+        max_concurrency=int(os.getenv("AGENT_CONCURRENCY", "32")),
+        agents=[agent],
+        max_agents=int(os.getenv("AGENT_POOL_SIZE", "64")),
+        idle_seconds=int(os.getenv("AGENT_IDLE_SECONDS", "1800")),
+        archive=step_archive,
+    )
+
+# Answer single-tool questions ("weather in Austin") without the model
+intent_router = None
+if os.getenv("INTENT_ROUTER", "1") != "0":
+    with bootstrap.stage("router"):
+        from intent_router import SAFETY_PATTERNS, TIME_PATTERNS, WEATHER_PATTERNS, Intent, IntentRouter, city_slot, timezone_slot
+
+        intent_router = IntentRouter(
+            [
+                Intent("weather", get_weather_forecast, WEATHER_PATTERNS, {"location": city_slot(get_catalog, "weather")}),
+                Intent("time", get_current_time_in_timezone, TIME_PATTERNS, {"timezone": timezone_slot}),
+                Intent("safety", get_safety_information, SAFETY_PATTERNS, {"city": city_slot(get_catalog, "safety")}),
+            ],
+            min_confidence=float(os.getenv("INTENT_ROUTER_MIN_CONFIDENCE", "1.0")),
+        )
+
+# Answer reworded repeats of earlier questions without running the agent
+answer_cache = None
+if os.getenv("ANSWER_CACHE", "1") != "0":
+    with bootstrap.stage("answer_cache"):
+        from answer_cache import AnswerCache
+
+        answer_cache = AnswerCache(
+            threshold=float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.8")),
+            bands=int(os.getenv("ANSWER_CACHE_BANDS", "16")),
+            rows=int(os.getenv("ANSWER_CACHE_ROWS", "4")),
+            max_entries=int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1000")),
+            ttl_seconds=int(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600")),
+            version=catalog_version,
+            find_places=lambda task: get_catalog().find_cities(task),
+        )
 
 # Launch the Gradio UI
 if __name__ == "__main__":
@@ -1604,7 +1336,11 @@ if __name__ == "__main__":
     
     print("\nInitializing Gradio UI...")
     try:
-        GradioUI(agent).launch(share=False)  # Set share=True if you want to create a public link
+        from Gradio_UI import GradioUI
+
+        # Set HTTP_POOL_DEBUG=1 to log connection reuse after each chat
+        GradioUI(agent, answer_cache=answer_cache, intent_router=intent_router, runner=runner,
+                 http_pool=http_pool if os.getenv("HTTP_POOL_DEBUG", "0") != "0" else None).launch(bootstrap=bootstrap, share=False)  # Set share=True if you want to create a public link
         print("Gradio UI launched successfully!")
     except Exception as e:
         print(f"Error launching Gradio UI: {str(e)}")
@@ -0,0 +1,186 @@
+"""Staged startup with a time budget and a readiness probe.
+
+Importing ``app`` loads smolagents, builds the travel catalog, the model client
+and the agent, and only then can the UI start, so every cold start of a
+container that autoscales on traffic pays for all of it. :class:`Bootstrap`
+times each startup stage, warns when startup runs over a budget, and answers
+readiness probes: ``GET /ready`` returns 503 until the UI is serving and 200
+after, with the stage timings in the body.
+
+Run this module to measure cold starts::
+
+    python bootstrap.py --runs 5 --budget 20
+
+It imports ``app`` (and ``gradio``, when installed) in fresh interpreters under
+``python -X importtime``, prints the slowest packages and startup stages, and
+exits with status 1 when the median cold start is over the budget, so a CI job
+can guard it.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# "import time:  self [us] | cumulative | imported package" lines of -X importtime
+_IMPORT_TIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+_READINESS = "BOOTSTRAP_READINESS "
+
+
+class Bootstrap:
+    """Timer and readiness state for the startup of the app.
+
+    Args:
+        budget_seconds: Startup time to warn above; None for no budget.
+    """
+
+    def __init__(self, budget_seconds=None):
+        self.budget_seconds = budget_seconds
+        self.started = time.perf_counter()
+        self.ready_seconds = None
+        self.stages = {}
+        self._background = {}
+        self._lock = threading.Lock()
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @contextmanager
+    def stage(self, name):
+        """Time the startup work done inside the ``with`` block as stage ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - started
+
+    def track(self, name, thread):
+        """Report a background warm-up thread in readiness; startup does not wait for it."""
+        with self._lock:
+            self._background[name] = thread
+        return thread
+
+    def mark_ready(self):
+        """Record that the app is serving, and report the stages against the budget."""
+        self.ready_seconds = self.elapsed()
+        with self._lock:
+            stages = dict(self.stages)
+        other = max(self.ready_seconds - sum(stages.values()), 0.0)
+        timings = ", ".join(f"{name} {seconds:.2f} s" for name, seconds in [*stages.items(), ("other", other)])
+        print(f"Startup: ready in {self.ready_seconds:.2f} s ({timings})")
+        if self.budget_seconds is not None and self.ready_seconds > self.budget_seconds:
+            print(f"Startup: over the {self.budget_seconds:g} s budget by {self.ready_seconds - self.budget_seconds:.2f} s")
+
+    def ready(self):
+        return self.ready_seconds is not None
+
+    def readiness(self):
+        """Readiness probe body: whether the app is serving, and how long startup took."""
+        with self._lock:
+            stages = {name: round(seconds, 3) for name, seconds in self.stages.items()}
+            background = {name: "running" if thread.is_alive() else "done" for name, thread in self._background.items()}
+        return {
+            "ready": self.ready(),
+            "startup_seconds": round(self.ready_seconds if self.ready() else self.elapsed(), 3),
+            "budget_seconds": self.budget_seconds,
+            "stages": stages,
+            "background": background,
+        }
+
+    def route(self, path="/ready"):
+        """Starlette route answering readiness probes with 200 once ready and 503 before."""
+        from starlette.responses import JSONResponse
+        from starlette.routing import Route
+
+        def probe(request):
+            return JSONResponse(self.readiness(), status_code=200 if self.ready() else 503)
+
+        return Route(path, probe, methods=["GET"])
+
+
+def import_times(report):
+    """Cumulative import seconds per top-level package in ``-X importtime`` output.
+
+    A package imported piecemeal is charged its largest single import, which
+    includes the submodules it pulled in.
+    """
+    totals = {}
+    for line in report.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match:
+            package = match[4].split(".")[0]
+            totals[package] = max(totals.get(package, 0.0), int(match[2]) / 1e6)
+    return totals
+
+
+def cold_start(module="app", ui=True, cwd=None):
+    """Import ``module`` in a fresh interpreter under ``-X importtime``.
+
+    Args:
+        module: Module to import; it must define a ``bootstrap``.
+        ui: Also import ``gradio``, as launching the UI does.
+        cwd: Directory to start the interpreter in.
+
+    Returns:
+        ``(wall_seconds, import_times, readiness)`` of the run.
+    """
+    code = "\n".join([
+        "import json",
+        f"import {module} as target",
+        "with target.bootstrap.stage('ui_import'):\n    import gradio" if ui else "",
+        f"print({_READINESS!r} + json.dumps(target.bootstrap.readiness()))",
+    ])
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, capture_output=True, text=True)
+    wall_seconds = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    readiness = next(
+        (json.loads(line[len(_READINESS):]) for line in result.stdout.splitlines() if line.startswith(_READINESS)), {}
+    )
+    return wall_seconds, import_times(result.stderr), readiness
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure cold starts of the app against a startup budget.")
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure")
+    parser.add_argument("--budget", type=float, default=float(os.getenv("STARTUP_BUDGET_SECONDS", "20")),
+                        help="seconds the median cold start may take")
+    parser.add_argument("--module", default="app", help="module to import")
+    parser.add_argument("--no-ui", action="store_true", help="do not import gradio")
+    parser.add_argument("--top", type=int, default=12, help="slowest packages to list")
+    args = parser.parse_args(argv)
+
+    ui = not args.no_ui and importlib.util.find_spec("gradio") is not None
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    runs = [cold_start(args.module, ui=ui, cwd=cwd) for _ in range(args.runs)]
+    walls = [wall for wall, _, _ in runs]
+
+    print(f"Slowest imports (median of {args.runs} runs):")
+    packages = {package for _, times, _ in runs for package in times}
+    medians = {package: statistics.median(times.get(package, 0.0) for _, times, _ in runs) for package in packages}
+    for package, seconds in sorted(medians.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {package}")
+
+    print("Startup stages (median):")
+    stages = list(runs[0][2].get("stages", {}))
+    for name in stages:
+        print(f"  {statistics.median(readiness['stages'].get(name, 0.0) for _, _, readiness in runs) * 1000:8.1f} ms  {name}")
+
+    median = statistics.median(walls)
+    print(f"Cold start: median {median:.2f} s, max {max(walls):.2f} s over {args.runs} runs; budget {args.budget:g} s")
+    if median > args.budget:
+        print(f"Cold start is over budget by {median - args.budget:.2f} s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
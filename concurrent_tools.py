@@ -0,0 +1,206 @@
+"""Run independent tool calls of one code action concurrently.
+
+A code action like::
+
+    w = get_weather_forecast("Miami, FL")
+    h = find_hotels("Miami", "2025-06-01", "2025-06-04", 2, "mid-range")
+    s = get_safety_information("Miami")
+
+would run its tool calls one after another. :class:`ConcurrentToolExecutor`
+wraps the agent's Python executor. Before a code action runs, it starts
+every top-level tool call whose arguments are already known on a thread
+pool. Known arguments are literals, or variables from earlier steps that
+the action does not reassign. The code then runs as usual, and each of
+those calls picks up its result from the pool, waiting only if that
+result is not ready yet. Statements that depend on a result see exactly
+what a serial call would have returned, including raised exceptions.
+
+Calls nested in ``if``/``for``/``while``/``try`` blocks, lambdas,
+comprehensions or short-circuiting expressions may never run, so they are
+not started early. A top-level call can still be started and then never
+reached, when an earlier statement raises or returns, so only tools without
+side effects or rate limits (catalog lookups, not web search) should be
+registered. Calls still queued when the action ends are cancelled.
+
+Each executor has its own thread pool, so concurrent chats served by
+different agents never queue behind each other's tool calls.
+"""
+import ast
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Expressions whose sub-expressions may not all be evaluated
+_CONDITIONAL = (ast.Lambda, ast.IfExp, ast.BoolOp, ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+_MISSING = object()
+
+
+def _call_key(name, args, kwargs):
+    return repr((name, tuple(args), sorted(kwargs.items())))
+
+
+def _assigned_names(tree):
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            names.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.alias):
+            names.add((node.asname or node.name).split(".")[0])
+    return names
+
+
+def _static_value(node, state, assigned):
+    """Value of an argument known before the code runs, or ``_MISSING``."""
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        pass
+    if isinstance(node, ast.Name) and node.id not in assigned:
+        value = state.get(node.id, _MISSING)
+        # Only immutable values are guaranteed to be unchanged at call time
+        if isinstance(value, (str, int, float, bool, type(None))):
+            return value
+    return _MISSING
+
+
+def _top_level_calls(statement):
+    """Yield the calls of a statement that always run when the statement does."""
+    if isinstance(statement, (ast.Assign, ast.AnnAssign, ast.AugAssign, ast.Expr, ast.Return)):
+        pending = [statement.value] if statement.value is not None else []
+    else:
+        return
+    while pending:
+        node = pending.pop()
+        if isinstance(node, _CONDITIONAL):
+            continue
+        if isinstance(node, ast.Call):
+            yield node
+        pending.extend(ast.iter_child_nodes(node))
+
+
+def independent_calls(code, tool_names, state):
+    """Find the tool calls of ``code`` that can start before it runs.
+
+    Args:
+        code: Python source of one code action.
+        tool_names: Names of the tools that are safe to run concurrently.
+        state: Variables of the executor from earlier steps.
+
+    Returns:
+        List of ``(name, args, kwargs)``, in source order.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return []
+    assigned = _assigned_names(tree)
+    calls = []
+    for statement in tree.body:
+        for call in sorted(_top_level_calls(statement), key=lambda node: (node.lineno, node.col_offset)):
+            name = call.func.id if isinstance(call.func, ast.Name) else None
+            # A variable of the same name would shadow the tool
+            if name not in tool_names or name in assigned or name in state:
+                continue
+            if any(isinstance(arg, ast.Starred) for arg in call.args) or any(k.arg is None for k in call.keywords):
+                continue
+            args = [_static_value(arg, state, assigned) for arg in call.args]
+            kwargs = {keyword.arg: _static_value(keyword.value, state, assigned) for keyword in call.keywords}
+            if _MISSING in args or _MISSING in kwargs.values():
+                continue
+            calls.append((name, args, kwargs))
+    return calls
+
+
+class _PrefetchedTool:
+    """Stands in for a tool while a code action runs, serving started calls first."""
+
+    def __init__(self, name, tool, futures, owner):
+        self.name = name
+        self.tool = tool
+        self._futures = futures
+        self._owner = owner
+
+    def __getattr__(self, name):
+        return getattr(self.tool, name)
+
+    def __call__(self, *args, **kwargs):
+        pending = self._futures.get(_call_key(self.name, args, kwargs))
+        if pending:
+            self._owner.record("served")
+            return pending.pop(0).result()
+        return self.tool(*args, **kwargs)
+
+
+class ConcurrentToolExecutor:
+    """Wraps a smolagents Python executor to start independent tool calls concurrently.
+
+    Every other attribute is forwarded to the wrapped executor.
+
+    Args:
+        executor: The agent's ``python_executor``.
+        tool_names: Names of tools that may run concurrently; they must be
+            safe to call from several threads and free of side effects and
+            rate limits, since a started call may never be used.
+        max_workers: Size of this executor's thread pool. Threads start on
+            demand, so an agent that never runs concurrent calls keeps none.
+    """
+
+    def __init__(self, executor, tool_names, max_workers=4):
+        self.executor = executor
+        self.tool_names = frozenset(tool_names)
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tool-call")
+        self._lock = threading.Lock()
+        self.stats = {"actions": 0, "concurrent_actions": 0, "started": 0, "served": 0, "unused": 0,
+                      "cancelled": 0}
+
+    def __getattr__(self, name):
+        return getattr(self.executor, name)
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def __call__(self, code_action, additional_variables):
+        self.record("actions")
+        tools = self.executor.static_tools
+        state = {**self.executor.state, **additional_variables}
+        calls = independent_calls(code_action, self.tool_names & tools.keys(), state)
+        # A single call gains nothing from the pool
+        if len(calls) < 2:
+            return self.executor(code_action, additional_variables)
+
+        futures = {}
+        for name, args, kwargs in calls:
+            future = self._pool.submit(tools[name], *args, **kwargs)
+            futures.setdefault(_call_key(name, args, kwargs), []).append(future)
+        self.record("concurrent_actions")
+        self.record("started", len(calls))
+
+        self.executor.static_tools = {
+            **tools,
+            **{name: _PrefetchedTool(name, tools[name], futures, self) for name, _, _ in calls},
+        }
+        try:
+            return self.executor(code_action, additional_variables)
+        finally:
+            self.executor.static_tools = tools
+            # e.g. the code raised before reaching these calls; drop the ones that have not started
+            unused = [future for pending in futures.values() for future in pending]
+            self.record("unused", len(unused))
+            self.record("cancelled", sum(future.cancel() for future in unused))
+
+
+def enable_concurrent_tools(agent, tools, max_workers=4):
+    """Let ``agent`` run independent calls of ``tools`` concurrently within a step.
+
+    Args:
+        agent: A ``CodeAgent`` using the local Python executor.
+        tools: Tools that are safe to call from several threads and have
+            no side effects or rate limits.
+        max_workers: Size of the agent's own thread pool.
+    """
+    names = [getattr(tool, "name", getattr(tool, "__name__", None)) for tool in tools]
+    agent.python_executor = ConcurrentToolExecutor(agent.python_executor, names, max_workers)
+    return agent.python_executor
@@ -0,0 +1,167 @@
+"""Shared keep-alive HTTP connections for the model client and web search.
+
+Each agent step calls the inference API, and web searches call DuckDuckGo.
+Left to themselves, the Hugging Face client opens a ``requests`` session per
+thread and the search tool keeps its own ``httpx`` client, with nothing
+bounding sockets per host or timing out connects. :class:`HttpPool` owns
+one of each for the whole process. Connections are pooled and kept alive,
+``requests`` sockets are capped per host, and connect/read timeouts have
+defaults. The ``httpx`` client speaks HTTP/2 when ``h2`` is installed. Calls
+through either client are counted, so connection reuse can be checked.
+"""
+import importlib.util
+import threading
+import weakref
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _counting(pool_class, owner):
+    """Subclass of a urllib3 connection pool that counts the connections it opens."""
+
+    class CountingPool(pool_class):
+        def _new_conn(self):
+            owner.record("new_connections")
+            return super()._new_conn()
+
+    return CountingPool
+
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that counts requests and connections and applies a default timeout."""
+
+    def __init__(self, owner, timeout, **kwargs):
+        self.owner = owner
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: _counting(pool_class, self.owner)
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        self.owner.record("requests")
+        return super().send(request, timeout=self.timeout if timeout is None else timeout, **kwargs)
+
+
+class HttpPool:
+    """Process-wide pooled HTTP clients.
+
+    Args:
+        max_per_host: Open ``requests`` connections allowed per host; further
+            requests wait. The ``httpx`` client keeps as many alive.
+        max_hosts: Hosts whose connections are kept alive at once.
+        connect_timeout: Seconds to establish a connection, unless a call sets its own timeout.
+        read_timeout: Seconds to wait for response data, unless a call sets its own timeout.
+        keepalive_seconds: Idle time after which an ``httpx`` connection is closed.
+        http2: Use HTTP/2 for ``httpx`` when ``h2`` is installed.
+    """
+
+    def __init__(self, max_per_host=32, max_hosts=10, connect_timeout=5.0, read_timeout=60.0,
+                 keepalive_seconds=60.0, http2=True):
+        self.max_per_host = max_per_host
+        self.max_hosts = max_hosts
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.keepalive_seconds = keepalive_seconds
+        self.http2 = http2 and importlib.util.find_spec("h2") is not None
+        self._lock = threading.Lock()
+        self._session = None
+        self._client = None
+        self._streams = weakref.WeakSet()
+        self.stats = {"requests": 0, "new_connections": 0, "http2_requests": 0}
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def session(self):
+        """The shared ``requests.Session``; safe to hand to every thread."""
+        with self._lock:
+            if self._session is None:
+                adapter = _PooledAdapter(
+                    self,
+                    (self.connect_timeout, self.read_timeout),
+                    pool_connections=self.max_hosts,
+                    pool_maxsize=self.max_per_host,
+                    pool_block=True,
+                )
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+            return self._session
+
+    def _count_response(self, response):
+        self.record("requests")
+        if response.extensions.get("http_version") == b"HTTP/2":
+            self.record("http2_requests")
+        # One network stream per connection; a stream not seen before is a new connection
+        stream = response.extensions.get("network_stream")
+        if stream is not None:
+            with self._lock:
+                seen = stream in self._streams
+                self._streams.add(stream)
+            if not seen:
+                self.record("new_connections")
+
+    def client(self, headers=None):
+        """The shared ``httpx.Client``, created with ``headers`` on first use."""
+        import httpx
+
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(
+                    headers=headers,
+                    http2=self.http2,
+                    timeout=httpx.Timeout(self.read_timeout, connect=self.connect_timeout),
+                    limits=httpx.Limits(
+                        max_connections=self.max_per_host * self.max_hosts,
+                        max_keepalive_connections=self.max_per_host,
+                        keepalive_expiry=self.keepalive_seconds,
+                    ),
+                    event_hooks={"response": [self._count_response]},
+                )
+            return self._client
+
+    def use_for_hub(self):
+        """Send Hugging Face Hub and inference API calls through the shared session.
+
+        Returns:
+            False if the installed ``huggingface_hub`` does not allow it.
+        """
+        try:
+            from huggingface_hub import configure_http_backend
+        except ImportError:
+            # huggingface_hub 1.0 replaced requests with its own httpx client
+            print("HTTP pool: this huggingface_hub has no configure_http_backend; Hub calls use its own client")
+            return False
+        configure_http_backend(backend_factory=self.session)
+        return True
+
+    def use_for_search(self, search_tool):
+        """Send a smolagents ``DuckDuckGoSearchTool``'s requests through the shared client.
+
+        Returns:
+            False if the installed ``duckduckgo_search`` does not allow it.
+        """
+        ddgs = search_tool.ddgs
+        if not hasattr(ddgs, "_client"):
+            # duckduckgo_search 5.0 and later bring their own HTTP client
+            print("HTTP pool: this duckduckgo_search keeps its own client; web search is not pooled")
+            return False
+        # DDGS takes no client argument; keep the headers (user agent) it picked
+        old_client, ddgs._client = ddgs._client, self.client(headers=ddgs._client.headers)
+        old_client.close()
+        return True
+
+    def metrics(self):
+        """Counters plus the share of requests that reused an open connection."""
+        with self._lock:
+            stats = dict(self.stats)
+        reused = max(stats["requests"] - stats["new_connections"], 0)
+        return {**stats, "reused": reused, "reuse_rate": reused / stats["requests"] if stats["requests"] else 0.0}
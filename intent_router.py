@@ -0,0 +1,184 @@
+"""Fast path for single-intent questions that map onto one tool.
+
+Questions like "weather in Austin", "time in America/Chicago" or "safety
+info for Miami" need exactly one tool call, yet each costs several model
+round trips through the agent. :class:`IntentRouter` matches the whole
+question against per-intent patterns and checks every extracted slot. When
+the least confident slot is sure enough, it calls the tool directly.
+Anything else, including tool errors, falls through to the agent.
+
+City slots are only trusted by default when they name one catalog city
+exactly or by alias; misspellings and slots naming several places
+("miami or chicago") go to the agent.
+"""
+import re
+import threading
+from collections import namedtuple
+from functools import lru_cache
+
+from travel_catalog.cities import US_STATES
+
+# Optional time words allowed after the slot ("weather in austin today")
+_WHEN = r"(?: (?:today|tonight|now|right now|this week))?"
+
+WEATHER_PATTERNS = (
+    r"(?:what(?:'s| is) the |how(?:'s| is) the |show me the |get the )?(?:current )?"
+    r"(?:weather|forecast|weather forecast)(?: like)? (?:in|for|at) (?P<location>.+?)" + _WHEN,
+    r"(?P<location>.+?)(?:'s)? weather(?: forecast)?" + _WHEN,
+)
+
+TIME_PATTERNS = (
+    r"(?:what(?:'s| is) the )?(?:current )?(?:local )?time (?:is it )?(?:in|for) (?P<timezone>[\w+-]+(?:/[\w+-]+)+)" + _WHEN,
+    r"what time is it (?:in|for) (?P<timezone>[\w+-]+(?:/[\w+-]+)+)" + _WHEN,
+)
+
+SAFETY_PATTERNS = (
+    r"(?:what(?:'s| is| are) the )?(?:safety|crime|safety and crime)(?: info(?:rmation)?| alerts?| tips| rating)? "
+    r"(?:in|for|of) (?P<city>.+?)",
+    r"is (?P<city>.+?) (?:safe|dangerous)(?: to visit| for tourists| at night)?",
+    r"(?P<city>.+?) (?:safety|crime)(?: info(?:rmation)?| alerts?| tips| rating)?",
+)
+
+RoutedAnswer = namedtuple("RoutedAnswer", ["intent", "result", "confidence"])
+
+
+@lru_cache(maxsize=1)
+def _timezones():
+    """IANA names keyed by their lower-case form, built on the first time question."""
+    import pytz
+
+    return {name.lower(): name for name in pytz.all_timezones}
+
+
+# Words that make a slot name several places ("miami or chicago", "austin vs miami")
+_SEVERAL_PLACES = re.compile(r"\b(?:and|or|vs|versus|compared|than|plus|between)\b|[&/;+]")
+
+# What may follow a comma in a single place ("Austin, TX", "Miami, Florida, USA")
+_PLACE_SUFFIXES = frozenset(US_STATES) | frozenset(US_STATES.values()) | {"us", "usa", "united states"}
+
+
+def timezone_slot(text):
+    """Canonical IANA name of ``text`` with confidence 1.0, or 0.0 if unknown."""
+    name = _timezones().get(text.lower())
+    return (name, 1.0) if name else (text, 0.0)
+
+
+def names_several_places(text):
+    """Whether a slot lists or compares places instead of naming one."""
+    head, *rest = text.lower().replace(".", "").split(",")
+    return bool(_SEVERAL_PLACES.search(text.lower())) or any(
+        " ".join(part.split()) not in _PLACE_SUFFIXES for part in rest
+    )
+
+
+def city_slot(get_catalog, section):
+    """Slot check for one city the catalog has ``section`` data for.
+
+    The confidence is the resolver's match score: 1.0 for a city name or
+    alias, less for a misspelling. Slots naming several places score 0.0.
+
+    Args:
+        get_catalog: Returns the current catalog.
+        section: Catalog section the city must have data in, e.g. 'weather'.
+    """
+    def check(text):
+        if names_several_places(text):
+            return text, 0.0
+        catalog = get_catalog()
+        city, score = catalog.city_resolver.match(text)
+        return text, score if city in getattr(catalog, section) else 0.0
+    return check
+
+
+class Intent:
+    """A question the router can answer with a single tool call.
+
+    Args:
+        name: Intent name used in stats and logs.
+        tool: Tool to call; each slot is passed as the keyword of the same name.
+        patterns: Regexes matched against the whole question, case-insensitively,
+            with a named group per slot.
+        slots: Mapping of slot name -> ``check(text) -> (value, confidence)``.
+    """
+
+    def __init__(self, name, tool, patterns, slots):
+        self.name = name
+        self.tool = tool
+        self.patterns = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+        self.slots = slots
+
+    def match(self, text):
+        """Return ``(kwargs, confidence)`` of the best matching pattern, or None."""
+        best = None
+        for pattern in self.patterns:
+            found = pattern.fullmatch(text)
+            if found is None:
+                continue
+            kwargs, confidence = {}, 1.0
+            for slot, check in self.slots.items():
+                kwargs[slot], slot_confidence = check(found.group(slot).strip(" ,"))
+                confidence = min(confidence, slot_confidence)
+            if best is None or confidence > best[1]:
+                best = kwargs, confidence
+        return best
+
+
+class IntentRouter:
+    """Answers single-intent questions directly and counts how often it can.
+
+    Args:
+        intents: :class:`Intent` objects, tried in order.
+        min_confidence: Lowest slot confidence that is answered without the
+            agent; 1.0 only trusts exact city names and aliases.
+    """
+
+    def __init__(self, intents, min_confidence=1.0):
+        self.intents = list(intents)
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self.stats = {"routed": 0, "low_confidence": 0, "no_match": 0, "tool_errors": 0}
+
+    def record(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def match(self, task):
+        """Return ``(intent, kwargs, confidence)`` of the best intent for ``task``, or None."""
+        text = " ".join(task.split()).strip(" ?!.")
+        best = None
+        for intent in self.intents:
+            found = intent.match(text)
+            if found is not None and (best is None or found[1] > best[2]):
+                best = intent, *found
+        return best
+
+    def answer(self, task):
+        """Answer ``task`` with one tool call, or return None to let the agent handle it."""
+        found = self.match(task)
+        if found is None:
+            self.record("no_match")
+            return None
+        intent, kwargs, confidence = found
+        if confidence < self.min_confidence:
+            self.record("low_confidence")
+            return None
+        try:
+            result = intent.tool(**kwargs)
+        except Exception as e:
+            print(f"Intent router: {intent.name} tool failed, falling back to the agent: {str(e)}")
+            self.record("tool_errors")
+            return None
+        if isinstance(result, str) and result.startswith("Error"):
+            self.record("tool_errors")
+            return None
+        self.record("routed")
+        print(f"Intent router: answered with {intent.name} ({confidence:.2f} confidence, "
+              f"{self.hit_rate():.0%} of {self.lookups()} questions routed)")
+        return RoutedAnswer(intent.name, result, confidence)
+
+    def lookups(self):
+        return sum(self.stats.values())
+
+    def hit_rate(self):
+        lookups = self.lookups()
+        return self.stats["routed"] / lookups if lookups else 0.0
@@ -0,0 +1,99 @@
+"""Defer loading heavy tools until they are used.
+
+``load_tool`` fetches a tool's code from the Hub and instantiates it, which
+can take seconds. Doing that at import time holds up the UI, although
+most chats never call the tool. :class:`LazyTool` is a stand-in that the
+agent can list and call like any other tool. It loads the real tool on its
+first call, or earlier from a background warm-up thread, and reports load
+time and first-call latency separately.
+
+The agent builds its system prompt from the tool's name, description and
+inputs, so the stand-in declares them up front. Once the real tool loads,
+its description and inputs replace the declared ones for later runs.
+"""
+import threading
+import time
+
+from smolagents import Tool
+
+
+class LazyTool(Tool):
+    """Tool that loads the real tool on first use.
+
+    Args:
+        loader: Called with no arguments to load the real tool, e.g.
+            ``lambda: load_tool("agents-course/text-to-image", trust_remote_code=True)``.
+        name: Name the agent calls the tool by.
+        description: Description shown to the model until the tool loads.
+        inputs: Input schema, as on a smolagents ``Tool``.
+        output_type: Output type, as on a smolagents ``Tool``.
+    """
+
+    # forward() passes its arguments through to the real tool
+    skip_forward_signature_validation = True
+
+    def __init__(self, loader, name, description, inputs, output_type):
+        self.loader = loader
+        self.name = name
+        self.description = description
+        self.inputs = inputs
+        self.output_type = output_type
+        super().__init__()
+        self._tool = None
+        self._lock = threading.Lock()
+        self._warm_up = None
+        self.stats = {"load_seconds": None, "loaded_in": None, "load_errors": 0,
+                      "first_call_seconds": None, "calls": 0}
+
+    def load(self):
+        """Load the real tool if no one has yet, and return it."""
+        with self._lock:
+            if self._tool is None:
+                started = time.perf_counter()
+                try:
+                    tool = self.loader()
+                except Exception:
+                    self.stats["load_errors"] += 1
+                    raise
+                self.stats["load_seconds"] = time.perf_counter() - started
+                self.stats["loaded_in"] = threading.current_thread().name
+                self.description = getattr(tool, "description", self.description)
+                self.inputs = getattr(tool, "inputs", self.inputs)
+                self.output_type = getattr(tool, "output_type", self.output_type)
+                self._tool = tool
+                print(f"Tool {self.name}: loaded in {self.stats['load_seconds']:.2f} s ({self.stats['loaded_in']})")
+            return self._tool
+
+    def warm_up(self):
+        """Start loading the real tool on a background thread."""
+
+        def run():
+            try:
+                self.load()
+            except Exception as e:
+                print(f"Tool {self.name}: background loading failed, will retry on first use: {str(e)}")
+
+        self._warm_up = threading.Thread(target=run, name=f"warm-up-{self.name}", daemon=True)
+        self._warm_up.start()
+        return self._warm_up
+
+    def loaded(self):
+        return self._tool is not None
+
+    def forward(self, *args, **kwargs):
+        started = time.perf_counter()
+        was_loaded = self.loaded()
+        try:
+            tool = self.load()
+        except Exception as e:
+            return f"Error loading the {self.name} tool: {str(e)}"
+        result = tool(*args, **kwargs)
+        with self._lock:
+            self.stats["calls"] += 1
+            first_call = self.stats["first_call_seconds"] is None
+            if first_call:
+                self.stats["first_call_seconds"] = time.perf_counter() - started
+        if first_call:
+            waited = "already loaded" if was_loaded else "including loading"
+            print(f"Tool {self.name}: first call took {self.stats['first_call_seconds']:.2f} s ({waited})")
+        return result
@@ -0,0 +1,210 @@
+"""Persistent completion cache in front of the agent's model.
+
+Every agent step sends the full system prompt plus memory to the model, and
+popular openers repeat the exact same conversation prefix. :class:`CachingModel`
+keys each call on the model id, messages, temperature, stop sequences and
+other completion settings. Answers are stored in a SQLite file, which every
+worker process shares, with least-recently-used and time-to-live eviction.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from smolagents.models import ChatMessage
+
+# Deleting expired and least recently used rows on every write would be wasteful
+_EVICT_EVERY = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key TEXT PRIMARY KEY,
+    message TEXT NOT NULL,
+    input_tokens INTEGER,
+    output_tokens INTEGER,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS completions_last_used ON completions (last_used);
+"""
+
+
+class CompletionCache:
+    """SQLite-backed LRU + TTL store for model completions.
+
+    Args:
+        path: SQLite file; created if missing and safe to share between processes.
+        max_entries: Rows kept before the least recently used are evicted.
+        ttl_seconds: Age after which an entry is no longer served.
+    """
+
+    def __init__(self, path, max_entries=5000, ttl_seconds=86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "stores": 0, "evictions": 0, "errors": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        connection.executescript(_SCHEMA)
+        self.evict()
+
+    def _connection(self):
+        # SQLite connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def get(self, key):
+        """Return ``(message_json, input_tokens, output_tokens)`` or None on a miss."""
+        now = time.time()
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT message, input_tokens, output_tokens FROM completions WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            self.record("misses")
+            return None
+        connection.execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+        self.record("hits")
+        return row
+
+    def put(self, key, message_json, input_tokens, output_tokens):
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, message_json, input_tokens, output_tokens, now, now, now + self.ttl_seconds),
+        )
+        self.record("stores")
+        with self._lock:
+            self._writes += 1
+            due = self._writes % _EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Drop expired entries and the least recently used beyond ``max_entries``."""
+        connection = self._connection()
+        expired = connection.execute("DELETE FROM completions WHERE expires_at <= ?", (time.time(),)).rowcount
+        overflow = connection.execute(
+            "DELETE FROM completions WHERE key IN "
+            "(SELECT key FROM completions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        self.record("evictions", expired + overflow)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM completions")
+
+    def hit_rate(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+
+def _default(value):
+    # Anything without a stable JSON form (e.g. images) makes the call uncacheable
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+class CachingModel:
+    """Wraps a smolagents model and answers repeated calls from a :class:`CompletionCache`.
+
+    Every other attribute is forwarded to the wrapped model, so the agent
+    can use this as its model directly.
+
+    Args:
+        model: The model to wrap, e.g. ``HfApiModel``.
+        cache: Shared completion store.
+        bypass_sampling: Skip the cache when the temperature is above zero,
+            for callers that want a fresh sample on every call.
+    """
+
+    def __init__(self, model, cache, bypass_sampling=False):
+        self.model = model
+        self.cache = cache
+        self.bypass_sampling = bypass_sampling
+        # Agents on several threads share this model; each reads its own call's counts
+        self._counts = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    @property
+    def last_input_token_count(self):
+        return getattr(self._counts, "input", None)
+
+    @property
+    def last_output_token_count(self):
+        return getattr(self._counts, "output", None)
+
+    def _key(self, messages, stop_sequences, grammar, tools_to_call_from, kwargs):
+        settings = {**getattr(self.model, "kwargs", {}), **kwargs}
+        request = {
+            "model": getattr(self.model, "model_id", type(self.model).__name__),
+            "messages": messages,
+            "temperature": settings.pop("temperature", None),
+            "stop": stop_sequences,
+            "grammar": grammar,
+            "tools": sorted(tool.name for tool in tools_to_call_from or ()),
+            "settings": settings,
+        }
+        try:
+            payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=_default)
+        except TypeError:
+            return None, request["temperature"]
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest(), request["temperature"]
+
+    def __call__(self, messages, stop_sequences=None, grammar=None, tools_to_call_from=None, **kwargs):
+        key, temperature = self._key(messages, stop_sequences, grammar, tools_to_call_from, kwargs)
+        if key is None or (self.bypass_sampling and temperature):
+            self.cache.record("bypassed")
+            return self._call_model(messages, stop_sequences, grammar, tools_to_call_from, kwargs, None, "bypass")
+
+        try:
+            cached = self.cache.get(key)
+        except sqlite3.Error as e:
+            print(f"LLM cache read failed: {str(e)}")
+            self.cache.record("errors")
+            cached = None
+        if cached is not None:
+            message = ChatMessage.from_dict(json.loads(cached[0]))
+            # A cached answer costs no model tokens
+            self._counts.input = 0
+            self._counts.output = 0
+            return self._mark(message, "hit")
+        return self._call_model(messages, stop_sequences, grammar, tools_to_call_from, kwargs, key, "miss")
+
+    def _call_model(self, messages, stop_sequences, grammar, tools_to_call_from, kwargs, key, status):
+        message = self.model(messages, stop_sequences=stop_sequences, grammar=grammar,
+                             tools_to_call_from=tools_to_call_from, **kwargs)
+        self._counts.input = self.model.last_input_token_count
+        self._counts.output = self.model.last_output_token_count
+        if key is not None:
+            try:
+                self.cache.put(key, message.model_dump_json(), self._counts.input, self._counts.output)
+            except sqlite3.Error as e:
+                print(f"LLM cache write failed: {str(e)}")
+                self.cache.record("errors")
+        return self._mark(message, status)
+
+    def _mark(self, message, status):
+        """Record the cache outcome on the message so the UI can show it per step."""
+        stats = self.cache.stats
+        message.cache_status = f"{status} ({stats['hits']}/{stats['hits'] + stats['misses']} hits)"
+        return message
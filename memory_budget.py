@@ -0,0 +1,203 @@
+"""Keep the agent's model input within a token budget.
+
+The agent rebuilds its prompt from memory before every model call: the
+system prompt, then every earlier task and step. Over a long conversation
+that grows without bound. :class:`CompactingModel` wraps the model and,
+when the estimated size of a call exceeds the budget, compacts the messages
+in stages until they fit:
+
+1. Steps older than the last ``keep_steps`` lose their "Calling tools"
+   echo (it repeats the code) and images. Their thoughts and observations
+   are clipped to ``clip_chars``.
+2. Older steps are replaced, oldest first, by one-line summaries.
+3. Summaries are dropped, oldest first.
+
+The system prompt, the current task and the last ``keep_steps`` steps are
+always sent verbatim. Calls already within budget go through untouched.
+"""
+import threading
+
+from tool_results import estimate_tokens
+
+_CALLING_TOOLS = "Calling tools:"
+_NEW_TASK = "New task:"
+_SUMMARY_CHARS = 160
+_SUMMARY_HEADER = "Summary of earlier steps:"
+
+
+def _text(message):
+    content = message["content"]
+    if isinstance(content, str):
+        return content
+    return "\n".join(part["text"] for part in content if part.get("type") == "text")
+
+
+def _with_text(message, text):
+    return {**message, "content": [{"type": "text", "text": text}]}
+
+
+def _clip(text, limit):
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... [{len(text) - limit} chars of older output dropped]"
+
+
+def _first_line(text, limit=_SUMMARY_CHARS):
+    for line in text.splitlines():
+        line = line.strip()
+        if line and line not in ("Observation:", "Thought:") and not line.startswith("Call id:"):
+            return line if len(line) <= limit else line[:limit] + "..."
+    return ""
+
+
+def count_tokens(messages):
+    """Estimated input tokens of a list of chat messages."""
+    return sum(estimate_tokens(_text(message)) + 4 for message in messages)
+
+
+def _steps(messages):
+    """Group messages into tasks and steps; each starts with a user or model turn."""
+    steps = []
+    for message in messages:
+        starts_step = message["role"] == "user" or (
+            message["role"] == "assistant" and not _text(message).startswith(_CALLING_TOOLS))
+        if starts_step or not steps:
+            steps.append([])
+        steps[-1].append(message)
+    return steps
+
+
+def _has_image(message):
+    content = message["content"]
+    return not isinstance(content, str) and any(part.get("type") == "image" for part in content)
+
+
+def _shrink(step, clip_chars):
+    return [_with_text(message, _clip(_text(message), clip_chars)) for message in step
+            if not _text(message).startswith(_CALLING_TOOLS) and not _has_image(message)]
+
+
+def _summary(step):
+    """One line standing for a whole older task or step."""
+    first = _text(step[0])
+    if first.startswith(_NEW_TASK):
+        return f"- Earlier task: {_first_line(first[len(_NEW_TASK):])}"
+    outcome = " ".join(_first_line(_text(message)) for message in step[1:]).strip()
+    line = f"- Step: {_first_line(first)}"
+    return f"{line} -> {outcome[:_SUMMARY_CHARS]}" if outcome else line
+
+
+def _summary_message(lines):
+    return {"role": "user", "content": [{"type": "text", "text": "\n".join([_SUMMARY_HEADER, *lines])}]}
+
+
+_SUMMARY_HEADER_TOKENS = count_tokens([_summary_message([])])
+
+
+def _assemble(head, older, recent):
+    result, lines = list(head), []
+    for entry in older:
+        if entry["summary"] is not None:
+            lines.append(entry["summary"])
+            continue
+        if lines:
+            result.append(_summary_message(lines))
+            lines = []
+        result.extend(entry["messages"])
+    if lines:
+        result.append(_summary_message(lines))
+    return result + recent
+
+
+def _older_tokens(older):
+    # Runs of summarized steps share one message, whose cost is its header plus its lines
+    total, in_summary = 0, False
+    for entry in older:
+        summarized = entry["summary"] is not None
+        if not summarized:
+            total += entry["tokens"]
+        else:
+            total += entry["summary_tokens"] + (0 if in_summary else _SUMMARY_HEADER_TOKENS)
+        in_summary = summarized
+    return total
+
+
+def compact_messages(messages, budget, keep_steps=3, clip_chars=400):
+    """Return ``messages`` compacted to fit ``budget`` estimated tokens where possible.
+
+    Args:
+        messages: Chat messages as built from agent memory, system prompt first.
+        budget: Estimated input tokens allowed per model call.
+        keep_steps: Most recent steps always kept verbatim.
+        clip_chars: Length older thoughts and observations are clipped to.
+    """
+    if count_tokens(messages) <= budget:
+        return messages
+    head = messages[:1] if messages and messages[0]["role"] == "system" else []
+    steps = _steps(messages[len(head):])
+    split = max(len(steps) - keep_steps, 0)
+    # The task being worked on stays verbatim however old its message is
+    current_task = max((i for i, step in enumerate(steps) if _text(step[0]).startswith(_NEW_TASK)), default=None)
+    older = []
+    for i, step in enumerate(steps[:split]):
+        kept = step if i == current_task else _shrink(step, clip_chars)
+        older.append({"step": step, "messages": kept, "tokens": count_tokens(kept),
+                      "summary": None, "summary_tokens": 0, "pinned": i == current_task})
+    recent = [message for step in steps[split:] for message in step]
+    fixed = count_tokens(head) + count_tokens(recent)
+
+    # Summarize, then drop, the oldest steps until the call fits
+    for entry in older:
+        if fixed + _older_tokens(older) <= budget:
+            break
+        if not entry["pinned"]:
+            entry["summary"] = _summary(entry["step"])
+            entry["summary_tokens"] = estimate_tokens(entry["summary"])
+    while fixed + _older_tokens(older) > budget:
+        dropped = next((entry for entry in older if entry["summary"] is not None), None)
+        if dropped is None:
+            break
+        older.remove(dropped)
+    return _assemble(head, older, recent)
+
+
+class CompactingModel:
+    """Wraps a smolagents model and compacts each call's messages to a token budget.
+
+    Every other attribute is forwarded to the wrapped model.
+
+    Args:
+        model: The model to wrap, e.g. ``HfApiModel`` or ``CachingModel``.
+        budget: Estimated input tokens allowed per call.
+        keep_steps: Most recent steps always kept verbatim.
+        clip_chars: Length older thoughts and observations are clipped to.
+        verbose: Print the estimated and counted input tokens of every call.
+    """
+
+    def __init__(self, model, budget=8000, keep_steps=3, clip_chars=400, verbose=False):
+        self.model = model
+        self.budget = budget
+        self.keep_steps = keep_steps
+        self.clip_chars = clip_chars
+        self.verbose = verbose
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "compacted": 0, "tokens_before": 0, "tokens_after": 0}
+
+    def __getattr__(self, name):
+        return getattr(self.model, name)
+
+    def __call__(self, messages, *args, **kwargs):
+        before = count_tokens(messages)
+        compacted = compact_messages(messages, self.budget, self.keep_steps, self.clip_chars)
+        after = count_tokens(compacted) if compacted is not messages else before
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["compacted"] += compacted is not messages
+            self.stats["tokens_before"] += before
+            self.stats["tokens_after"] += after
+        message = self.model(compacted, *args, **kwargs)
+        if self.verbose:
+            compaction = f", compacted to ~{after}" if compacted is not messages else ""
+            print(f"Model input: ~{before} estimated tokens{compaction} (budget {self.budget}), "
+                  f"model counted {getattr(self.model, 'last_input_token_count', None)}")
+        return message
@@ -0,0 +1,212 @@
+"""Rate-limited, coalescing front for the web search tool.
+
+DuckDuckGo answers bursts of searches with "202 Ratelimit", and sleeping on
+the worker thread until it relents stalls the whole chat. :class:`SearchBackend`
+puts three things between the agent and the search provider:
+
+1. Identical searches already in flight are coalesced: followers wait for
+   the leader's result instead of searching again.
+2. A process-wide token bucket spaces searches out. A search that finds
+   the bucket empty is turned away at once, with the seconds until the
+   next token, so the agent thread never sleeps waiting for its turn.
+3. A circuit breaker opens on a rate limit, or after ``failure_threshold``
+   consecutive provider errors. While it is open, searches fail fast. Each
+   time it reopens, the pause doubles, up to ``max_backoff``. After a
+   pause, one search probes the provider; success closes the breaker.
+
+Results are cached separately by ``@cached_tool`` on ``web_search``.
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+from tool_cache import normalize_text
+
+# Exceptions of duckduckgo_search and the HTTP clients that mean the provider failed
+_UPSTREAM_ERRORS = {"DuckDuckGoSearchException", "HTTPError", "TimeoutException", "RequestException"}
+
+# duckduckgo_search.exceptions.RatelimitException, matched by name so the package stays optional
+_RATE_LIMIT_ERROR = "RatelimitException"
+
+
+def is_rate_limit(error):
+    """Whether ``error`` is the search provider asking us to slow down."""
+    names = {cls.__name__ for cls in type(error).__mro__}
+    # Errors that wrap it keep its "202 Ratelimit" message
+    return _RATE_LIMIT_ERROR in names or "Ratelimit" in str(error)
+
+
+def is_upstream_error(error):
+    """Whether ``error`` came from the provider or the network rather than the query."""
+    names = {cls.__name__ for cls in type(error).__mro__}
+    return bool(names & _UPSTREAM_ERRORS) or isinstance(error, (OSError, TimeoutError))
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Args:
+        rate: Tokens added per second.
+        burst: Most tokens the bucket holds.
+    """
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token if one is available; never waits.
+
+        Returns:
+            Tuple ``(acquired, retry_after_seconds)``; ``retry_after_seconds``
+            is when the next token comes if none was available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                return False, (1 - self._tokens) / self.rate
+            self._tokens -= 1
+            return True, 0.0
+
+
+class CircuitBreaker:
+    """Closed, open or half-open breaker with exponential backoff.
+
+    Args:
+        failure_threshold: Consecutive failures that open the breaker.
+        base_backoff: Seconds the breaker first stays open.
+        max_backoff: Longest pause, however often it reopens.
+    """
+
+    def __init__(self, failure_threshold=3, base_backoff=2.0, max_backoff=120.0):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = "closed"
+        self._failures = 0
+        self._trips = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Return ``(allowed, retry_after_seconds)`` for a call starting now."""
+        with self._lock:
+            now = time.monotonic()
+            if self.state == "closed":
+                return True, 0.0
+            if self.state == "open" and now >= self._open_until:
+                # Let one call probe the provider; the rest keep failing fast
+                self.state = "half_open"
+                return True, 0.0
+            return False, max(self._open_until - now, 0.0)
+
+    def release(self):
+        """Give back a probe that never reached the provider."""
+        with self._lock:
+            if self.state == "half_open":
+                self.state = "open"
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._trips = 0
+
+    def failure(self, trip=False):
+        """Record a failed call; ``trip`` opens the breaker at once. Returns the pause, or 0.0."""
+        with self._lock:
+            self._failures += 1
+            if not (trip or self.state == "half_open" or self._failures >= self.failure_threshold):
+                return 0.0
+            self._trips += 1
+            pause = min(self.base_backoff * 2 ** (self._trips - 1), self.max_backoff)
+            self.state = "open"
+            self._open_until = time.monotonic() + pause
+            return pause
+
+
+class SearchBackend:
+    """Coalescing, rate-limited and circuit-broken calls to a search function.
+
+    Args:
+        fetch: Called with the query; returns the results text or raises.
+        rate: Searches per second allowed across the process.
+        burst: Searches allowed back to back before ``rate`` applies.
+        failure_threshold: Consecutive provider errors that open the breaker.
+        base_backoff: Seconds searches pause after the breaker first opens.
+        max_backoff: Longest pause.
+    """
+
+    def __init__(self, fetch, rate=1.0, burst=3, failure_threshold=3, base_backoff=2.0, max_backoff=120.0):
+        self.fetch = fetch
+        self.bucket = TokenBucket(rate, burst)
+        self.breaker = CircuitBreaker(failure_threshold, base_backoff, max_backoff)
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.stats = {"searches": 0, "coalesced": 0, "throttled": 0, "short_circuited": 0,
+                      "rate_limited": 0, "errors": 0}
+
+    def record(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def search(self, query):
+        """Search for ``query``, sharing the result with identical searches in flight."""
+        key = normalize_text(query)
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+        if not leader:
+            self.record("coalesced")
+            return future.result()
+        try:
+            result = self._search(query)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _search(self, query):
+        allowed, retry_after = self.breaker.allow()
+        if not allowed:
+            self.record("short_circuited")
+            return (f"Sorry, web search is paused for another {max(retry_after, 1):.0f} seconds after errors from the "
+                    f"search provider, so I couldn't search for '{query}'. Please try again shortly or try a different question.")
+        acquired, retry_after = self.bucket.acquire()
+        if not acquired:
+            self.breaker.release()
+            self.record("throttled")
+            return (f"Sorry, too many web searches are running to search for '{query}' right now. "
+                    f"Please try again in {max(retry_after, 1):.0f} seconds.")
+
+        try:
+            result = self.fetch(query)
+        except Exception as e:
+            if is_rate_limit(e):
+                self.record("rate_limited")
+                pause = self.breaker.failure(trip=True)
+                print(f"Web search: rate limited by the provider, pausing searches for {pause:g} s")
+                return f"Sorry, I couldn't perform the web search for '{query}' because of rate limiting. Please try again in a few minutes or try a different search term."
+            if is_upstream_error(e):
+                self.record("errors")
+                pause = self.breaker.failure()
+                if pause:
+                    print(f"Web search: {self.breaker.failure_threshold} provider errors in a row, pausing searches for {pause:g} s")
+            else:
+                # e.g. no results: the provider answered, so it is healthy
+                self.breaker.success()
+            return f"Error performing search for '{query}': {str(e)}"
+        self.breaker.success()
+        self.record("searches")
+        return result
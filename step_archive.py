@@ -0,0 +1,112 @@
+"""Move a chat session's older turns out of agent memory.
+
+A session's agent keeps every step of the conversation in memory, and each
+step also holds the full model input it was produced from, so a long chat
+grows the process without bound. :class:`StepArchive` moves all but the last
+``keep_turns`` turns into a SQLite file, keyed by session. Archived steps no
+longer reach the model, which only saw a compacted summary of them anyway.
+They can still be read back with :meth:`StepArchive.load`.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS steps (
+    session_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    step TEXT NOT NULL,
+    archived_at REAL NOT NULL,
+    PRIMARY KEY (session_id, position)
+);
+"""
+
+
+def _is_task(step):
+    return type(step).__name__ == "TaskStep"
+
+
+def step_record(step):
+    """JSON-ready dict of a memory step, without the model input it was built from."""
+    record = step.dict() if hasattr(step, "dict") else dict(vars(step))
+    record.pop("model_input_messages", None)
+    return {"type": type(step).__name__, **record}
+
+
+class StepArchive:
+    """SQLite store for the older turns of chat sessions.
+
+    Args:
+        path: SQLite file; created if missing.
+        keep_turns: Most recent turns (a task and its steps) left in agent memory.
+    """
+
+    def __init__(self, path, keep_turns=5):
+        self.path = path
+        self.keep_turns = keep_turns
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.stats = {"archived_turns": 0, "archived_steps": 0, "archived_bytes": 0, "dropped_sessions": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        # SQLite connections must not be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+        return connection
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def archive(self, session_id, agent):
+        """Move all but the last ``keep_turns`` turns of ``agent``'s memory to the archive.
+
+        Returns:
+            Number of steps archived.
+        """
+        steps = agent.memory.steps
+        starts = [i for i, step in enumerate(steps) if _is_task(step)]
+        if len(starts) <= self.keep_turns:
+            return 0
+        cut = starts[len(starts) - self.keep_turns] if self.keep_turns > 0 else len(steps)
+        rows = [json.dumps(step_record(step), default=str) for step in steps[:cut]]
+
+        connection = self._connection()
+        offset = connection.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM steps WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+        now = time.time()
+        with connection:
+            # One transaction per archived batch rather than one per row
+            connection.execute("BEGIN")
+            connection.executemany(
+                "INSERT INTO steps (session_id, position, step, archived_at) VALUES (?, ?, ?, ?)",
+                [(session_id, offset + i, row, now) for i, row in enumerate(rows)],
+            )
+        del steps[:cut]
+        self.record("archived_turns", sum(1 for start in starts if start < cut))
+        self.record("archived_steps", len(rows))
+        self.record("archived_bytes", sum(len(row) for row in rows))
+        return len(rows)
+
+    def load(self, session_id):
+        """Archived steps of ``session_id`` as dicts, oldest first."""
+        rows = self._connection().execute(
+            "SELECT step FROM steps WHERE session_id = ? ORDER BY position", (session_id,)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def drop(self, session_id):
+        """Forget a session, e.g. when its agent is reset for another one."""
+        deleted = self._connection().execute("DELETE FROM steps WHERE session_id = ?", (session_id,)).rowcount
+        if deleted:
+            self.record("dropped_sessions")
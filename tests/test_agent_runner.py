@@ -0,0 +1,156 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agent_runner import AsyncAgentRunner
+
+
+class FakeAgent:
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.memory = self
+        self.state = {}
+        self.python_executor = type("Executor", (), {"state": {}})()
+        self.turns = []
+
+    def reset(self):
+        self.turns.clear()
+
+    def run(self, task):
+        time.sleep(self.delay)
+        self.turns.append(task)
+        return f"{task} ({len(self.turns)} turns)"
+
+
+def test_sessions_keep_their_own_agent_and_run_concurrently():
+    runner = AsyncAgentRunner(FakeAgent, max_concurrency=4)
+
+    async def main():
+        started = time.perf_counter()
+        answers = await asyncio.gather(*(runner.run(f"task {i}", session_id=f"s{i}") for i in range(4)))
+        elapsed = time.perf_counter() - started
+        follow_up = await runner.run("again", session_id="s0")
+        return answers, elapsed, follow_up
+
+    answers, elapsed, follow_up = asyncio.run(main())
+    assert answers == [f"task {i} (1 turns)" for i in range(4)]
+    assert elapsed < 0.15
+    assert follow_up == "again (2 turns)"
+    assert runner.metrics()["pool_size"] == 4 and runner.stats["peak_active"] == 4
+
+
+def test_full_pool_resets_the_least_recent_session_for_a_new_one():
+    runner = AsyncAgentRunner(lambda: FakeAgent(0), max_concurrency=1, max_agents=2)
+
+    async def main():
+        await runner.run("a", session_id="a")
+        await runner.run("b", session_id="b")
+        await runner.run("c", session_id="c")
+        return await runner.run("b again", session_id="b")
+
+    assert asyncio.run(main()) == "b again (2 turns)"
+    assert runner.pool_size() == 2
+    assert runner.stats["evicted"] == 1
+
+
+def test_idle_sessions_give_their_agent_back():
+    runner = AsyncAgentRunner(lambda: FakeAgent(0), max_concurrency=1, idle_seconds=0)
+
+    async def main():
+        await runner.run("a", session_id="a")
+        return await runner.run("a again", session_id="a")
+
+    assert asyncio.run(main()) == "a again (1 turns)"
+    assert runner.stats["idle_evicted"] == 1
+
+
+def test_evicted_agents_are_reset_off_the_event_loop():
+    class SlowArchive:
+        def __init__(self):
+            self.dropped = []
+
+        def archive(self, session_id, agent):
+            pass
+
+        def drop(self, session_id):
+            time.sleep(0.2)
+            self.dropped.append((session_id, threading.current_thread().name))
+
+    archive = SlowArchive()
+    runner = AsyncAgentRunner(lambda: FakeAgent(0), max_concurrency=1, idle_seconds=0, archive=archive)
+
+    async def main():
+        await runner.run("a", session_id="a")
+        ticks = []
+
+        async def tick():
+            for _ in range(10):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        answer = await runner.run("b", session_id="b")
+        await ticker
+        return answer, max(later - earlier for earlier, later in zip(ticks, ticks[1:]))
+
+    answer, longest_gap = asyncio.run(main())
+    # The reused agent was reset before its next run, without blocking the loop meanwhile
+    assert answer == "b (1 turns)"
+    assert longest_gap < 0.15
+    (session_id, thread), = archive.dropped
+    assert session_id == "a" and thread.startswith("agent-run")
+
+
+def test_runs_of_one_session_take_turns():
+    runner = AsyncAgentRunner(FakeAgent, max_concurrency=4)
+
+    async def main():
+        return await asyncio.gather(runner.run("first", session_id="s"), runner.run("second", session_id="s"))
+
+    assert asyncio.run(main()) == ["first (1 turns)", "second (2 turns)"]
+    assert runner.pool_size() == 1
+
+
+def test_failed_agent_build_frees_its_place():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("no model")
+        return FakeAgent(0)
+
+    runner = AsyncAgentRunner(factory, max_concurrency=1)
+
+    async def main():
+        with pytest.raises(RuntimeError):
+            await runner.run("a", session_id="a")
+        return await runner.run("a", session_id="a")
+
+    assert asyncio.run(main()) == "a (1 turns)"
+    assert runner.pool_size() == 1
+
+
+def test_iterate_streams_items_and_stops_the_producer_early():
+    runner = AsyncAgentRunner(FakeAgent, max_concurrency=2)
+    closed = threading.Event()
+
+    def steps():
+        try:
+            for i in range(100):
+                yield i
+        finally:
+            closed.set()
+
+    async def main():
+        seen = []
+        async for item in runner.iterate(steps):
+            seen.append(item)
+            if len(seen) == 3:
+                break
+        return seen
+
+    assert asyncio.run(main()) == [0, 1, 2]
+    assert closed.wait(1)
@@ -0,0 +1,78 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from answer_cache import AnswerCache, proper_nouns, task_guards  # noqa: E402
+from travel_catalog.cities import CITY_STATES, CityResolver  # noqa: E402
+
+resolver = CityResolver(CITY_STATES)
+
+# Each stored task, a true paraphrase that should be answered from the cache,
+# and near-duplicates that ask something else
+CASES = [
+    (
+        "Plan a 3 day family itinerary for Chicago with kids",
+        "Plan a family itinerary for Chicago with kids, 3 day",
+        ["Plan a 3 day family itinerary for Austin with kids",
+         "Plan a 3 day family itinerary for Miami with kids",
+         "Plan a 3 day family itinerary for New York with kids"],
+    ),
+    (
+        "Is Miami safe for tourists?",
+        "is miami safe for tourists",
+        ["Is Miami unsafe for tourists?", "Is Miami not safe for tourists?"],
+    ),
+    (
+        "Vegetarian restaurants near Union Square in New York",
+        "Union Square vegetarian restaurants in New York",
+        ["Vegetarian restaurants near Times Square in New York"],
+    ),
+]
+
+
+@pytest.fixture
+def cache():
+    return AnswerCache(threshold=0.8, find_places=resolver.mentions)
+
+
+@pytest.mark.parametrize("task, paraphrase, others", CASES)
+def test_paraphrases_hit_and_other_questions_miss(cache, task, paraphrase, others):
+    cache.store(task, "answer")
+    hit = cache.lookup(paraphrase)
+    assert hit is not None and hit.task == task
+    for other in others:
+        assert cache.lookup(other) is None, other
+
+
+def test_aliases_name_the_same_city():
+    def guards(task):
+        return task_guards(task, resolver.mentions(task))
+
+    assert guards("Best pizza in New York") == guards("best pizza in NYC") == {"city:new york"}
+    assert guards("Best pizza in Chicgo") == {"city:chicago"}
+    assert guards("Best pizza in Miami, OK") == {"city:miami ok"}
+
+
+def test_guards():
+    assert task_guards("Trip from Chicago to Miami for 2") == {"2", "from>chicago", "to>miami", "name:chicago",
+                                                              "name:miami"}
+    places = resolver.mentions("Trip from Chicago to Miami for 2")
+    assert task_guards("Trip from Chicago to Miami for 2", places) == {
+        "2", "from>chicago", "to>miami", "city:chicago", "city:miami"}
+    assert "not:without" in task_guards("Hotels without parking")
+    assert proper_nouns("Best hotels near Union Square. Times Square is busy") == {"union", "square", "times"}
+
+
+def test_volatile_tasks_are_not_cached(cache):
+    cache.store("Weather in Austin today", "sunny")
+    assert cache.lookup("Weather in Austin today") is None
+    assert cache.stats["skipped"] == 1
+
+
+def test_reloaded_catalog_drops_answers():
+    version = [1]
+    cache = AnswerCache(version=lambda: version[0])
+    cache.store("hotels in austin", "answer")
+    assert cache.lookup("hotels in austin") is not None
+    version[0] = 2
+    assert cache.lookup("hotels in austin") is None
@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+from bootstrap import Bootstrap, import_times
+
+IMPORT_TIME_REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      2000 |       5000 |   gradio.utils
+import time:      1000 |     900000 | gradio
+import time:       300 |      40000 | smolagents
+garbage line
+"""
+
+
+def test_stages_accumulate_and_readiness_flips_when_ready(capsys):
+    bootstrap = Bootstrap(budget_seconds=0.0)
+    with bootstrap.stage("catalog"):
+        pass
+    with bootstrap.stage("catalog"):
+        pass
+    done = threading.Event()
+    worker = bootstrap.track("warm_up", threading.Thread(target=done.wait))
+    worker.start()
+
+    readiness = bootstrap.readiness()
+    assert readiness["ready"] is False
+    assert set(readiness["stages"]) == {"catalog"}
+    assert readiness["background"] == {"warm_up": "running"}
+
+    bootstrap.mark_ready()
+    done.set()
+    worker.join()
+    readiness = bootstrap.readiness()
+    assert readiness["ready"] is True
+    assert readiness["background"] == {"warm_up": "done"}
+    output = capsys.readouterr().out
+    assert "Startup: ready in" in output and "catalog" in output
+    assert "over the 0 s budget" in output
+
+
+def test_import_times_charge_each_package_its_largest_import():
+    assert import_times(IMPORT_TIME_REPORT) == {"_io": 0.00012, "gradio": 0.9, "smolagents": 0.04}
+
+
+def test_probe_answers_503_until_ready():
+    testclient = pytest.importorskip("starlette.testclient")
+    from starlette.applications import Starlette
+
+    bootstrap = Bootstrap()
+    client = testclient.TestClient(Starlette(routes=[bootstrap.route()]))
+    assert client.get("/ready").status_code == 503
+    bootstrap.mark_ready()
+    response = client.get("/ready")
+    assert response.status_code == 200 and response.json()["ready"] is True
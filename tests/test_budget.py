@@ -0,0 +1,29 @@
+import pytest
+
+from travel_catalog.budget import BudgetRateTable, cheapest
+
+BUDGET = {
+    "austin": {"accommodation": {"budget": 100, "mid-range": 180, "luxury": 350},
+               "food": {"budget": 30, "mid-range": 60, "luxury": 120}, "local_transport": 10, "attractions": 20},
+    "miami": {"accommodation": {"budget": 130, "mid-range": 220, "luxury": 400},
+              "food": {"budget": 35, "mid-range": 70, "luxury": 140}, "local_transport": 12, "attractions": 25},
+}
+
+
+def test_estimate_matches_the_per_trip_formula():
+    rates = BudgetRateTable(BUDGET)
+    rows, known, unknown = rates.rows(["miami", "boise", "austin"])
+    assert known == ["miami", "austin"]
+    assert unknown == ["boise"]
+    totals = rates.estimate(rows, [1, 3], [2, 5], rates.columns(["budget", "luxury"]))["total"]
+    assert totals.shape == (2, 2, 2, 2)
+    # Miami, 3 people (2 rooms), 5 days, luxury
+    assert totals[0, 1, 1, 1] == 400 * 2 * 5 + 140 * 3 * 5 + 12 * 3 * 5 + 25 * 3 * 5
+    # Austin, 1 person, 2 days, budget
+    assert totals[1, 0, 0, 0] == 100 * 2 + 30 * 2 + 10 * 2 + 20 * 2
+    assert cheapest(totals) == (1, 0, 0, 0)
+
+
+def test_unknown_tier_is_a_value_error():
+    with pytest.raises(ValueError, match="penthouse"):
+        BudgetRateTable(BUDGET).columns(["penthouse"])
@@ -0,0 +1,39 @@
+import pytest
+
+from travel_catalog.catalog import TravelCatalog, builtin_sections, compile_catalog
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return TravelCatalog.from_builtin()
+
+
+def test_catalog_is_read_only(catalog):
+    with pytest.raises(AttributeError):
+        catalog.version = 2
+    with pytest.raises(TypeError):
+        catalog.hotels["austin"][0]["price"] = 1
+    with pytest.raises(TypeError):
+        catalog.safety["miami"] = {}
+
+
+def test_every_section_names_its_cities(catalog):
+    assert {"new york", "austin", "chicago", "miami"} <= catalog.cities
+    assert catalog.resolve_city("NYC") == "new york"
+    assert catalog.find_cities("Hotels in Austin, TX") == [("austin", "Austin , TX")]
+
+
+def test_indexes_and_tables_are_built_once(catalog):
+    assert catalog.hotel_indexes["austin"] is catalog.hotel_indexes["austin"]
+    assert len(catalog.restaurant_indexes["new york"]) == len(catalog.restaurants["new york"])
+    assert catalog.route_graph is catalog.route_graph
+    assert catalog.budget_rates is catalog.budget_rates
+
+
+def test_compiled_file_holds_the_same_data(tmp_path, catalog):
+    path = compile_catalog(str(tmp_path / "catalog.tcat"))
+    mapped = TravelCatalog.from_file(path)
+    assert mapped.cities == catalog.cities
+    for city in builtin_sections()["hotels"]:
+        assert [hotel["name"] for hotel in mapped.hotels[city]] == [hotel["name"] for hotel in catalog.hotels[city]]
+    assert mapped.safety["miami"] == catalog.safety["miami"]
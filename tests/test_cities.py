@@ -0,0 +1,74 @@
+import pytest
+
+from travel_catalog.cities import CITY_STATES, CityResolver, edit_distance, parse_location
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return CityResolver(CITY_STATES)
+
+
+@pytest.mark.parametrize("location, city", [
+    ("New York", "new york"),
+    ("New York, NY", "new york"),
+    ("Austin TX", "austin"),
+    ("Miami, Florida, USA", "miami"),
+    ("NYC", "new york"),
+    ("LA", "los angeles"),
+    ("New Orleans, LA", "new orleans"),
+])
+def test_names_and_aliases_resolve_exactly(resolver, location, city):
+    assert resolver.match(location) == (city, 1.0)
+    assert resolver.resolve(location) == city
+
+
+@pytest.mark.parametrize("location, city", [
+    ("Chicgo", "chicago"),
+    ("New Yrok", "new york"),
+    ("San Fransisco", "san francisco"),
+    ("Los Angelos", "los angeles"),
+    ("Nashvile", "nashville"),
+])
+def test_typos_resolve_below_full_confidence(resolver, location, city):
+    found, score = resolver.match(location)
+    assert found == city
+    assert 0.5 < score < 1.0
+
+
+@pytest.mark.parametrize("location", [
+    "Nashua", "York, PA", "Austintown", "North Miami", "Miami Gardens", "East Chicago", "Chicago Heights", "Boise",
+])
+def test_other_places_are_not_catalog_cities(resolver, location):
+    assert resolver.match(location) == (None, 0.0)
+    assert resolver.resolve(location) not in resolver.cities
+
+
+@pytest.mark.parametrize("location", ["Miami, OK", "Austin, MN", "Las Vegas NM", "Chicago, Texas"])
+def test_conflicting_state_is_unknown(resolver, location):
+    assert resolver.match(location) == (None, 0.0)
+    assert resolver.resolve(location) not in resolver.cities
+
+
+@pytest.mark.parametrize("text, cities", [
+    ("Trip from New York to Las Vegas next week", ["new york", "las vegas"]),
+    ("Hotels in NYC and L.A. in June", ["new york", "los angeles"]),
+    ("Austin, TX or Nashville TN?", ["austin", "nashville"]),
+    ("Is Miami, OK worth a visit", ["miami ok"]),
+    ("Best hotels in Chicgo", ["chicago"]),
+    # Ordinary words a typo away from a city, and cities sharing a word, are not mentions
+    ("vegan food near the bay", []),
+    ("Weather in York and Nashua", []),
+])
+def test_mentions_in_free_text(resolver, text, cities):
+    assert [city for city, _ in resolver.mentions(text)] == cities
+
+
+def test_parse_location_keeps_the_state():
+    assert parse_location("Las Vegas NM") == ("las vegas", "nm")
+    assert parse_location("Buffalo, New York") == ("buffalo", "ny")
+    assert parse_location("new york") == ("new york", None)
+
+
+def test_edit_distance_counts_swaps_once_and_stops_at_limit():
+    assert edit_distance("new yrok", "new york", 2) == 1
+    assert edit_distance("nashua", "nashville", 1) == 2
@@ -0,0 +1,81 @@
+import struct
+
+import pytest
+
+from travel_catalog.catalog import builtin_sections
+from travel_catalog.columnar import ColumnarCatalog, LazyMapping, freeze, write_catalog
+
+SECTIONS = {
+    "hotels": {
+        "austin": [
+            {"name": "Lone Star Inn", "price": 120, "rating": 4.5, "pool": True, "amenities": ["wifi", "gym"]},
+            {"name": "Sixth Street Hostel", "price": 40, "rating": 3.9, "pool": False, "amenities": []},
+        ],
+        "miami": [
+            # Missing and irregular fields round-trip too
+            {"name": "Beach House", "rating": 4.1, "extra": {"view": "ocean"}},
+        ],
+    },
+    "safety": {"austin": {"overall": "Safe", "tips": ["Stay hydrated"]}, "miami": {"overall": "Mostly Safe"}},
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    path = tmp_path / "test.tcat"
+    write_catalog(str(path), SECTIONS, table_sections=("hotels",))
+    return ColumnarCatalog(str(path))
+
+
+def test_record_sections_round_trip(store):
+    hotels = store.section("hotels")
+    assert list(hotels) == ["austin", "miami"]
+    austin = hotels["austin"]
+    assert len(austin) == 2
+    assert dict(austin[0]) == {"name": "Lone Star Inn", "price": 120, "rating": 4.5, "pool": True,
+                               "amenities": ("wifi", "gym")}
+    assert austin[-1]["pool"] is False
+    assert austin[1]["amenities"] == ()
+    beach = hotels["miami"][0]
+    assert "price" not in beach
+    assert dict(beach) == {"name": "Beach House", "rating": 4.1, "extra": {"view": "ocean"}}
+    with pytest.raises(IndexError):
+        austin[2]
+    with pytest.raises(KeyError):
+        hotels["boise"]
+
+
+def test_document_sections_are_frozen(store):
+    safety = store.section("safety")
+    assert safety["austin"]["tips"] == ("Stay hydrated",)
+    with pytest.raises(TypeError):
+        safety["austin"]["overall"] = "Unsafe"
+    # Parsed once, then served from the mapping
+    assert safety["miami"] is safety["miami"]
+
+
+def test_builtin_data_round_trips(tmp_path):
+    path = tmp_path / "catalog.tcat"
+    sections = builtin_sections()
+    write_catalog(str(path), sections)
+    store = ColumnarCatalog(str(path))
+    assert set(store.section_names) == set(sections)
+    for city, hotels in sections["hotels"].items():
+        assert [dict(record) for record in store.section("hotels")[city]] == [freeze(hotel) for hotel in hotels]
+    assert store.section("weather")["chicago"] == freeze(sections["weather"]["chicago"])
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "other.tcat"
+    path.write_bytes(struct.pack("<4sIQQ", b"ZZZZ", 1, 0, 0))
+    with pytest.raises(ValueError, match="not a version"):
+        ColumnarCatalog(str(path))
+
+
+def test_lazy_mapping_builds_each_value_once():
+    built = []
+    mapping = LazyMapping(["a", "b"], lambda key: built.append(key) or key.upper())
+    assert "b" in mapping and "c" not in mapping
+    assert mapping["a"] == "A" and mapping["a"] == "A"
+    assert built == ["a"]
+    assert len(mapping) == 2
@@ -0,0 +1,101 @@
+import threading
+import time
+
+import pytest
+
+from concurrent_tools import ConcurrentToolExecutor, independent_calls
+
+
+class FakeExecutor:
+    """Runs code with the tools as globals, like the smolagents Python executor."""
+
+    def __init__(self, tools):
+        self.static_tools = tools
+        self.state = {}
+
+    def __call__(self, code_action, additional_variables):
+        namespace = {**self.static_tools, **self.state, **additional_variables}
+        exec(code_action, namespace)
+        return namespace.get("result")
+
+
+def slow_tool(calls, delay=0.1):
+    def lookup(city):
+        calls.append(city)
+        time.sleep(delay)
+        return f"data for {city}"
+    return lookup
+
+
+def test_independent_calls_skip_conditional_and_dependent_calls():
+    code = "\n".join([
+        'a = lookup("miami")',
+        'b = lookup(city)',
+        'c = lookup(a)',
+        'if a:\n    d = lookup("austin")',
+        'e = other("chicago")',
+    ])
+    assert independent_calls(code, {"lookup"}, {"city": "boston"}) == [
+        ("lookup", ["miami"], {}), ("lookup", ["boston"], {})]
+
+
+def test_top_level_calls_run_together():
+    calls = []
+    executor = ConcurrentToolExecutor(FakeExecutor({"lookup": slow_tool(calls)}), ["lookup"])
+    started = time.perf_counter()
+    result = executor('a = lookup("miami")\nb = lookup("austin")\nresult = [a, b]', {})
+    assert time.perf_counter() - started < 0.18
+    assert result == ["data for miami", "data for austin"]
+    assert executor.stats["served"] == 2
+    assert sorted(calls) == ["austin", "miami"]
+
+
+def test_errors_reach_the_code_as_in_a_serial_call():
+    def failing(city):
+        raise ValueError(f"no {city}")
+
+    executor = ConcurrentToolExecutor(FakeExecutor({"lookup": failing}), ["lookup"])
+    with pytest.raises(ValueError, match="no miami"):
+        executor('a = lookup("miami")\nb = lookup("austin")', {})
+    assert executor.stats["unused"] == 1
+
+
+def test_unreached_calls_still_queued_are_cancelled():
+    release = threading.Event()
+    calls = []
+
+    def blocked(city):
+        calls.append(city)
+        release.wait(1)
+        return city
+
+    executor = ConcurrentToolExecutor(FakeExecutor({"lookup": blocked}), ["lookup"], max_workers=1)
+    with pytest.raises(ZeroDivisionError):
+        executor('x = 1 / 0\na = lookup("miami")\nb = lookup("austin")', {})
+    release.set()
+    assert executor.stats["unused"] == 2
+    assert executor.stats["cancelled"] >= 1
+    executor._pool.submit(lambda: None).result()
+    assert "austin" not in calls
+
+
+def test_agents_do_not_wait_on_each_other():
+    release = threading.Event()
+
+    def blocked(city):
+        release.wait(1)
+        return city
+
+    busy = ConcurrentToolExecutor(FakeExecutor({"lookup": blocked}), ["lookup"], max_workers=2)
+    worker = threading.Thread(target=busy, args=('a = lookup("miami")\nb = lookup("austin")', {}))
+    worker.start()
+    try:
+        calls = []
+        executor = ConcurrentToolExecutor(FakeExecutor({"lookup": slow_tool(calls)}), ["lookup"], max_workers=2)
+        started = time.perf_counter()
+        assert executor('a = lookup("boston")\nresult = [a, lookup("denver")]', {}) == [
+            "data for boston", "data for denver"]
+        assert time.perf_counter() - started < 0.5
+    finally:
+        release.set()
+        worker.join()
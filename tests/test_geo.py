@@ -0,0 +1,47 @@
+import pytest
+
+from travel_catalog.geo import Gazetteer, GeoGrid, haversine_km, normalize_street
+
+
+@pytest.fixture
+def gazetteer():
+    return Gazetteer({
+        "austin": {
+            "center": [30.2672, -97.7431],
+            "places": {"Texas State Capitol": [30.2747, -97.7404]},
+            # Congress Ave runs due north; 100 house numbers every 50 m
+            "streets": {"Congress Avenue": [30.2600, -97.7450, 0, 50]},
+        }
+    })
+
+
+def test_normalize_street():
+    assert normalize_street("West 51st Street") == "w 51st st"
+    assert normalize_street("Fifth Avenue") == "5th ave"
+
+
+def test_geocode_places_and_addresses(gazetteer):
+    assert gazetteer.geocode("austin", "Texas State Capitol") == (30.2747, -97.7404)
+    lat, lon = gazetteer.geocode("austin", "200 Congress Ave, Austin, TX")
+    assert haversine_km(30.2600, -97.7450, lat, lon) == pytest.approx(0.1, abs=0.001)
+    assert lon == pytest.approx(-97.7450)
+    # A leading direction is ignored when the bare street is known
+    assert gazetteer.geocode("austin", "N Congress Ave") == pytest.approx((30.2600, -97.7450))
+    assert gazetteer.geocode("austin", "Nowhere St") is None
+
+
+def test_locate_falls_back_to_the_city_center(gazetteer):
+    assert gazetteer.locate("austin", "Austin, TX") == (30.2672, -97.7431)
+    assert gazetteer.locate("austin", "Dallas") is None
+
+
+def test_grid_nearest_and_within():
+    points = [(30.0 + i * 0.01, -97.0, f"p{i}") for i in range(20)]
+    grid = GeoGrid(points)
+    nearest = grid.nearest(30.0, -97.0, k=3)
+    assert [payload for _, payload in nearest] == ["p0", "p1", "p2"]
+    assert nearest[1][0] == pytest.approx(haversine_km(30.0, -97.0, 30.01, -97.0))
+    # p0..p4 lie within 5 km (0.01 degrees of latitude is about 1.11 km)
+    assert [payload for _, payload in grid.within(30.0, -97.0, radius_km=5)] == ["p0", "p1", "p2", "p3", "p4"]
+    assert [payload for _, payload in grid.nearest(30.0, -97.0, k=2, predicate=lambda p: p != "p0")] == ["p1", "p2"]
+    assert GeoGrid([]).nearest(30.0, -97.0) == []
@@ -0,0 +1,190 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent_runner import AsyncAgentRunner
+from Gradio_UI import ActionStep, astream_to_gradio, chat_messages, is_follow_up, quick_reply, stream_to_gradio
+
+
+class TaskStep:
+    def __init__(self, task):
+        self.task = task
+
+
+class StubAgent:
+    """Yields the given steps from ``run``; an exception in them is raised at that point."""
+
+    def __init__(self, steps=(), final_answer=None):
+        self.memory = SimpleNamespace(steps=[], reset=lambda: self.memory.steps.clear())
+        self.model = None
+        self.steps = list(steps)
+        self.final_answer = final_answer
+        self.runs = []
+        self.produced = 0
+
+    def run(self, task, stream=False, reset=True, additional_args=None):
+        self.runs.append((task, reset))
+        if reset:
+            self.memory.steps.clear()
+        self.memory.steps.append(TaskStep(task))
+        for step in self.steps:
+            if isinstance(step, Exception):
+                raise step
+            if isinstance(step, ActionStep):
+                self.memory.steps.append(step)
+            self.produced += 1
+            yield step
+
+
+def action_step(number, thought):
+    step = ActionStep(step_number=number)
+    step.model_output = thought
+    return step
+
+
+class StubRouter:
+    def __init__(self, answer="Sunny, 75F"):
+        self.answer_text = answer
+        self.tasks = []
+
+    def answer(self, task):
+        self.tasks.append(task)
+        return SimpleNamespace(result=self.answer_text)
+
+
+def contents(messages):
+    return [message["content"] for message in messages]
+
+
+def test_follow_ups_go_to_the_agent():
+    agent = StubAgent(final_answer="Hotels near the river")
+    agent.memory.steps.append(TaskStep("weather in Austin"))
+    router = StubRouter()
+    assert is_follow_up(agent)
+    replies = contents(chat_messages(agent, "what about hotels there?", intent_router=router))
+    assert replies == ["**Final answer:**\nHotels near the river\n"]
+    assert router.tasks == []
+    assert agent.runs == [("what about hotels there?", False)]
+
+
+def test_greetings_are_answered_on_any_turn():
+    pytest.importorskip("smolagents")
+    agent = StubAgent()
+    agent.memory.steps.append(TaskStep("weather in Austin"))
+    assert contents(chat_messages(agent, "hello"))[0].startswith("Hello!")
+    assert agent.runs == [] and len(agent.memory.steps) == 3
+    assert quick_reply("and the weather?", intent_router=StubRouter(), follow_up=True) is None
+
+
+def test_quick_replies_are_remembered_by_the_agent():
+    pytest.importorskip("smolagents")
+    agent = StubAgent()
+    router = StubRouter()
+    assert contents(chat_messages(agent, "weather in Austin", intent_router=router)) == ["**Final answer:**\nSunny, 75F\n"]
+    task, answer = agent.memory.steps
+    assert task.task == "weather in Austin"
+    assert answer.action_output == "**Final answer:**\nSunny, 75F\n"
+    assert is_follow_up(agent)
+    assert agent.runs == []
+
+
+def test_runs_that_reset_memory_leave_it_alone():
+    agent = StubAgent()
+    replies = contents(chat_messages(agent, "weather in Austin", reset_agent_memory=True, intent_router=StubRouter()))
+    assert replies == ["**Final answer:**\nSunny, 75F\n"]
+    assert agent.memory.steps == []
+
+
+def test_follow_ups_are_not_answered_from_the_cache():
+    pytest.importorskip("numpy")
+    from answer_cache import AnswerCache
+
+    cache = AnswerCache()
+    cache.store("Which of these hotels in Chicago has the best pool?", "The Langham")
+    assert quick_reply("Which of these hotels in Chicago has the best pool", cache)["content"].endswith("The Langham\n")
+    assert quick_reply("Which of these hotels in Chicago has the best pool", cache, follow_up=True) is None
+
+
+def test_pooled_sessions_answer_follow_ups_with_their_own_agent():
+    pytest.importorskip("gradio")
+    pytest.importorskip("smolagents")
+    router = StubRouter()
+    agents = [StubAgent(final_answer="Try the Driskill"), StubAgent(final_answer="Try the Driskill")]
+    runner = AsyncAgentRunner(lambda: agents.pop(), max_concurrency=2)
+
+    async def ask(task, session_id):
+        return [message async for message in astream_to_gradio(runner, task, intent_router=router,
+                                                               session_id=session_id)]
+
+    async def chat():
+        first = await ask("weather in Austin", "a")
+        follow_up = await ask("what about hotels there?", "a")
+        other = await ask("weather in Austin", "b")
+        return first, follow_up, other
+
+    first, follow_up, other = asyncio.run(chat())
+    assert contents(first) == contents(other) == ["**Final answer:**\nSunny, 75F\n"]
+    assert contents(follow_up) == ["**Final answer:**\nTry the Driskill\n"]
+    assert router.tasks == ["weather in Austin", "weather in Austin"]
+
+
+def test_each_step_reaches_the_chat_as_it_finishes():
+    pytest.importorskip("gradio")
+    agent = StubAgent([action_step(1, "Thought: find hotels"), action_step(2, "Thought: compare them"),
+                       "The Driskill"])
+    seen = [(message["content"], agent.produced) for message in stream_to_gradio(agent, "Plan a weekend in Austin")]
+    assert ("**Step 1**", 1) in seen and ("Thought: find hotels", 1) in seen
+    assert ("**Step 2**", 2) in seen
+    # The last item of the run is the answer
+    assert seen[-1] == ("The Driskill", 3)
+    assert [content for content, _ in seen].count("-----") == 2
+
+
+def test_streams_honor_reset():
+    pytest.importorskip("gradio")
+    agent = StubAgent(["Done"])
+    agent.memory.steps.append(TaskStep("weather in Austin"))
+    list(stream_to_gradio(agent, "Plan a weekend in Austin", reset_agent_memory=True))
+    assert agent.runs == [("Plan a weekend in Austin", True)]
+    assert [step.task for step in agent.memory.steps] == ["Plan a weekend in Austin"]
+
+    list(stream_to_gradio(agent, "and in Miami?"))
+    assert agent.runs[-1] == ("and in Miami?", False)
+    assert [step.task for step in agent.memory.steps] == ["Plan a weekend in Austin", "and in Miami?"]
+
+
+def test_errors_in_the_middle_of_a_stream_are_rendered():
+    pytest.importorskip("gradio")
+    agent = StubAgent([action_step(1, "Thought: find hotels"), RuntimeError("model unavailable")])
+    replies = contents(stream_to_gradio(agent, "Plan a weekend in Austin"))
+    assert replies[:2] == ["**Step 1**", "Thought: find hotels"]
+    assert replies[-1].startswith("I encountered an error while processing your request")
+    assert "**Step 2**" not in replies
+
+
+def test_async_streams_yield_steps_and_the_final_answer():
+    pytest.importorskip("gradio")
+
+    def ask(agent, task):
+        runner = AsyncAgentRunner(None, max_concurrency=1, agents=[agent])
+
+        async def chat():
+            return [message async for message in astream_to_gradio(runner, task, session_id="a")]
+        return contents(asyncio.run(chat()))
+
+    done = ask(StubAgent([action_step(1, "Thought: find hotels"), "ignored"], final_answer="The Driskill"),
+               "Plan a weekend in Austin")
+    assert done[0] == "**Step 1**" and done[-1] == "**Final answer:**\nThe Driskill\n"
+    failed = ask(StubAgent([action_step(1, "Thought: find hotels"), RuntimeError("model unavailable")]),
+                 "Plan a weekend in Miami")
+    assert failed[0] == "**Step 1**"
+    assert failed[-1].startswith("I encountered an error while processing your request")
+
+
+def test_http_pool_is_reported_once_per_chat(capsys):
+    pytest.importorskip("gradio")
+    pool = SimpleNamespace(metrics=lambda: {"requests": 4, "new_connections": 1, "reuse_rate": 0.75})
+    agent = StubAgent([action_step(1, "Thought: find hotels"), action_step(2, "Thought: done"), "The Driskill"])
+    list(stream_to_gradio(agent, "Plan a weekend in Austin", http_pool=pool))
+    assert capsys.readouterr().out.count("HTTP pool: 4 requests, 1 connections opened, 75% reused") == 1
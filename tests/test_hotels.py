@@ -0,0 +1,49 @@
+import pytest
+
+from travel_catalog.hotels import HotelIndex, iter_bits, mask_from_positions, normalize_attribute
+
+HOTELS = [
+    {"name": "Grand", "level": "luxury", "price": 400, "rating": 4.8, "features": ["Pool", "Gym"],
+     "room_types": ["King Suite"], "breakfast": True},
+    {"name": "Budget Inn", "level": "budget", "price": 90, "rating": 3.9, "features": ["Free Parking"],
+     "room_types": ["Double"], "pet_friendly": True},
+    {"name": "Midtown", "level": "mid-range", "price": 180, "rating": 4.5, "features": ["WiFi", "gym"],
+     "room_types": ["Junior Suite", "Double"]},
+    {"name": "Hostel", "level": "budget", "price": 40, "rating": 4.5, "features": ["WiFi"],
+     "room_types": ["Dorm"]},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return HotelIndex(HOTELS)
+
+
+def names(hotels):
+    return [hotel["name"] for hotel in hotels]
+
+
+def test_bitset_helpers():
+    assert mask_from_positions([0, 3, 9], 10) == 0b1000001001
+    assert list(iter_bits(0b1000001001)) == [0, 3, 9]
+    assert normalize_attribute("Pet-Friendly") == "pet friendly"
+    assert normalize_attribute("Swimming  Pool") == "pool"
+
+
+def test_filters_combine(index):
+    assert names(index.search(amenities=["gym"])) == ["Midtown", "Grand"]
+    assert names(index.search(level="budget", amenities=["pet friendly"])) == ["Budget Inn"]
+    assert names(index.search(room_types=["suite"])) == ["Midtown", "Grand"]
+    assert names(index.search(max_price=180, min_rating=4.5)) == ["Hostel", "Midtown"]
+    assert index.search(level="budget", amenities=["pool"]) == []
+
+
+def test_best_rated_first_keeps_cheapest_first_within_a_rating(index):
+    assert names(index.search(sort_by="rating")) == ["Grand", "Hostel", "Midtown", "Budget Inn"]
+    assert names(index.search(sort_by="rating", limit=2)) == ["Grand", "Hostel"]
+    with pytest.raises(ValueError):
+        index.rank(index.all_mask, sort_by="name")
+
+
+def test_preferences_split_into_amenities_and_room_types(index):
+    assert index.resolve_preferences(["Wi-Fi", "double", "spa", ""]) == (["wifi"], ["double"], ["spa"])
@@ -0,0 +1,65 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from http_pool import HttpPool  # noqa: E402
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b"ok"
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_requests_reuse_one_connection(server):
+    pool = HttpPool()
+    session = pool.session()
+    assert pool.session() is session
+    for _ in range(5):
+        assert session.get(f"{server}/ping").text == "ok"
+    metrics = pool.metrics()
+    assert metrics["requests"] == 5
+    assert metrics["new_connections"] == 1
+    assert metrics["reuse_rate"] == pytest.approx(0.8)
+
+
+def test_default_timeout_applies_unless_a_call_sets_one(server, monkeypatch):
+    from requests.adapters import HTTPAdapter
+
+    seen = []
+    send = HTTPAdapter.send
+
+    def spy(self, request, timeout=None, **kwargs):
+        seen.append(timeout)
+        return send(self, request, timeout=timeout, **kwargs)
+
+    monkeypatch.setattr(HTTPAdapter, "send", spy)
+    session = HttpPool(connect_timeout=1.5, read_timeout=7.0).session()
+    session.get(server)
+    session.get(server, timeout=3)
+    assert seen == [(1.5, 7.0), 3]
+
+
+def test_search_tool_with_its_own_client_is_left_alone():
+    tool = type("SearchTool", (), {"ddgs": object()})()
+    assert HttpPool().use_for_search(tool) is False
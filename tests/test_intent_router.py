@@ -0,0 +1,97 @@
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("pytz")
+
+from intent_router import (  # noqa: E402
+    SAFETY_PATTERNS, TIME_PATTERNS, WEATHER_PATTERNS, Intent, IntentRouter, city_slot, names_several_places,
+    timezone_slot,
+)
+from travel_catalog.cities import CITY_STATES, CityResolver  # noqa: E402
+
+CATALOG = SimpleNamespace(
+    city_resolver=CityResolver(CITY_STATES),
+    weather={"new york": {}, "austin": {}, "chicago": {}, "miami": {}},
+    safety={"miami": {}, "new orleans": {}},
+)
+
+
+def make_router(calls, min_confidence=1.0):
+    def tool(intent):
+        def call(**kwargs):
+            calls.append((intent, kwargs))
+            return f"{intent} answer"
+        return call
+
+    return IntentRouter(
+        [
+            Intent("weather", tool("weather"), WEATHER_PATTERNS, {"location": city_slot(lambda: CATALOG, "weather")}),
+            Intent("time", tool("time"), TIME_PATTERNS, {"timezone": timezone_slot}),
+            Intent("safety", tool("safety"), SAFETY_PATTERNS, {"city": city_slot(lambda: CATALOG, "safety")}),
+        ],
+        min_confidence=min_confidence,
+    )
+
+
+@pytest.mark.parametrize("task, intent, kwargs", [
+    ("What's the weather in Austin?", "weather", {"location": "Austin"}),
+    ("weather in Austin, TX today", "weather", {"location": "Austin, TX"}),
+    ("NYC weather", "weather", {"location": "NYC"}),
+    ("Is Miami safe at night?", "safety", {"city": "Miami"}),
+    ("what time is it in america/chicago", "time", {"timezone": "America/Chicago"}),
+])
+def test_single_intent_questions_are_answered(task, intent, kwargs):
+    calls = []
+    answer = make_router(calls).answer(task)
+    assert answer is not None and answer.intent == intent
+    assert calls == [(intent, kwargs)]
+
+
+@pytest.mark.parametrize("task", [
+    "miami or chicago weather",
+    "weather in Austin and Miami",
+    "austin vs miami weather",
+    "weather in Miami, Chicago",
+    # Places that only look like catalog cities
+    "weather in york",
+    "weather in Miami, OK",
+    # Misspellings are left to the agent unless the threshold is lowered
+    "weather in Chicgo",
+    # No safety data for Austin
+    "Is Austin safe?",
+    "plan a weekend in Austin",
+])
+def test_other_questions_go_to_the_agent(task):
+    calls = []
+    router = make_router(calls)
+    assert router.answer(task) is None
+    assert calls == []
+
+
+def test_lower_threshold_accepts_misspellings():
+    calls = []
+    assert make_router(calls, min_confidence=0.6).answer("weather in Chicgo") is not None
+    assert make_router(calls, min_confidence=0.6).answer("miami or chicago weather") is None
+
+
+def test_several_places():
+    assert names_several_places("Miami, Chicago")
+    assert names_several_places("Austin/Dallas")
+    assert not names_several_places("Miami, Florida, USA")
+    assert not names_several_places("New Orleans")
+
+
+def test_tool_errors_fall_back_to_the_agent():
+    router = IntentRouter([Intent("time", lambda timezone: "Error: no clock", TIME_PATTERNS,
+                                  {"timezone": timezone_slot})])
+    assert router.answer("time in America/Chicago") is None
+    assert router.stats["tool_errors"] == 1
+
+
+def test_timezone_table_is_built_on_first_use():
+    code = "import sys, intent_router; assert 'pytz' not in sys.modules; intent_router.timezone_slot('utc')"
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+pytest.importorskip("smolagents")
+
+from lazy_tools import LazyTool  # noqa: E402
+
+INPUTS = {"prompt": {"type": "string", "description": "What to draw"}}
+
+
+class RealTool:
+    description = "Draws the prompt"
+    inputs = INPUTS
+    output_type = "string"
+
+    def __call__(self, prompt):
+        return f"picture of {prompt}"
+
+
+def lazy(loader):
+    return LazyTool(loader, name="image_generator", description="Generates images", inputs=INPUTS,
+                    output_type="string")
+
+
+def test_loads_on_first_call_only():
+    loads = []
+    tool = lazy(lambda: loads.append(1) or RealTool())
+    assert not tool.loaded()
+    assert tool(prompt="a lake") == "picture of a lake"
+    assert tool(prompt="a hill") == "picture of a hill"
+    assert loads == [1]
+    assert tool.description == "Draws the prompt"
+    assert tool.stats["calls"] == 2 and tool.stats["first_call_seconds"] is not None
+
+
+def test_warm_up_loads_in_the_background():
+    release = threading.Event()
+    tool = lazy(lambda: release.wait(1) and RealTool())
+    thread = tool.warm_up()
+    release.set()
+    thread.join(1)
+    assert tool.loaded()
+    assert tool.stats["loaded_in"] == "warm-up-image_generator"
+
+
+def test_failed_load_is_reported_and_retried():
+    attempts = []
+
+    def loader():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("hub unreachable")
+        return RealTool()
+
+    tool = lazy(loader)
+    assert tool(prompt="a lake") == "Error loading the image_generator tool: hub unreachable"
+    assert tool(prompt="a lake") == "picture of a lake"
+    assert tool.stats["load_errors"] == 1
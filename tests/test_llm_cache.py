@@ -0,0 +1,76 @@
+import time
+
+import pytest
+
+pytest.importorskip("smolagents")
+
+from smolagents.models import ChatMessage  # noqa: E402
+
+from llm_cache import CachingModel, CompletionCache  # noqa: E402
+
+
+class FakeModel:
+    model_id = "fake-model"
+
+    def __init__(self):
+        self.kwargs = {}
+        self.calls = 0
+        self.last_input_token_count = None
+        self.last_output_token_count = None
+
+    def __call__(self, messages, stop_sequences=None, grammar=None, tools_to_call_from=None, **kwargs):
+        self.calls += 1
+        self.last_input_token_count = 10
+        self.last_output_token_count = 5
+        return ChatMessage(role="assistant", content=f"answer {self.calls}")
+
+
+MESSAGES = [{"role": "user", "content": [{"type": "text", "text": "Weather in Austin?"}]}]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CompletionCache(str(tmp_path / "llm.sqlite"), max_entries=2, ttl_seconds=60)
+
+
+def test_repeated_calls_are_answered_from_the_cache(cache):
+    model = FakeModel()
+    caching = CachingModel(model, cache)
+    first = caching(MESSAGES, stop_sequences=["Observation:"])
+    second = caching(MESSAGES, stop_sequences=["Observation:"])
+    assert model.calls == 1
+    assert second.content == first.content == "answer 1"
+    assert second.cache_status.startswith("hit")
+    assert caching.last_input_token_count == 0
+    # Any change to the request is a different entry
+    caching(MESSAGES, stop_sequences=["<end_code>"])
+    assert model.calls == 2
+
+
+def test_sampling_bypasses_the_cache_when_asked(cache):
+    model = FakeModel()
+    caching = CachingModel(model, cache, bypass_sampling=True)
+    caching(MESSAGES, temperature=0.7)
+    caching(MESSAGES, temperature=0.7)
+    assert model.calls == 2
+    assert cache.stats["bypassed"] == 2
+    caching(MESSAGES, temperature=0)
+    caching(MESSAGES, temperature=0)
+    assert model.calls == 3
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for key in ("a", "b", "c"):
+        cache.put(key, "{}", 1, 1)
+        time.sleep(0.01)
+    cache.get("a")
+    cache.put("d", "{}", 1, 1)
+    cache.evict()
+    assert cache.get("a") is not None
+    assert cache.get("b") is None and cache.get("c") is None
+
+
+def test_expired_entries_are_not_served(tmp_path):
+    cache = CompletionCache(str(tmp_path / "llm.sqlite"), ttl_seconds=-1)
+    cache.put("a", "{}", 1, 1)
+    assert cache.get("a") is None
@@ -0,0 +1,69 @@
+from memory_budget import CompactingModel, compact_messages, count_tokens
+
+
+def message(role, text):
+    return {"role": role, "content": [{"type": "text", "text": text}]}
+
+
+def conversation(steps):
+    messages = [message("system", "You are a travel agent."), message("user", "New task:\nPlan a trip to Austin")]
+    for i in range(steps):
+        messages.append(message("assistant", f"Thought: step {i} looks up hotels\n" + "details " * 80))
+        messages.append(message("tool-call", f"Calling tools:\nfind_hotels('austin', {i})"))
+        messages.append(message("tool-response", f"Observation:\nHotel {i} result " + "row " * 80))
+    return messages
+
+
+def test_calls_within_budget_are_untouched():
+    messages = conversation(2)
+    assert compact_messages(messages, budget=100_000) is messages
+
+
+def test_system_prompt_task_and_recent_steps_stay_verbatim():
+    messages = conversation(12)
+    compacted = compact_messages(messages, budget=900, keep_steps=2)
+    assert count_tokens(compacted) <= 900
+    assert compacted[0] == messages[0]
+    assert compacted[1] == messages[1]
+    # The last two steps, three messages each
+    assert compacted[-6:] == messages[-6:]
+    assert len(compacted) < len(messages)
+
+
+def test_older_steps_are_shrunk_then_summarized_then_dropped():
+    messages = conversation(6)
+
+    def texts(budget):
+        return [entry["content"][0]["text"] for entry in compact_messages(messages, budget, keep_steps=2)]
+
+    summarized = texts(1000)
+    assert summarized[2].startswith("Summary of earlier steps:\n- Step: Thought: step 0 looks up hotels")
+    # Step 3 is kept but without its tool call echo
+    assert any(text.startswith("Thought: step 3") for text in summarized)
+    assert not any("find_hotels('austin', 3)" in text for text in summarized)
+
+    dropped = texts(600)
+    assert not any(text.startswith("Summary") or "step 3" in text for text in dropped)
+    # The kept steps alone are over a tighter budget; they are still sent
+    assert texts(500) == dropped
+
+
+def test_compacting_model_counts_saved_tokens(capsys):
+    seen = []
+
+    class Model:
+        last_input_token_count = 1
+
+        def __call__(self, messages, **kwargs):
+            seen.append(messages)
+            return "reply"
+
+    model = CompactingModel(Model(), budget=900, keep_steps=2)
+    assert model(conversation(12)) == "reply"
+    assert model.stats["compacted"] == 1
+    assert model.stats["tokens_after"] < model.stats["tokens_before"]
+    assert count_tokens(seen[0]) <= 900
+    assert capsys.readouterr().out == ""
+    model.verbose = True
+    model(conversation(12))
+    assert "Model input: ~" in capsys.readouterr().out
@@ -0,0 +1,34 @@
+from travel_catalog.restaurants import RestaurantIndex, normalize_price_tier, normalize_tag
+
+RESTAURANTS = [
+    {"name": "Taqueria", "cuisine": "Mexican", "price_range": "$", "rating": 4.6,
+     "dietary_options": ["Vegetarian", "Gluten-Free"]},
+    {"name": "Steakhouse", "cuisine": "American", "price_range": "$$$", "rating": 4.7, "dietary_options": []},
+    {"name": "Green Bowl", "cuisine": "Vegan", "price_range": "$$", "rating": 4.6,
+     "dietary_options": ["Vegan", "Vegetarian"]},
+    {"name": "Diner", "cuisine": "American", "price_range": "$", "rating": 4.0, "dietary_options": ["veg"]},
+]
+
+
+def names(restaurants):
+    return [restaurant["name"] for restaurant in restaurants]
+
+
+def test_tags_and_tiers_are_normalized():
+    assert normalize_tag("Gluten-Free") == "gluten free"
+    assert normalize_tag("plant-based") == "vegan"
+    assert normalize_price_tier(" 2 ") == "$$"
+
+
+def test_filters_intersect_and_rank_by_rating():
+    index = RestaurantIndex(RESTAURANTS)
+    assert names(index.search(dietary=["veggie"])) == ["Taqueria", "Green Bowl", "Diner"]
+    assert names(index.search(cuisines=["american"], price_range="1")) == ["Diner"]
+    assert names(index.search(cuisines=["mexican", "vegan"], dietary=["gf"])) == ["Taqueria"]
+    assert index.search(cuisines=["thai"]) == []
+
+
+def test_no_filter_lists_the_best_rated():
+    index = RestaurantIndex(RESTAURANTS)
+    assert index.match() is None
+    assert names(index.search(limit=2)) == ["Steakhouse", "Taqueria"]
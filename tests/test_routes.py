@@ -0,0 +1,54 @@
+import pytest
+
+from travel_catalog.routes import TRANSFER_MINUTES, RouteGraph, format_duration, parse_duration, parse_price_range
+
+ROUTES = {
+    "austin-chicago": {
+        "air": [{"airline": "Fast Air", "duration": "2h 50m", "price_range": "$200-300", "direct": True}],
+        "bus": [{"operator": "Coach", "duration": "20h", "price_range": "$80-100", "transfers": 1}],
+    },
+    "chicago-new york": {
+        "air": [{"airline": "Fast Air", "duration": "2h 15m", "price_range": "$150-250", "direct": True}],
+        "train": [{"operator": "Rail", "duration": "19h", "price_range": "$100", "transfers": 0}],
+        "car": {"route": "I-80 E", "duration": "12h 30m", "estimated_fuel": "$90-120"},
+    },
+}
+
+
+@pytest.fixture
+def graph():
+    return RouteGraph.from_routes(ROUTES)
+
+
+def test_parsing_helpers():
+    assert parse_duration("2d 5h") == 2 * 1440 + 300
+    assert parse_duration("26h (non-stop)") == 26 * 60
+    assert parse_price_range("$1,200 - $1,450") == (1200, 1450)
+    assert parse_price_range("free") == (0, 0)
+    assert format_duration(2 * 1440 + 300) == "2d 5h"
+    assert format_duration(425) == "7h 5m"
+
+
+def test_fastest_route_changes_planes(graph):
+    itinerary = graph.route("austin", "new york")
+    assert [leg.mode for leg in itinerary.legs] == ["air", "air"]
+    assert itinerary.minutes == 170 + 135 + TRANSFER_MINUTES
+    assert (itinerary.price_low, itinerary.price_high) == (350, 550)
+    assert itinerary.transfers == 1
+
+
+def test_objectives_and_modes(graph):
+    cheapest = graph.route("austin", "new york", objective="cheapest")
+    assert [leg.mode for leg in cheapest.legs] == ["bus", "train"]
+    # Routes run both ways
+    assert graph.route("new york", "chicago", mode="train").legs[0].carrier == "Rail"
+    assert graph.route("austin", "new york", mode="train") is None
+    assert graph.route("austin", "austin") is None
+    with pytest.raises(ValueError):
+        graph.route("austin", "chicago", objective="scenic")
+
+
+def test_shortest_path_trees_are_cached(graph):
+    graph.route("austin", "chicago")
+    graph.route("austin", "new york")
+    assert graph.cache_info().hits == 1
@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+
+import search_backend
+from search_backend import CircuitBreaker, SearchBackend, TokenBucket, is_rate_limit
+
+
+class RatelimitException(Exception):
+    pass
+
+
+class HTTPError(Exception):
+    pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(search_backend.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_token_bucket_fails_fast_with_the_time_to_the_next_token(clock):
+    bucket = TokenBucket(rate=2.0, burst=2)
+    assert bucket.acquire() == (True, 0.0)
+    assert bucket.acquire() == (True, 0.0)
+    acquired, retry_after = bucket.acquire()
+    assert not acquired and retry_after == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert bucket.acquire() == (True, 0.0)
+
+
+def test_breaker_backs_off_exponentially_and_probes_once(clock):
+    breaker = CircuitBreaker(failure_threshold=2, base_backoff=2.0, max_backoff=5.0)
+    assert breaker.failure() == 0.0
+    assert breaker.failure() == 2.0
+    assert breaker.allow() == (False, 2.0)
+    clock[0] += 2
+    assert breaker.allow() == (True, 0.0)
+    # Only the probe gets through while half open
+    assert breaker.allow()[0] is False
+    assert breaker.failure() == 4.0
+    clock[0] += 4
+    breaker.allow()
+    assert breaker.failure() == 5.0
+    clock[0] += 5
+    breaker.allow()
+    breaker.success()
+    assert breaker.state == "closed" and breaker.allow() == (True, 0.0)
+
+
+def test_throttled_searches_return_at_once(clock):
+    backend = SearchBackend(lambda query: f"results for {query}", rate=0.5, burst=1)
+    assert backend.search("austin") == "results for austin"
+    started = time.perf_counter()
+    reply = backend.search("miami")
+    assert time.perf_counter() - started < 0.05
+    assert reply.startswith("Sorry") and "try again in 2 seconds" in reply
+    assert backend.stats["throttled"] == 1
+
+
+def test_rate_limit_opens_the_breaker(clock):
+    calls = []
+
+    def fetch(query):
+        calls.append(query)
+        raise RatelimitException("202 Ratelimit")
+
+    backend = SearchBackend(fetch, rate=100, burst=10, base_backoff=30)
+    assert "rate limiting" in backend.search("austin")
+    assert "paused for another 30 seconds" in backend.search("miami")
+    assert calls == ["austin"]
+    assert backend.stats["short_circuited"] == 1
+
+
+def test_rate_limits_are_recognized_by_class():
+    assert is_rate_limit(RatelimitException("https://html.duckduckgo.com/html 202"))
+    assert not is_rate_limit(HTTPError("503"))
+    exceptions = pytest.importorskip("duckduckgo_search.exceptions")
+    assert is_rate_limit(exceptions.RatelimitException("https://html.duckduckgo.com/html 202"))
+
+
+def test_provider_errors_open_the_breaker_after_the_threshold(clock):
+    def fetch(query):
+        raise HTTPError("503")
+
+    backend = SearchBackend(fetch, rate=100, burst=10, failure_threshold=2)
+    for query in ("a", "b"):
+        assert backend.search(query).startswith("Error performing search")
+    assert backend.breaker.state == "open"
+
+
+def test_identical_searches_in_flight_are_coalesced():
+    release = threading.Event()
+    calls = []
+
+    def fetch(query):
+        calls.append(query)
+        release.wait(1)
+        return f"results for {query}"
+
+    backend = SearchBackend(fetch, rate=100, burst=10)
+    results = []
+    threads = [threading.Thread(target=lambda query=query: results.append(backend.search(query)))
+               for query in ("Austin hotels", "austin  HOTELS")]
+    threads[0].start()
+    while not calls:
+        time.sleep(0.001)
+    threads[1].start()
+    while backend.stats["coalesced"] == 0 and threads[1].is_alive():
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert calls == ["Austin hotels"]
+    assert results == ["results for Austin hotels"] * 2
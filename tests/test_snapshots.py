@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+
+import pytest
+
+from travel_catalog import catalog
+from travel_catalog.catalog import builtin_sections
+from travel_catalog.snapshots import SHARED_SHARD, CatalogWatcher, ShardStore, export_shards, shard_name
+
+
+def watcher(directory):
+    return CatalogWatcher(str(directory), build=lambda sections, version: (version, sections), interval=60)
+
+
+def rewrite(path, change):
+    with open(path, "r", encoding="utf-8") as stream:
+        shard = json.load(stream)
+    change(shard)
+    with open(path, "w", encoding="utf-8") as stream:
+        json.dump(shard, stream)
+    # Make the change visible even on file systems with coarse timestamps
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_shard_name():
+    assert shard_name("new york") == "new-york.json"
+    assert shard_name("New Orleans!") == "new-orleans.json"
+
+
+def test_exported_shards_rebuild_the_sections(tmp_path):
+    sections = builtin_sections()
+    export_shards(str(tmp_path), sections)
+    assert (tmp_path / SHARED_SHARD).exists()
+    store = ShardStore(str(tmp_path))
+    changed, cities = store.refresh()
+    assert SHARED_SHARD in changed
+    assert "chicago" in cities
+    rebuilt = store.sections()
+    assert set(rebuilt["hotels"]) == set(sections["hotels"])
+    assert set(rebuilt["intercity_routes"]) == set(sections["intercity_routes"])
+    # Nothing changed since, so nothing is parsed again
+    assert store.refresh() == ([], set())
+
+
+def test_watcher_publishes_only_changed_shards(tmp_path):
+    export_shards(str(tmp_path), builtin_sections())
+    catalog_watcher = watcher(tmp_path)
+    version, _ = catalog_watcher.current
+    assert version == 1
+    assert catalog_watcher.reload() is False
+
+    rewrite(tmp_path / "miami.json", lambda shard: shard["safety"].update(overall="Test"))
+    assert catalog_watcher.reload() is True
+    version, sections = catalog_watcher.current
+    assert version == 2
+    assert sections["safety"]["miami"]["overall"] == "Test"
+    stats = catalog_watcher.stats()
+    assert stats["reloads"] == 2
+    assert stats["last_reload"]["changed_shards"] == ["miami.json"]
+    assert stats["last_reload"]["cities"] == ["miami"]
+
+
+def test_broken_shard_keeps_the_current_snapshot(tmp_path):
+    export_shards(str(tmp_path), builtin_sections())
+    catalog_watcher = watcher(tmp_path)
+    (tmp_path / "austin.json").write_text("{not json", encoding="utf-8")
+    assert catalog_watcher.reload() is False
+    assert catalog_watcher.current[0] == 1
+    assert catalog_watcher.stats()["failures"] == 1
+    # Saving the shard again is picked up on the next poll
+    (tmp_path / "austin.json").write_text(json.dumps({"city": "austin"}), encoding="utf-8")
+    assert catalog_watcher.reload() is True
+    assert "austin" not in catalog_watcher.current[1]["hotels"]
+
+
+def test_first_load_of_a_broken_directory_raises(tmp_path):
+    (tmp_path / "austin.json").write_text(json.dumps({"hotels": []}), encoding="utf-8")
+    with pytest.raises(ValueError, match="no 'city' name"):
+        watcher(tmp_path)
+
+
+def test_concurrent_first_calls_start_one_watcher(tmp_path, monkeypatch):
+    started = []
+
+    def watch_catalog(directory):
+        started.append(directory)
+        return watcher(directory).start()
+
+    export_shards(str(tmp_path), builtin_sections())
+    monkeypatch.setattr(catalog, "CATALOG_DIR", str(tmp_path))
+    monkeypatch.setattr(catalog, "watch_catalog", watch_catalog)
+    monkeypatch.setattr(catalog, "_watcher", None)
+    monkeypatch.setattr(catalog, "_catalog", None)
+    barrier = threading.Barrier(8)
+    snapshots = []
+
+    def first_call():
+        barrier.wait()
+        snapshots.append(catalog.get_catalog())
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    catalog._watcher.stop()
+    assert len(started) == 1
+    assert len(snapshots) == 8 and all(snapshot is snapshots[0] for snapshot in snapshots)
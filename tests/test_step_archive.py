@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+from step_archive import StepArchive
+
+
+class TaskStep:
+    def __init__(self, task):
+        self.task = task
+
+
+class ActionStep:
+    def __init__(self, observations):
+        self.observations = observations
+        self.model_input_messages = ["the whole prompt"]
+
+
+def agent_with_turns(turns):
+    steps = []
+    for i in range(turns):
+        steps += [TaskStep(f"task {i}"), ActionStep(f"observation {i}")]
+    return SimpleNamespace(memory=SimpleNamespace(steps=steps))
+
+
+def test_older_turns_move_to_the_archive(tmp_path):
+    archive = StepArchive(str(tmp_path / "sessions.sqlite"), keep_turns=2)
+    agent = agent_with_turns(5)
+    assert archive.archive("s1", agent) == 6
+    assert [step.task for step in agent.memory.steps if isinstance(step, TaskStep)] == ["task 3", "task 4"]
+    loaded = archive.load("s1")
+    assert [step["type"] for step in loaded[:2]] == ["TaskStep", "ActionStep"]
+    assert loaded[0]["task"] == "task 0"
+    # The model input is not kept
+    assert "model_input_messages" not in loaded[1]
+    assert archive.stats["archived_turns"] == 3
+
+
+def test_archiving_again_appends_in_order(tmp_path):
+    archive = StepArchive(str(tmp_path / "sessions.sqlite"), keep_turns=1)
+    agent = agent_with_turns(2)
+    archive.archive("s1", agent)
+    agent.memory.steps += [TaskStep("task 2"), ActionStep("observation 2")]
+    archive.archive("s1", agent)
+    assert [step.get("task") for step in archive.load("s1") if step["type"] == "TaskStep"] == ["task 0", "task 1"]
+    assert archive.archive("s1", agent) == 0
+
+
+def test_sessions_are_separate_and_can_be_dropped(tmp_path):
+    archive = StepArchive(str(tmp_path / "sessions.sqlite"), keep_turns=0)
+    archive.archive("s1", agent_with_turns(1))
+    archive.archive("s2", agent_with_turns(2))
+    archive.drop("s1")
+    assert archive.load("s1") == []
+    assert len(archive.load("s2")) == 4
+    assert archive.stats["dropped_sessions"] == 1
@@ -0,0 +1,72 @@
+import pytest
+
+import tool_cache
+from tool_cache import ToolCache, cached_tool, normalize_text, tool_cache_stats
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(tool_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = ToolCache("t", ttl_seconds=60)
+    cache.put("key", "value")
+    assert cache.get("key") == (True, "value")
+    clock[0] += 61
+    assert cache.get("key") == (False, None)
+    assert cache.snapshot()["expired"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = ToolCache("t", ttl_seconds=60, max_entries=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.snapshot()["evictions"] == 1
+
+
+def test_normalized_arguments_share_an_entry(clock):
+    calls = []
+
+    @cached_tool(ttl_seconds=60, normalize={"city": normalize_text})
+    def _lookup_city(city: str, days: int = 3) -> str:
+        calls.append(city)
+        return f"{city} for {days} days"
+
+    assert _lookup_city("Miami") == "Miami for 3 days"
+    assert _lookup_city("  miami ", days=3) == "Miami for 3 days"
+    assert _lookup_city("Miami", days=4) == "Miami for 4 days"
+    assert calls == ["Miami", "Miami"]
+    stats = tool_cache_stats()["_lookup_city"]
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_rejected_results_and_new_versions_run_again(clock):
+    calls = []
+    version = [1]
+
+    @cached_tool(ttl_seconds=60, version=lambda: version[0], cache_if=lambda result: not result.startswith("Error"))
+    def _flaky(query: str) -> str:
+        calls.append(query)
+        return "Error: try later" if len(calls) == 1 else f"answer {len(calls)}"
+
+    assert _flaky("q") == "Error: try later"
+    assert _flaky("q") == "answer 2"
+    assert _flaky("q") == "answer 2"
+    version[0] = 2
+    assert _flaky("q") == "answer 3"
+
+
+def test_unhashable_arguments_run_uncached(clock):
+    @cached_tool(ttl_seconds=60)
+    def _count(items: list) -> int:
+        return len(items)
+
+    assert _count([1, 2]) == 2
+    assert _count.cache.snapshot()["skipped"] == 1
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from tool_results import ToolResult, estimate_tokens, render, renderer, token_report
+
+
+@renderer("greeting", "compact")
+def _compact(data):
+    return f"hi {data['name']}"
+
+
+@renderer("greeting", "markdown")
+def _markdown(data):
+    return f"**Hello, {data['name']}!**"
+
+
+def test_result_is_the_text_in_its_format():
+    result = ToolResult("greeting", {"name": "Ada"}, fmt="compact")
+    assert result == "hi Ada"
+    assert result.kind == "greeting" and result.data == {"name": "Ada"}
+    assert result.render("markdown") == "**Hello, Ada!**"
+    assert json.loads(result.to_json()) == {"kind": "greeting", "name": "Ada"}
+
+
+def test_json_handles_read_only_data():
+    from types import MappingProxyType
+    text = render("other", {"items": (MappingProxyType({"a": 1}),)}, "json")
+    assert json.loads(text) == {"kind": "other", "items": [{"a": 1}]}
+
+
+def test_missing_renderers_are_errors():
+    with pytest.raises(ValueError, match="No markdown renderer"):
+        render("other", {}, "markdown")
+    with pytest.raises(ValueError, match="Unknown format"):
+        renderer("other", "html")
+
+
+def test_token_estimates():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("hotel") == 1
+    assert estimate_tokens("accommodation") == 3
+    assert estimate_tokens("$1,250") == 4
+    report = token_report(ToolResult("greeting", {"name": "Ada"}, fmt="compact"))
+    assert report["compact"] < report["markdown"] < report["json"]
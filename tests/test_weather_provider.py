@@ -0,0 +1,139 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("requests")
+
+import weather_provider  # noqa: E402
+from weather_provider import CatalogWeatherProvider, OpenMeteoProvider, WeatherProvider, WeatherService  # noqa: E402
+from weather_standin import WeatherStandIn  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def standin():
+    server = WeatherStandIn(latency=0.05)
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def provider(standin):
+    points = {city: (entry["latitude"], entry["longitude"]) for city, entry in standin.locations.items()}
+    return OpenMeteoProvider(points.get, standin.url)
+
+
+class CountingProvider(WeatherProvider):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def fetch_many(self, locations):
+        self.batches.append(sorted(locations))
+        return {location: {"alert": None, "current": {"temp": len(location)}, "forecast": []}
+                for location in locations if location != "atlantis"}
+
+
+def test_batched_fetch_answers_every_city_in_one_request(standin, provider):
+    before = standin.stats["requests"]
+    forecasts = provider.fetch_many(["miami", "austin", "atlantis"])
+    assert standin.stats["requests"] - before == 1
+    assert forecasts["atlantis"] is None
+    assert forecasts["austin"]["current"] == {"temp": 85, "condition": "Clear", "humidity": 45}
+    assert [day["day"] for day in forecasts["austin"]["forecast"]] == ["Tomorrow", "Day 2", "Day 3"]
+
+
+def test_severe_codes_and_heat_raise_alerts(provider):
+    forecasts = provider.fetch_many(["miami", "los angeles", "austin"])
+    assert forecasts["miami"]["alert"].startswith("Thunderstorm Warning: thunderstorm now")
+    assert "Flood Watch: heavy rain showers tomorrow" in forecasts["miami"]["alert"]
+    assert forecasts["los angeles"]["alert"].startswith("Heat Advisory: 100°F tomorrow")
+    assert "not available" in forecasts["los angeles"]["alert"]
+    assert forecasts["austin"]["alert"] is None
+
+
+def test_lookups_during_a_fetch_share_one_batch_and_the_hour_is_cached():
+    release = threading.Event()
+
+    class BlockingProvider(CountingProvider):
+        def fetch_many(self, locations):
+            # The first fetch is slow
+            if locations == ["miami"]:
+                release.wait(1)
+            return super().fetch_many(locations)
+
+    provider = BlockingProvider()
+    service = WeatherService(provider, batch_window=0.2)
+    results = {}
+
+    def look_up(city):
+        results[city] = service.forecast(city)
+
+    threads = [threading.Thread(target=look_up, args=(city,)) for city in ("miami", "austin", "miami", "atlantis")]
+    started = time.perf_counter()
+    threads[0].start()
+    while service._batch is not None or not service._pending:
+        time.sleep(0.001)
+    # A lone lookup is fetched at once; the rest arrive while it is in flight
+    for thread in threads[1:]:
+        thread.start()
+    threads[1].join()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert provider.batches == [["atlantis", "austin"], ["miami"]]
+    assert time.perf_counter() - started < 0.9
+    assert results["miami"]["current"] == {"temp": 5} and results["atlantis"] is None
+    assert service.forecast("austin") is results["austin"]
+    assert service.stats["hits"] == 1 and service.stats["coalesced"] == 1
+
+
+def test_a_lone_lookup_does_not_wait_for_others():
+    provider = CountingProvider()
+    service = WeatherService(provider, batch_window=1)
+    started = time.perf_counter()
+    service.forecasts(["miami", "austin"])
+    assert time.perf_counter() - started < 0.5
+    assert provider.batches == [["austin", "miami"]]
+
+
+def test_new_hour_and_new_catalog_version_fetch_again(monkeypatch):
+    now = [3600 * 10]
+    monkeypatch.setattr(weather_provider.time, "time", lambda: now[0])
+    version = [1]
+    provider = CountingProvider()
+    service = WeatherService(provider, batch_window=0, version=lambda: version[0])
+    service.forecast("miami")
+    service.forecast("miami")
+    now[0] += 3600
+    service.forecast("miami")
+    version[0] = 2
+    service.forecast("miami")
+    assert len(provider.batches) == 3
+
+
+def test_failed_fetch_reaches_every_waiting_lookup():
+    class Failing(WeatherProvider):
+        def fetch_many(self, locations):
+            time.sleep(0.02)
+            raise OSError("weather API down")
+
+    service = WeatherService(Failing(), batch_window=0)
+    with pytest.raises(OSError):
+        service.forecasts(["miami", "austin"])
+    assert service.stats["errors"] == 1
+    # Nothing is cached, so the next lookup tries again
+    with pytest.raises(OSError):
+        service.forecast("miami")
+
+
+def test_catalog_provider_keeps_alerts_without_conditions():
+    from types import SimpleNamespace
+
+    catalog = SimpleNamespace(weather_alerts={"miami": "Hurricane Warning"}, weather={"austin": {
+        "current": {"temp": 85}, "forecast": []}})
+    provider = CatalogWeatherProvider(lambda: catalog)
+    assert provider.fetch("miami") == {"alert": "Hurricane Warning", "current": None, "forecast": []}
+    assert provider.fetch("austin")["current"] == {"temp": 85}
+    assert provider.fetch("boise") is None
@@ -0,0 +1,153 @@
+"""Per-tool TTL memoization for ``@tool`` functions.
+
+Stack :func:`cached_tool` under smolagents' ``@tool`` decorator::
+
+    @tool
+    @cached_tool(ttl_seconds=30 * MINUTE, normalize={"city": city_key})
+    def get_safety_information(city: str) -> str:
+        ...
+
+Calls are keyed on their bound arguments after normalization, so
+"Miami, FL" and "miami" share an entry when ``city`` is normalized to a
+city key. A shared entry keeps the wording of the call that filled it.
+Each tool has its own size-bounded LRU with a time-to-live, so a tool
+backed by a real API costs one upstream call per TTL window and argument
+set.
+"""
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+_caches = {}
+
+
+def normalize_text(value):
+    """Case- and whitespace-insensitive form of a free-text argument."""
+    return " ".join(value.casefold().split())
+
+
+def _default_normalize(value):
+    # Only whitespace is safe to ignore for every tool; case can matter
+    return " ".join(value.split()) if isinstance(value, str) else value
+
+
+class ToolCache:
+    """Size-bounded LRU of one tool's results with a time-to-live.
+
+    Args:
+        name: Tool name, used in stats.
+        ttl_seconds: How long a result is served before the tool runs again.
+        max_entries: Results kept before the least recently used is evicted.
+    """
+
+    def __init__(self, name, ttl_seconds, max_entries=256):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "skipped": 0}
+
+    def get(self, key):
+        """Return ``(True, result)`` for a live entry, else ``(False, None)``."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return True, entry[1]
+            if entry is not None:
+                del self._entries[key]
+                self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return False, None
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def skip(self):
+        with self._lock:
+            self.stats["skipped"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        """Return the counters plus current size and hit rate."""
+        with self._lock:
+            stats = dict(self.stats, size=len(self._entries), ttl_seconds=self.ttl_seconds)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def cached_tool(ttl_seconds, max_entries=256, normalize=None, version=None, cache_if=None):
+    """Memoize a tool function for ``ttl_seconds``.
+
+    Args:
+        ttl_seconds: Lifetime of a cached result.
+        max_entries: Size bound of this tool's cache.
+        normalize: Mapping of argument name -> function giving its cache key
+            form. Other string arguments only have whitespace collapsed.
+        version: Optional callable whose value is part of every key, e.g.
+            the catalog version, so reloaded data is never served stale.
+        cache_if: Optional predicate on the result; results it rejects
+            (such as error messages) are returned but not stored.
+    """
+    normalize = normalize or {}
+
+    def decorate(function):
+        signature = inspect.signature(function)
+        cache = _caches[function.__name__] = ToolCache(function.__name__, ttl_seconds, max_entries)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            try:
+                key = tuple(
+                    (name, normalize.get(name, _default_normalize)(value)) for name, value in bound.arguments.items()
+                )
+                if version is not None:
+                    key += (("__version__", version()),)
+                hash(key)
+            except Exception:
+                # Unhashable or un-normalizable arguments just run uncached
+                cache.skip()
+                return function(*args, **kwargs)
+
+            found, result = cache.get(key)
+            if found:
+                return result
+            result = function(*args, **kwargs)
+            if cache_if is None or cache_if(result):
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorate
+
+
+def tool_cache_stats():
+    """Return per-tool cache counters keyed by tool name."""
+    return {name: cache.snapshot() for name, cache in _caches.items()}
+
+
+def clear_tool_caches():
+    for cache in _caches.values():
+        cache.clear()
@@ -0,0 +1,105 @@
+"""Structured tool results with pluggable renderers.
+
+Tools return a :class:`ToolResult`: the structured data behind the answer
+plus its rendering in the configured output format. The result is a ``str``,
+so the agent and its memory see plain text. By default that text is the
+compact form, which keeps tool observations small in the model's context.
+The UI asks the same object for rich markdown, and API consumers can ask
+for JSON.
+
+Renderers are registered per result kind and format with :func:`renderer`.
+JSON works for every kind out of the box.
+"""
+import json
+import os
+import re
+from collections.abc import Mapping
+
+FORMATS = ("compact", "markdown", "json")
+
+# Format of the text handed to the model; override with TOOL_OUTPUT_FORMAT
+OUTPUT_FORMAT = os.getenv("TOOL_OUTPUT_FORMAT", "compact")
+
+_RENDERERS = {}
+
+# Word runs, digit runs and single symbols; a rough stand-in for a BPE tokenizer
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d{1,3}|[^\sA-Za-z\d]")
+
+
+def renderer(kind, fmt):
+    """Register the decorated ``function(data) -> str`` as the ``fmt`` renderer of ``kind``."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+
+    def register(function):
+        _RENDERERS[kind, fmt] = function
+        return function
+
+    return register
+
+
+def _jsonable(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    try:
+        return list(value)
+    except TypeError:
+        raise TypeError(f"{type(value).__name__} is not JSON serializable") from None
+
+
+def render(kind, data, fmt):
+    """Render ``data`` of a result ``kind`` in ``fmt``."""
+    function = _RENDERERS.get((kind, fmt))
+    if function is not None:
+        return function(data)
+    if fmt == "json":
+        return json.dumps({"kind": kind, **data}, ensure_ascii=False, default=_jsonable)
+    raise ValueError(f"No {fmt} renderer registered for {kind!r} results")
+
+
+class ToolResult(str):
+    """A tool's answer as structured data, rendered once for the model.
+
+    Args:
+        kind: Result kind used to pick renderers (e.g. 'hotels').
+        data: JSON-friendly mapping with everything the renderers show.
+        fmt: Format of the string value; defaults to ``OUTPUT_FORMAT``.
+    """
+
+    def __new__(cls, kind, data, fmt=None):
+        fmt = fmt or OUTPUT_FORMAT
+        result = super().__new__(cls, render(kind, data, fmt))
+        result.kind = kind
+        result.data = data
+        result.format = fmt
+        return result
+
+    def render(self, fmt):
+        """Return this result in another format ('compact', 'markdown' or 'json')."""
+        if fmt == self.format:
+            return str(self)
+        return render(self.kind, self.data, fmt)
+
+    def to_json(self):
+        return self.render("json")
+
+
+def estimate_tokens(text):
+    """Approximate the number of model tokens in ``text``.
+
+    Counts six-letter word pieces, groups of up to three digits and symbols;
+    emoji and other non-ASCII symbols count as two. Good enough to compare output
+    formats, not to enforce context limits.
+    """
+    count = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece.isalpha():
+            count += (len(piece) + 5) // 6
+        else:
+            count += 2 if ord(piece[0]) > 0x2000 else 1
+    return count
+
+
+def token_report(result):
+    """Return the estimated token count of ``result`` in every format."""
+    return {fmt: estimate_tokens(result.render(fmt)) for fmt in FORMATS}
@@ -0,0 +1,11 @@
+"""Travel data catalog shared by the USA Travel Guide tools."""
+from travel_catalog.budget import BudgetRateTable
+from travel_catalog.catalog import TravelCatalog, catalog_reload_stats, get_catalog
+from travel_catalog.cities import CityResolver
+from travel_catalog.columnar import ColumnarCatalog
+from travel_catalog.geo import Gazetteer, GeoGrid
+from travel_catalog.hotels import HotelIndex
+from travel_catalog.restaurants import RestaurantIndex
+from travel_catalog.routes import RouteGraph
+
+__all__ = ["BudgetRateTable", "CityResolver", "ColumnarCatalog", "Gazetteer", "GeoGrid", "HotelIndex", "RestaurantIndex", "RouteGraph", "TravelCatalog", "catalog_reload_stats", "get_catalog"]
@@ -0,0 +1,77 @@
+"""Vectorized travel budget estimates over a rate table built from the catalog.
+
+The per-city rates used by ``estimate_travel_budget`` are packed into NumPy
+arrays once, so comparing many destinations, party sizes, trip lengths and
+accommodation tiers is a single broadcast instead of one tool call each.
+"""
+import numpy as np
+
+TIERS = ("budget", "mid-range", "luxury")
+
+
+class BudgetRateTable:
+    """Daily cost rates for every catalog city as dense arrays.
+
+    Args:
+        budget: Catalog budget section keyed by city, as in ``BUDGET_DATA``.
+    """
+
+    def __init__(self, budget):
+        self.cities = tuple(budget)
+        self._city_rows = {city: row for row, city in enumerate(self.cities)}
+        self._tier_cols = {tier: col for col, tier in enumerate(TIERS)}
+        # room_rate / food_rate: (city, tier); transport / attractions: (city,)
+        self.room_rate = np.array([[budget[c]["accommodation"][t] for t in TIERS] for c in self.cities], dtype=np.int64)
+        self.food_rate = np.array([[budget[c]["food"][t] for t in TIERS] for c in self.cities], dtype=np.int64)
+        self.transport = np.array([budget[c]["local_transport"] for c in self.cities], dtype=np.int64)
+        self.attractions = np.array([budget[c]["attractions"] for c in self.cities], dtype=np.int64)
+
+    def rows(self, cities):
+        """Return row indices for known cities plus the list of unknown ones."""
+        known = [city for city in cities if city in self._city_rows]
+        unknown = [city for city in cities if city not in self._city_rows]
+        return np.array([self._city_rows[city] for city in known], dtype=np.intp), known, unknown
+
+    def columns(self, tiers):
+        """Return column indices for tiers; raises ValueError on an unknown tier."""
+        try:
+            return np.array([self._tier_cols[tier] for tier in tiers], dtype=np.intp)
+        except KeyError as e:
+            raise ValueError(f"Unknown accommodation type {e.args[0]!r}; choose from {', '.join(TIERS)}") from None
+
+    def estimate(self, rows, people, days, cols):
+        """Compute cost components for every combination at once.
+
+        Args:
+            rows: City row indices, shape (D,).
+            people: Party sizes, shape (P,).
+            days: Trip lengths in days, shape (N,).
+            cols: Tier column indices, shape (T,).
+
+        Returns:
+            Dict of int arrays shaped (D, P, N, T): 'accommodation', 'food',
+            'local_transport', 'attractions' and 'total'.
+        """
+        people = np.asarray(people, dtype=np.int64)[None, :, None, None]
+        days = np.asarray(days, dtype=np.int64)[None, None, :, None]
+        rooms = (people + 1) // 2  # Two people per room, rounded up
+
+        room_rate = self.room_rate[np.ix_(rows, cols)][:, None, None, :]
+        food_rate = self.food_rate[np.ix_(rows, cols)][:, None, None, :]
+        transport = self.transport[rows][:, None, None, None]
+        attractions = self.attractions[rows][:, None, None, None]
+
+        shape = (len(rows), people.shape[1], days.shape[2], len(cols))
+        costs = {
+            "accommodation": np.broadcast_to(room_rate * rooms * days, shape),
+            "food": np.broadcast_to(food_rate * people * days, shape),
+            "local_transport": np.broadcast_to(transport * people * days, shape),
+            "attractions": np.broadcast_to(attractions * people * days, shape),
+        }
+        costs["total"] = costs["accommodation"] + costs["food"] + costs["local_transport"] + costs["attractions"]
+        return costs
+
+
+def cheapest(totals):
+    """Return the (destination, party, days, tier) indices of the lowest total."""
+    return tuple(int(i) for i in np.unravel_index(np.argmin(totals), totals.shape))
@@ -0,0 +1,265 @@
+"""Shared, immutable travel catalog queried by every tool in app.py."""
+import os
+import threading
+
+from travel_catalog import data
+from travel_catalog.budget import BudgetRateTable
+from travel_catalog.cities import CityResolver
+from travel_catalog.columnar import ColumnarCatalog, LazyMapping, freeze, write_catalog
+from travel_catalog.geo import Gazetteer, GeoGrid, normalize_street
+from travel_catalog.hotels import HotelIndex
+from travel_catalog.restaurants import RestaurantIndex
+from travel_catalog.routes import RouteGraph
+from travel_catalog.snapshots import CatalogWatcher, export_shards
+
+# Compiled columnar copy of data.py, shared by every worker process
+CATALOG_PATH = os.getenv("TRAVEL_CATALOG_FILE", os.path.join(os.path.dirname(__file__), "catalog.tcat"))
+
+# Optional folder of per-city shard files, watched and hot-reloaded when set
+CATALOG_DIR = os.getenv("TRAVEL_CATALOG_DIR")
+CATALOG_POLL_SECONDS = float(os.getenv("TRAVEL_CATALOG_POLL_SECONDS", "2"))
+
+
+def builtin_sections():
+    """Return the bundled mock data as catalog sections keyed by section name."""
+    return {
+        "weather_alerts": data.WEATHER_ALERTS,
+        "weather": data.WEATHER_DATA,
+        "budget": data.BUDGET_DATA,
+        "hotels": data.HOTELS,
+        "restaurants": data.RESTAURANTS,
+        "food_chains": data.FOOD_CHAINS,
+        "attractions": data.ATTRACTIONS,
+        "profile_interests": data.PROFILE_TO_INTERESTS,
+        "intercity_routes": data.INTERCITY_ROUTES,
+        "local_transport": data.LOCAL_TRANSPORT,
+        "safety": data.SAFETY,
+    }
+
+
+class TravelCatalog:
+    """Read-only view over all city data, shared across calls.
+
+    Every section is a mapping keyed by normalized city name (intercity
+    routes are keyed by ``"from-to"``). Nested dicts and lists are frozen
+    so tools can hand out references without copying. ``version`` grows
+    with every hot-reloaded snapshot. Per-city indexes,
+    the route graph and the budget rate table are built the first time
+    they are used, so opening a catalog costs the same at any size.
+    """
+
+    __slots__ = (
+        "weather_alerts",
+        "weather",
+        "budget",
+        "hotels",
+        "hotel_indexes",
+        "restaurants",
+        "restaurant_indexes",
+        "restaurant_locations",
+        "food_chains",
+        "food_chain_locations",
+        "attractions",
+        "profile_interests",
+        "intercity_routes",
+        "local_transport",
+        "safety",
+        "cities",
+        "gazetteer",
+        "version",
+        "_named_places",
+        "_budget_rates",
+        "_route_graph",
+        "_lock",
+        "city_resolver",
+    )
+
+    def __init__(self, weather_alerts, weather, budget, hotels, restaurants, food_chains,
+                 attractions, profile_interests, intercity_routes, local_transport, safety,
+                 gazetteer=None, version=0):
+        self.version = version
+        self.weather_alerts = freeze(weather_alerts)
+        self.weather = freeze(weather)
+        self.budget = freeze(budget)
+        self.hotels = freeze(hotels)
+        self.hotel_indexes = LazyMapping(self.hotels, lambda city: HotelIndex(self.hotels[city]))
+        self.restaurants = freeze(restaurants)
+        self.restaurant_indexes = LazyMapping(
+            self.restaurants, lambda city: RestaurantIndex(self.restaurants[city])
+        )
+        self.food_chains = freeze(food_chains)
+        self.attractions = freeze(attractions)
+        self.profile_interests = freeze(profile_interests)
+        self.intercity_routes = freeze(intercity_routes)
+        self.local_transport = freeze(local_transport)
+        self.safety = freeze(safety)
+
+        # Every city known to any section, used for lookups and diagnostics
+        cities = set()
+        for section in (self.weather_alerts, self.weather, self.budget, self.hotels,
+                        self.restaurants, self.food_chains, self.attractions,
+                        self.local_transport, self.safety):
+            cities.update(section)
+        for route_key in self.intercity_routes:
+            cities.update(route_key.split("-"))
+        self.cities = frozenset(cities)
+
+        # Catalog addresses are geocoded per city on first use, so
+        # near_address queries become spatial lookups
+        self.gazetteer = gazetteer if gazetteer is not None else Gazetteer({})
+        self.restaurant_locations = LazyMapping(self.restaurants, self._restaurant_grid)
+        self.food_chain_locations = LazyMapping(self.food_chains, self._food_chain_grid)
+        self._named_places = LazyMapping(set(self.hotels) | set(self.restaurants), self._places_in)
+        self._budget_rates = None
+        self._route_graph = None
+        self._lock = threading.Lock()
+
+        self.city_resolver = CityResolver(self.cities)
+
+    def __setattr__(self, name, value):
+        if hasattr(self, "city_resolver"):
+            raise AttributeError("TravelCatalog is immutable")
+        object.__setattr__(self, name, value)
+
+    def _restaurant_grid(self, city):
+        points = []
+        for position, restaurant in enumerate(self.restaurant_indexes[city].restaurants):
+            point = self.gazetteer.geocode(city, restaurant["address"])
+            if point is not None:
+                points.append((point[0], point[1], position))
+        return GeoGrid(points)
+
+    def _food_chain_grid(self, city):
+        points = []
+        for chain, addresses in self.food_chains[city].items():
+            for address in addresses:
+                point = self.gazetteer.geocode(city, address)
+                if point is not None:
+                    points.append((point[0], point[1], (chain, address)))
+        return GeoGrid(points)
+
+    def _places_in(self, city):
+        """Geocode the hotels and restaurants of ``city`` so their names work as origins."""
+        places = {}
+        for venue in tuple(self.hotels.get(city, ())) + tuple(self.restaurants.get(city, ())):
+            point = self.gazetteer.geocode(city, venue["address"])
+            if point is not None:
+                places[normalize_street(venue["name"])] = point
+        return places
+
+    @property
+    def budget_rates(self):
+        """Vectorized :class:`BudgetRateTable` over the budget section."""
+        if self._budget_rates is None:
+            with self._lock:
+                if self._budget_rates is None:
+                    object.__setattr__(self, "_budget_rates", BudgetRateTable(self.budget))
+        return self._budget_rates
+
+    @property
+    def route_graph(self):
+        """Intercity :class:`RouteGraph` over the routes section."""
+        if self._route_graph is None:
+            with self._lock:
+                if self._route_graph is None:
+                    object.__setattr__(self, "_route_graph", RouteGraph.from_routes(self.intercity_routes))
+        return self._route_graph
+
+    def resolve_city(self, location):
+        """Resolve a free-form location ("NYC", "Austin, TX") to a catalog city key.
+
+        Unknown locations come back normalized, so lookups simply miss.
+        """
+        return self.city_resolver.resolve(location)
+
+    def find_cities(self, text):
+        """Cities mentioned anywhere in ``text``, as ``(city key, span)`` pairs."""
+        return self.city_resolver.mentions(text)
+
+    def locate(self, city, place):
+        """Return ``(lat, lon)`` for an address, landmark, hotel or restaurant in ``city``."""
+        point = self.gazetteer.locate(city, place)
+        if point is None and city in self._named_places:
+            point = self._named_places[city].get(normalize_street(place.split(",")[0].strip()))
+        return point
+
+    @classmethod
+    def from_builtin(cls):
+        """Build the catalog from the bundled mock data and local gazetteer file."""
+        return cls(**builtin_sections(), gazetteer=Gazetteer.load())
+
+    @classmethod
+    def from_file(cls, path=CATALOG_PATH):
+        """Open a columnar catalog file written by :func:`compile_catalog`."""
+        store = ColumnarCatalog(path)
+        return cls(**{name: store.section(name) for name in store.section_names}, gazetteer=Gazetteer.load())
+
+
+def compile_catalog(path=CATALOG_PATH):
+    """Write the bundled data to ``path`` unless an up-to-date file is already there."""
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(data.__file__):
+        return path
+    write_catalog(path, builtin_sections())
+    return path
+
+
+def warm_cities(catalog, cities):
+    """Build the per-city indexes of ``cities`` ahead of their first query."""
+    for city in cities:
+        for indexes in (catalog.hotel_indexes, catalog.restaurant_indexes,
+                        catalog.restaurant_locations, catalog.food_chain_locations):
+            if city in indexes:
+                indexes[city]
+
+
+def watch_catalog(directory, interval=CATALOG_POLL_SECONDS):
+    """Load ``directory`` as a catalog and keep reloading it as its shards change.
+
+    An empty or missing folder is first seeded with the bundled data.
+    """
+    if not os.path.isdir(directory) or not any(name.endswith(".json") for name in os.listdir(directory)):
+        export_shards(directory, builtin_sections())
+    gazetteer = Gazetteer.load()
+    return CatalogWatcher(
+        directory,
+        build=lambda sections, version: TravelCatalog(**sections, gazetteer=gazetteer, version=version),
+        interval=interval,
+        warm=warm_cities,
+    ).start()
+
+
+_catalog = None
+_watcher = None
+_open_lock = threading.Lock()
+
+
+def get_catalog():
+    """Return the current catalog snapshot, opening it on first use.
+
+    With ``TRAVEL_CATALOG_DIR`` set, the shard folder is watched and each
+    call returns the latest snapshot; callers should fetch it once per
+    tool call. Otherwise the first process compiles ``catalog.tcat`` and
+    later ones only map it, falling back to the in-memory data if the file
+    cannot be written or read.
+    """
+    global _catalog, _watcher
+    if _watcher is not None:
+        return _watcher.current
+    if _catalog is not None:
+        return _catalog
+    # Concurrent first calls (e.g. prefetched tool calls) must not each start a watcher
+    with _open_lock:
+        if _watcher is None and _catalog is None:
+            if CATALOG_DIR:
+                _watcher = watch_catalog(CATALOG_DIR)
+            else:
+                try:
+                    _catalog = TravelCatalog.from_file(compile_catalog())
+                except (OSError, ValueError):
+                    _catalog = TravelCatalog.from_builtin()
+    return _watcher.current if _watcher is not None else _catalog
+
+
+def catalog_reload_stats():
+    """Return reload counters and timings, or None when hot reload is off."""
+    return _watcher.stats() if _watcher is not None else None
@@ -0,0 +1,295 @@
+"""City name resolution shared by every tool.
+
+Turns free-form locations such as "NYC", "New York City, NY", "Austin TX"
+or "Chicgo" into the normalized city keys used by the catalog. Lookups go
+exact match -> alias table -> typo match, and resolved strings are kept in
+an LRU cache since agents ask about the same handful of cities.
+
+A typo match must be within a few edits of a whole city name or alias, so
+other places that merely share letters ("Nashua", "York, PA", "North Miami")
+stay unknown. A state given with the city must be the catalog city's state:
+"Miami, OK" is not Miami, FL.
+"""
+import re
+from functools import lru_cache
+
+# Nicknames and abbreviations, keyed by normalized alias
+CITY_ALIASES = {
+    "nyc": "new york",
+    "ny": "new york",
+    "new york city": "new york",
+    "manhattan": "new york",
+    "the big apple": "new york",
+    "big apple": "new york",
+    "la": "los angeles",
+    "l a": "los angeles",
+    "hollywood": "los angeles",
+    "sf": "san francisco",
+    "s f": "san francisco",
+    "san fran": "san francisco",
+    "frisco": "san francisco",
+    "the bay area": "san francisco",
+    "bay area": "san francisco",
+    "chi town": "chicago",
+    "chitown": "chicago",
+    "the windy city": "chicago",
+    "windy city": "chicago",
+    "atx": "austin",
+    "vegas": "las vegas",
+    "lv": "las vegas",
+    "sin city": "las vegas",
+    "nola": "new orleans",
+    "the big easy": "new orleans",
+    "big easy": "new orleans",
+    "mia": "miami",
+    "miami beach": "miami",
+    "south beach": "miami",
+    "music city": "nashville",
+    "nash": "nashville",
+}
+
+US_STATES = {
+    "al": "alabama", "ak": "alaska", "az": "arizona", "ar": "arkansas", "ca": "california",
+    "co": "colorado", "ct": "connecticut", "de": "delaware", "dc": "district of columbia",
+    "fl": "florida", "ga": "georgia", "hi": "hawaii", "id": "idaho", "il": "illinois",
+    "in": "indiana", "ia": "iowa", "ks": "kansas", "ky": "kentucky", "la": "louisiana",
+    "me": "maine", "md": "maryland", "ma": "massachusetts", "mi": "michigan", "mn": "minnesota",
+    "ms": "mississippi", "mo": "missouri", "mt": "montana", "ne": "nebraska", "nv": "nevada",
+    "nh": "new hampshire", "nj": "new jersey", "nm": "new mexico", "ny": "new york",
+    "nc": "north carolina", "nd": "north dakota", "oh": "ohio", "ok": "oklahoma", "or": "oregon",
+    "pa": "pennsylvania", "ri": "rhode island", "sc": "south carolina", "sd": "south dakota",
+    "tn": "tennessee", "tx": "texas", "ut": "utah", "vt": "vermont", "va": "virginia",
+    "wa": "washington", "wv": "west virginia", "wi": "wisconsin", "wy": "wyoming",
+}
+
+# State of each catalog city, checked against a state given with the city
+CITY_STATES = {
+    "new york": "ny",
+    "los angeles": "ca",
+    "chicago": "il",
+    "austin": "tx",
+    "miami": "fl",
+    "san francisco": "ca",
+    "nashville": "tn",
+    "new orleans": "la",
+    "las vegas": "nv",
+}
+
+# State code by code or full name
+_STATE_CODES = {**{code: code for code in US_STATES}, **{name: code for code, name in US_STATES.items()}}
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+_TEXT_TOKEN = re.compile(r"[A-Za-z0-9]+|,")
+
+# Longest city name or alias, in words, looked for in free text
+_MENTION_WORDS = 3
+
+
+def _words(text):
+    return _NON_WORD.sub(" ", text.replace(".", "")).split()
+
+
+def parse_location(location):
+    """Split a location into its normalized city key and state code.
+
+    ``"New York, NY"`` -> ``("new york", "ny")``, ``"Las Vegas NM"`` ->
+    ``("las vegas", "nm")``, ``"Austin"`` -> ``("austin", None)``.
+    """
+    head, *rest = location.lower().split(",")
+    words = _words(head)
+    state = None
+    # Only a trailing state is split off, so "new york" and "washington" survive
+    if len(words) > 2 and " ".join(words[-2:]) in _STATE_CODES:
+        state, words = _STATE_CODES[" ".join(words[-2:])], words[:-2]
+    elif len(words) > 1 and words[-1] in _STATE_CODES:
+        state, words = _STATE_CODES[words[-1]], words[:-1]
+    if state is None:
+        # "Miami, Florida, USA"
+        state = next((_STATE_CODES[" ".join(_words(part))] for part in rest if " ".join(_words(part)) in _STATE_CODES), None)
+    return " ".join(words), state
+
+
+def normalize_location(location):
+    """Normalize a location string: lowercase, drop state and punctuation.
+
+    ``"New York, NY"`` -> ``"new york"``, ``"Austin TX"`` -> ``"austin"``.
+    """
+    return parse_location(location)[0]
+
+
+def max_typo_edits(name):
+    """Edits a misspelling of ``name`` may have: none for short names, 2 for long ones."""
+    if len(name) <= 4:
+        return 0
+    return 1 if len(name) <= 9 else 2
+
+
+def edit_distance(a, b, limit):
+    """Edit distance of ``a`` and ``b`` counting a swap of neighbours as one edit.
+
+    Returns ``limit + 1`` as soon as the distance is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+def trigrams(value):
+    """Return the set of padded character trigrams of ``value``."""
+    padded = f" {value} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CityResolver:
+    """Resolve free-form locations to known city keys.
+
+    Args:
+        cities: Normalized city keys known to the catalog.
+        aliases: Alias -> city key mapping; aliases for unknown cities are ignored.
+        states: City key -> state code; a city missing here accepts any state.
+        cache_size: Number of resolved input strings kept in the LRU cache.
+    """
+
+    def __init__(self, cities, aliases=CITY_ALIASES, states=CITY_STATES, cache_size=4096):
+        self.cities = frozenset(cities)
+        self.aliases = {alias: city for alias, city in aliases.items() if city in self.cities}
+        self.states = dict(states)
+
+        # Inverted trigram index over every city name and alias, to shortlist typo candidates
+        self._names = []
+        self._spellings = []
+        self._name_sizes = []
+        self._trigram_index = {}
+        for name, city in [(city, city) for city in sorted(self.cities)] + sorted(self.aliases.items()):
+            grams = trigrams(name)
+            position = len(self._names)
+            self._names.append(city)
+            self._spellings.append(name)
+            self._name_sizes.append(len(grams))
+            for gram in grams:
+                self._trigram_index.setdefault(gram, []).append(position)
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def cache_info(self):
+        """Return hit/miss statistics of the resolved-string cache."""
+        return self.resolve.cache_info()
+
+    def _resolve(self, location):
+        city, _ = self.match(location)
+        if city is not None:
+            return city
+        key, state = parse_location(location)
+        # Keep the state on unknown places so "Miami, OK" never reads as a catalog key
+        return f"{key} {state}" if state and key in self.cities else key
+
+    def match(self, location):
+        """Resolve ``location`` and report how close the match is.
+
+        Returns:
+            Tuple ``(city, score)``: score 1.0 for a city name or alias, below
+            1.0 for a misspelling (1 - edits / length), and ``(None, 0.0)``
+            when no known city is close enough or the given state is not the
+            city's state.
+        """
+        key, state = parse_location(location)
+        if key in self.cities:
+            city, score = key, 1.0
+        elif key in self.aliases:
+            city, score = self.aliases[key], 1.0
+        else:
+            city, score = self._closest(key)
+        if city is not None and state is not None and self.states.get(city, state) != state:
+            return None, 0.0
+        return city, score
+
+    def mentions(self, text):
+        """Find every city mentioned in free text, such as a whole agent task.
+
+        Runs of up to three words are matched longest first against city
+        names and aliases. Misspellings only count for capitalized words
+        after the first, since ordinary words are often a typo away from a
+        city ("vegan" and "Vegas"). A state after the city ("Miami, FL", "Las
+        Vegas NM") must be the city's state; otherwise the mention is the
+        unknown place "miami ok", as :meth:`resolve` would return it.
+
+        Returns:
+            List of ``(city, span)`` pairs: the city key and the words it was read from.
+        """
+        tokens = _TEXT_TOKEN.findall(text.replace(".", ""))
+        found = []
+        start = 0
+        while start < len(tokens):
+            for size in range(min(_MENTION_WORDS, len(tokens) - start), 0, -1):
+                words = tokens[start:start + size]
+                if "," in words:
+                    continue
+                key = " ".join(words).lower()
+                city = key if key in self.cities else self.aliases.get(key)
+                if city is None and start > 0 and all(word[0].isupper() for word in words):
+                    city = self._closest(key)[0]
+                if city is not None:
+                    break
+            else:
+                start += 1
+                continue
+            end = start + size
+            state, end = self._state_after(tokens, end)
+            if state is not None and self.states.get(city, state) != state:
+                city = f"{key} {state}"
+            found.append((city, " ".join(tokens[start:end])))
+            start = end
+        return found
+
+    @staticmethod
+    def _state_after(tokens, position):
+        """State written at ``tokens[position]``, if any, and the position after it.
+
+        After a comma any state code or name counts; without one only an
+        upper-case code ("NM") or a full name does, so words like "in" or
+        "or" are not read as states.
+        """
+        comma = position < len(tokens) and tokens[position] == ","
+        at = position + comma
+        for size in (2, 1):
+            words = tokens[at:at + size]
+            name = " ".join(words).lower()
+            if len(words) == size and name in _STATE_CODES and (comma or len(name) > 2 or words[0].isupper()):
+                return _STATE_CODES[name], at + size
+        return None, position
+
+    def fuzzy_match(self, key):
+        """Return the known city ``key`` is a misspelling of, or None."""
+        return self._closest(key)[0]
+
+    def _closest(self, key):
+        if not key:
+            return None, 0.0
+        grams = trigrams(key)
+        shared = {}
+        for gram in grams:
+            for position in self._trigram_index.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+        # Fewest edits wins; shared trigrams break ties
+        best, best_rank = None, None
+        for position, count in shared.items():
+            spelling = self._spellings[position]
+            limit = max_typo_edits(spelling)
+            distance = edit_distance(key, spelling, limit)
+            if distance > limit:
+                continue
+            rank = (distance, -2 * count / (len(grams) + self._name_sizes[position]))
+            if best_rank is None or rank < best_rank:
+                best, best_rank = position, rank
+        if best is None:
+            return None, 0.0
+        return self._names[best], 1.0 - best_rank[0] / len(self._spellings[best])
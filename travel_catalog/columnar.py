@@ -0,0 +1,370 @@
+"""Binary columnar catalog file, read zero-copy through ``mmap``.
+
+Layout of a ``.tcat`` file::
+
+    header      magic, version, directory offset and length
+    columns     fixed-width arrays, 8-byte aligned
+    lists       one shared uint32 array of string ids for list-valued fields
+    strings     every distinct string once: uint64 offsets + UTF-8 bytes
+    directory   small JSON index of sections, keys and column offsets
+
+Record sections (hotels, restaurants) are stored as one row per record,
+grouped by city, with a column per field: strings and string lists as
+interned ids, ints as int64, floats as float64, flags as int8. Irregular
+sections (weather, transport, safety, ...) are stored as one interned JSON
+document per key and parsed the first time that key is read.
+
+Opening a file only maps it and reads the directory, so cold start does not
+grow with the catalog, and every worker process mapping the same file
+shares one copy in the OS page cache.
+"""
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections.abc import Mapping, Sequence
+from types import MappingProxyType
+
+MAGIC = b"TCAT"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sIQQ")
+_ALIGN = 8
+
+# Sentinels marking a field that is absent from a record
+_NULL_ID = 0xFFFFFFFF
+_NULL_INT = -(2 ** 63)
+_NULL_BOOL = -1
+_MISSING = object()
+
+# Column kind -> array typecode of its fixed-width cells
+_TYPECODES = {"str": "I", "int": "q", "float": "d", "bool": "b", "strs": "I", "json": "I"}
+
+
+def freeze(value):
+    """Recursively convert dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class LazyMapping(Mapping):
+    """Read-only mapping whose values are built on first access.
+
+    Args:
+        keys: Every key of the mapping, in iteration order.
+        factory: Called once with a key to build its value.
+    """
+
+    __slots__ = ("_keys", "_key_set", "_factory", "_values", "_lock")
+
+    def __init__(self, keys, factory):
+        self._keys = tuple(keys)
+        self._key_set = frozenset(self._keys)
+        self._factory = factory
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if key not in self._key_set:
+            raise KeyError(key)
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = self._factory(key)
+        return self._values[key]
+
+    def __contains__(self, key):
+        return key in self._key_set
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+
+def _column_kind(values):
+    """Pick the narrowest column kind able to hold every present value."""
+    kinds = {type(value) for value in values}
+    if not kinds:
+        return "json"
+    if kinds == {str}:
+        return "str"
+    if kinds == {bool}:
+        return "bool"
+    if kinds == {int}:
+        return "int"
+    if kinds == {float}:
+        return "float"
+    if kinds <= {list, tuple} and all(isinstance(item, str) for value in values for item in value):
+        return "strs"
+    return "json"
+
+
+class _Writer:
+    """Accumulates columns, interned strings and string lists for one file."""
+
+    def __init__(self):
+        self.buffer = bytearray(_HEADER.size)
+        self.strings = {}
+        self.lists = array("I")
+
+    def intern(self, value):
+        string_id = self.strings.get(value)
+        if string_id is None:
+            string_id = self.strings[value] = len(self.strings)
+        return string_id
+
+    def append(self, cells):
+        """Append an array at the next aligned offset and return that offset."""
+        self.buffer.extend(b"\0" * (-len(self.buffer) % _ALIGN))
+        offset = len(self.buffer)
+        self.buffer.extend(cells.tobytes())
+        return offset
+
+    def cell(self, kind, value, present):
+        if kind == "str":
+            return self.intern(value) if present else _NULL_ID
+        if kind == "int":
+            return value if present else _NULL_INT
+        if kind == "float":
+            return value if present else float("nan")
+        if kind == "bool":
+            return int(value) if present else _NULL_BOOL
+        if kind == "json":
+            return self.intern(_dump(value)) if present else _NULL_ID
+        # strs: the cell is a start index into the shared list array, with
+        # the length stored there first so one uint32 per row is enough
+        if not present:
+            return _NULL_ID
+        start = len(self.lists)
+        self.lists.append(len(value))
+        self.lists.extend(self.intern(item) for item in value)
+        return start
+
+    def table(self, records_by_key):
+        """Write a record section; returns its directory entry."""
+        keys, records = {}, []
+        for key, key_records in records_by_key.items():
+            keys[key] = [len(records), len(records) + len(key_records)]
+            records.extend(key_records)
+        fields = []
+        for record in records:
+            fields.extend(field for field in record if field not in fields)
+
+        columns = {}
+        for field in fields:
+            kind = _column_kind([record[field] for record in records if field in record])
+            cells = array(_TYPECODES[kind], (self.cell(kind, record.get(field), field in record)
+                                             for record in records))
+            columns[field] = [kind, self.append(cells)]
+        return {"kind": "table", "rows": len(records), "keys": keys, "columns": columns}
+
+    def documents(self, values_by_key):
+        """Write a document section; returns its directory entry."""
+        cells = array("I", (self.intern(_dump(value)) for value in values_by_key.values()))
+        return {"kind": "documents", "keys": list(values_by_key), "offset": self.append(cells)}
+
+    def finish(self, sections):
+        lists_offset = self.append(self.lists)
+        encoded = [value.encode("utf-8") for value in self.strings]
+        offsets = array("Q", [0])
+        for blob in encoded:
+            offsets.append(offsets[-1] + len(blob))
+        string_offsets = self.append(offsets)
+        string_data = len(self.buffer)
+        self.buffer.extend(b"".join(encoded))
+
+        directory = json.dumps({
+            "byteorder": sys.byteorder,
+            "lists": [lists_offset, len(self.lists)],
+            "strings": [string_offsets, string_data, len(encoded)],
+            "sections": sections,
+        }, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        directory_offset = len(self.buffer)
+        self.buffer.extend(directory)
+        _HEADER.pack_into(self.buffer, 0, MAGIC, VERSION, directory_offset, len(directory))
+        return self.buffer
+
+
+def _dump(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_catalog(path, sections, table_sections=("hotels", "restaurants")):
+    """Compile catalog sections into a columnar file at ``path``.
+
+    The file is written next to ``path`` and renamed into place, so
+    processes that already mapped an older file keep reading it safely.
+
+    Args:
+        path: Destination ``.tcat`` file.
+        sections: Mapping of section name -> {key: value}, as in ``data.py``.
+        table_sections: Sections whose values are lists of flat records,
+            stored column by column.
+    """
+    writer = _Writer()
+    directory = {}
+    for name, values in sections.items():
+        if name in table_sections:
+            directory[name] = writer.table(values)
+        else:
+            directory[name] = writer.documents(values)
+    payload = writer.finish(directory)
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as stream:
+        stream.write(payload)
+    os.replace(temp_path, path)
+
+
+class Record(Mapping):
+    """One row of a record section, decoding fields on access."""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    def __getitem__(self, field):
+        value = self._table.value(field, self._row)
+        if value is _MISSING:
+            raise KeyError(field)
+        return value
+
+    def __iter__(self):
+        return (field for field in self._table.fields if self._table.value(field, self._row) is not _MISSING)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Record({dict(self)!r})"
+
+
+class RecordSlice(Sequence):
+    """The records stored under one key (e.g. one city's hotels)."""
+
+    __slots__ = ("_table", "_start", "_stop")
+
+    def __init__(self, table, start, stop):
+        self._table = table
+        self._start = start
+        self._stop = stop
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self))))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        return Record(self._table, self._start + index)
+
+
+class _Table:
+    """Column views of one record section."""
+
+    def __init__(self, store, entry):
+        self.store = store
+        self.fields = tuple(entry["columns"])
+        self._columns = {field: (kind, store.array(_TYPECODES[kind], offset, entry["rows"]))
+                         for field, (kind, offset) in entry["columns"].items()}
+
+    def value(self, field, row):
+        try:
+            kind, cells = self._columns[field]
+        except KeyError:
+            return _MISSING
+        cell = cells[row]
+        if kind == "str":
+            return _MISSING if cell == _NULL_ID else self.store.string(cell)
+        if kind == "int":
+            return _MISSING if cell == _NULL_INT else cell
+        if kind == "float":
+            return _MISSING if cell != cell else cell
+        if kind == "bool":
+            return _MISSING if cell == _NULL_BOOL else bool(cell)
+        if kind == "json":
+            return _MISSING if cell == _NULL_ID else freeze(json.loads(self.store.string(cell)))
+        if cell == _NULL_ID:
+            return _MISSING
+        lists = self.store.lists
+        return tuple(self.store.string(string_id) for string_id in lists[cell + 1:cell + 1 + lists[cell]])
+
+
+class ColumnarCatalog:
+    """Memory-mapped, read-only view of a ``.tcat`` file.
+
+    Args:
+        path: File written by :func:`write_catalog`.
+
+    Raises:
+        ValueError: If the file is not a catalog of this version and byte order.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, version, directory_offset, directory_length = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} travel catalog file")
+        directory = json.loads(bytes(self._view[directory_offset:directory_offset + directory_length]))
+        if directory["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {directory['byteorder']}-endian machine")
+
+        lists_offset, list_count = directory["lists"]
+        self.lists = self.array("I", lists_offset, list_count)
+        offsets, self._string_data, string_count = directory["strings"]
+        self._string_offsets = self.array("Q", offsets, string_count + 1)
+        self._strings = {}
+        self._sections = directory["sections"]
+
+    def array(self, typecode, offset, count):
+        """Return a zero-copy typed view of ``count`` cells starting at ``offset``."""
+        size = array(typecode).itemsize
+        return self._view[offset:offset + count * size].cast(typecode)
+
+    def string(self, string_id):
+        """Decode an interned string; each one is decoded at most once per process."""
+        value = self._strings.get(string_id)
+        if value is None:
+            start = self._string_data + self._string_offsets[string_id]
+            end = self._string_data + self._string_offsets[string_id + 1]
+            value = self._strings[string_id] = str(self._view[start:end], "utf-8")
+        return value
+
+    @property
+    def section_names(self):
+        return tuple(self._sections)
+
+    def section(self, name):
+        """Return a section as a read-only mapping of key -> frozen value.
+
+        Record sections map each key to a :class:`RecordSlice`; document
+        sections parse a key's JSON the first time it is read.
+        """
+        entry = self._sections[name]
+        if entry["kind"] == "table":
+            table = _Table(self, entry)
+            keys = entry["keys"]
+            return LazyMapping(keys, lambda key: RecordSlice(table, *keys[key]))
+        cells = self.array("I", entry["offset"], len(entry["keys"]))
+        positions = {key: position for position, key in enumerate(entry["keys"])}
+        return LazyMapping(entry["keys"], lambda key: freeze(json.loads(self.string(cells[positions[key]]))))
@@ -0,0 +1,833 @@
+"""Mock travel data used by the USA Travel Guide tools.
+
+In production these would come from weather, hotel, restaurant, transit and
+safety APIs. The raw literals live here so they are built exactly once and
+frozen by :class:`travel_catalog.TravelCatalog`.
+"""
+
+# Active weather alerts keyed by normalized city name
+WEATHER_ALERTS = {
+    "miami": "Hurricane Warning: Category 2 hurricane approaching. Prepare for evacuation.",
+    "new orleans": "Flood Warning: Heavy rainfall expected over the next 48 hours.",
+    "los angeles": "Heat Advisory: Temperatures expected to reach 100°F over the next 3 days."
+}
+
+# Current conditions and 3-day forecast
+WEATHER_DATA = {
+    "new york": {
+        "current": {"temp": 72, "condition": "Partly Cloudy", "humidity": 65},
+        "forecast": [
+            {"day": "Tomorrow", "temp": 75, "condition": "Sunny"},
+            {"day": "Day 2", "temp": 70, "condition": "Light Rain"},
+            {"day": "Day 3", "temp": 68, "condition": "Cloudy"}
+        ]
+    },
+    "austin": {
+        "current": {"temp": 85, "condition": "Sunny", "humidity": 45},
+        "forecast": [
+            {"day": "Tomorrow", "temp": 88, "condition": "Sunny"},
+            {"day": "Day 2", "temp": 90, "condition": "Clear"},
+            {"day": "Day 3", "temp": 89, "condition": "Partly Cloudy"}
+        ]
+    },
+    "chicago": {
+        "current": {"temp": 65, "condition": "Windy", "humidity": 55},
+        "forecast": [
+            {"day": "Tomorrow", "temp": 63, "condition": "Partly Cloudy"},
+            {"day": "Day 2", "temp": 58, "condition": "Rain"},
+            {"day": "Day 3", "temp": 60, "condition": "Partly Cloudy"}
+        ]
+    }
+}
+
+# Daily cost rates for common US destinations
+BUDGET_DATA = {
+    "new york": {
+        "accommodation": {
+            "budget": 150,    # Price per room per night
+            "mid-range": 250,
+            "luxury": 450
+        },
+        "food": {
+            "budget": 40,     # Price per person per day
+            "mid-range": 80,
+            "luxury": 150
+        },
+        "local_transport": 15,  # Per person per day
+        "attractions": 25       # Per person per day
+    },
+    "los angeles": {
+        "accommodation": {
+            "budget": 130,
+            "mid-range": 230,
+            "luxury": 400
+        },
+        "food": {
+            "budget": 40,
+            "mid-range": 75,
+            "luxury": 140
+        },
+        "local_transport": 20,
+        "attractions": 30
+    },
+    "chicago": {
+        "accommodation": {
+            "budget": 120,
+            "mid-range": 220,
+            "luxury": 350
+        },
+        "food": {
+            "budget": 35,
+            "mid-range": 70,
+            "luxury": 130
+        },
+        "local_transport": 14,
+        "attractions": 22
+    },
+    "miami": {
+        "accommodation": {
+            "budget": 130,
+            "mid-range": 240,
+            "luxury": 420
+        },
+        "food": {
+            "budget": 38,
+            "mid-range": 75,
+            "luxury": 140
+        },
+        "local_transport": 16,
+        "attractions": 28
+    },
+    "austin": {
+        "accommodation": {
+            "budget": 100,
+            "mid-range": 180,
+            "luxury": 320
+        },
+        "food": {
+            "budget": 30,
+            "mid-range": 65,
+            "luxury": 120
+        },
+        "local_transport": 12,
+        "attractions": 20
+    },
+    "san francisco": {
+        "accommodation": {
+            "budget": 160,
+            "mid-range": 260,
+            "luxury": 450
+        },
+        "food": {
+            "budget": 45,
+            "mid-range": 85,
+            "luxury": 160
+        },
+        "local_transport": 18,
+        "attractions": 28
+    },
+    "nashville": {
+        "accommodation": {
+            "budget": 110,
+            "mid-range": 190,
+            "luxury": 340
+        },
+        "food": {
+            "budget": 35,
+            "mid-range": 70,
+            "luxury": 130
+        },
+        "local_transport": 12,
+        "attractions": 22
+    },
+    "new orleans": {
+        "accommodation": {
+            "budget": 105,
+            "mid-range": 185,
+            "luxury": 330
+        },
+        "food": {
+            "budget": 40,
+            "mid-range": 75,
+            "luxury": 140
+        },
+        "local_transport": 12,
+        "attractions": 20
+    }
+}
+
+# Hotel listings per city
+HOTELS = {
+    "new york": [
+        {
+            "name": "Budget Inn NYC",
+            "level": "budget",
+            "price": 129,
+            "rating": 3.5,
+            "features": ["wifi", "air conditioning"],
+            "breakfast": False,
+            "pet_friendly": False,
+            "check_in": "3:00 PM",
+            "check_out": "11:00 AM",
+            "deposit": "First night's stay",
+            "cancellation": "24 hours before check-in",
+            "address": "123 Budget St, New York, NY",
+            "room_types": ["Queen", "Double Twin"]
+        },
+        {
+            "name": "Midtown Comfort Hotel",
+            "level": "mid-range",
+            "price": 229,
+            "rating": 4.2,
+            "features": ["wifi", "gym", "air conditioning"],
+            "breakfast": True,
+            "pet_friendly": True,
+            "pet_fee": 50,
+            "check_in": "4:00 PM",
+            "check_out": "12:00 PM",
+            "deposit": "First night's stay",
+            "cancellation": "48 hours before check-in",
+            "address": "456 Midtown Ave, New York, NY",
+            "room_types": ["Queen", "King", "Double Queen"]
+        },
+        {
+            "name": "Grand Manhattan Hotel",
+            "level": "luxury",
+            "price": 450,
+            "rating": 4.8,
+            "features": ["wifi", "spa", "gym", "pool", "concierge", "room service"],
+            "breakfast": True,
+            "pet_friendly": True,
+            "pet_fee": 100,
+            "check_in": "3:00 PM",
+            "check_out": "12:00 PM",
+            "deposit": "First night's stay",
+            "cancellation": "72 hours before check-in",
+            "address": "789 Luxury Blvd, New York, NY",
+            "room_types": ["King", "Junior Suite", "Executive Suite"]
+        }
+    ],
+    "chicago": [
+        {
+            "name": "Windy City Budget Stay",
+            "level": "budget",
+            "price": 99,
+            "rating": 3.6,
+            "features": ["wifi", "air conditioning"],
+            "breakfast": False,
+            "pet_friendly": False,
+            "check_in": "3:00 PM",
+            "check_out": "11:00 AM",
+            "deposit": "First night's stay",
+            "cancellation": "24 hours before check-in",
+            "address": "123 Economy Ave, Chicago, IL",
+            "room_types": ["Queen", "Double Twin"]
+        },
+        {
+            "name": "Lakeside Inn",
+            "level": "mid-range",
+            "price": 189,
+            "rating": 4.3,
+            "features": ["wifi", "gym", "air conditioning", "restaurant"],
+            "breakfast": True,
+            "pet_friendly": True,
+            "pet_fee": 40,
+            "check_in": "3:00 PM",
+            "check_out": "12:00 PM",
+            "deposit": "First night's stay",
+            "cancellation": "48 hours before check-in",
+            "address": "456 Lakeview Dr, Chicago, IL",
+            "room_types": ["Queen", "King", "Double Queen"]
+        },
+        {
+            "name": "The Chicago Grand Hotel",
+            "level": "luxury",
+            "price": 350,
+            "rating": 4.7,
+            "features": ["wifi", "spa", "gym", "pool", "concierge", "room service"],
+            "breakfast": True,
+            "pet_friendly": True,
+            "pet_fee": 75,
+            "check_in": "4:00 PM",
+            "check_out": "12:00 PM",
+            "deposit": "First night's stay",
+            "cancellation": "72 hours before check-in",
+            "address": "789 Magnificent Mile, Chicago, IL",
+            "room_types": ["King", "Junior Suite", "Executive Suite"]
+        }
+    ],
+    "austin": [
+        {
+            "name": "Austin Budget Inn",
+            "level": "budget",
+            "price": 89,
+            "rating": 3.4,
+            "features": ["wifi", "air conditioning", "free parking"],
+            "breakfast": False,
+            "pet_friendly": True,
+            "pet_fee": 25,
+            "check_in": "3:00 PM",
+            "check_out": "11:00 AM",
+            "deposit": "First night's stay",
+            "cancellation": "24 hours before check-in",
+            "address": "123 Budget Ln, Austin, TX",
+            "room_types": ["Queen", "Double Twin"]
+        },
+        {
+            "name": "Riverside Hotel Austin",
+            "level": "mid-range",
+            "price": 169,
+            "rating": 4.3,
+            "features": ["wifi", "pool", "gym", "air conditioning", "restaurant"],
+            "breakfast": True,
+            "pet_friendly": True,
+            "pet_fee": 35,
+            "check_in": "3:00 PM",
+            "check_out": "12:00 PM",
+            "deposit": "First night's stay",
+            "cancellation": "48 hours before check-in",
+            "address": "456 Riverside Dr, Austin, TX",
+            "room_types": ["Queen", "King", "Double Queen"]
+        },
+        {
+            "name": "Austin Luxury Resort",
+            "level": "luxury",
+            "price": 320,
+            "rating": 4.6,
+            "features": ["wifi", "spa", "gym", "pool", "concierge", "room service", "golf"],
+            "breakfast": True,
+            "pet_friendly": True,
+            "pet_fee": 50,
+            "check_in": "4:00 PM",
+            "check_out": "11:00 AM",
+            "deposit": "50% of total stay",
+            "cancellation": "72 hours before check-in",
+            "address": "789 Luxury Way, Austin, TX",
+            "room_types": ["King", "Junior Suite", "Executive Suite"]
+        }
+    ]
+}
+
+# Restaurant listings per city
+RESTAURANTS = {
+    "new york": [
+        {
+            "name": "Little Italy Pizzeria",
+            "cuisine": "Italian",
+            "price_range": "$$",
+            "rating": 4.3,
+            "dietary_options": ["vegetarian"],
+            "signature_dish": "Margherita Pizza",
+            "address": "123 Little Italy St, New York, NY",
+            "hours": "11:00 AM - 10:00 PM"
+        },
+        {
+            "name": "Golden Dragon",
+            "cuisine": "Chinese",
+            "price_range": "$$",
+            "rating": 4.1,
+            "dietary_options": ["vegetarian"],
+            "signature_dish": "Peking Duck",
+            "address": "456 Chinatown Ave, New York, NY",
+            "hours": "11:30 AM - 11:00 PM"
+        },
+        {
+            "name": "Taj Mahal",
+            "cuisine": "Indian",
+            "price_range": "$$",
+            "rating": 4.4,
+            "dietary_options": ["vegetarian", "halal"],
+            "signature_dish": "Butter Chicken",
+            "address": "789 Curry Row, New York, NY",
+            "hours": "12:00 PM - 10:30 PM"
+        },
+        {
+            "name": "Le Bernardin",
+            "cuisine": "French",
+            "price_range": "$$$$",
+            "rating": 4.8,
+            "dietary_options": [],
+            "signature_dish": "Seafood Tasting Menu",
+            "address": "155 W 51st St, New York, NY",
+            "hours": "5:00 PM - 10:00 PM"
+        },
+        {
+            "name": "Green Garden",
+            "cuisine": "Vegan",
+            "price_range": "$$",
+            "rating": 4.2,
+            "dietary_options": ["vegetarian", "vegan", "gluten-free"],
+            "signature_dish": "Buddha Bowl",
+            "address": "321 Healthy Ave, New York, NY",
+            "hours": "10:00 AM - 9:00 PM"
+        }
+    ],
+    "austin": [
+        {
+            "name": "Texas BBQ House",
+            "cuisine": "American",
+            "price_range": "$$",
+            "rating": 4.5,
+            "dietary_options": [],
+            "signature_dish": "Beef Brisket",
+            "address": "123 BBQ Lane, Austin, TX",
+            "hours": "11:00 AM - 10:00 PM"
+        },
+        {
+            "name": "Taco Heaven",
+            "cuisine": "Mexican",
+            "price_range": "$",
+            "rating": 4.4,
+            "dietary_options": ["vegetarian"],
+            "signature_dish": "Street Tacos",
+            "address": "456 Taco St, Austin, TX",
+            "hours": "10:00 AM - 11:00 PM"
+        },
+        {
+            "name": "Sushi Ko",
+            "cuisine": "Japanese",
+            "price_range": "$$$",
+            "rating": 4.6,
+            "dietary_options": ["gluten-free"],
+            "signature_dish": "Omakase",
+            "address": "789 Sushi Blvd, Austin, TX",
+            "hours": "12:00 PM - 10:30 PM"
+        },
+        {
+            "name": "Veggie Paradise",
+            "cuisine": "Vegetarian",
+            "price_range": "$$",
+            "rating": 4.2,
+            "dietary_options": ["vegetarian", "vegan", "gluten-free"],
+            "signature_dish": "Impossible Burger",
+            "address": "101 Green St, Austin, TX",
+            "hours": "11:00 AM - 9:00 PM"
+        },
+        {
+            "name": "Halal Grill",
+            "cuisine": "Middle Eastern",
+            "price_range": "$$",
+            "rating": 4.3,
+            "dietary_options": ["halal"],
+            "signature_dish": "Lamb Kebab",
+            "address": "202 Halal Way, Austin, TX",
+            "hours": "11:00 AM - 10:00 PM"
+        }
+    ],
+    "chicago": [
+        {
+            "name": "Deep Dish Heaven",
+            "cuisine": "American",
+            "price_range": "$$",
+            "rating": 4.6,
+            "dietary_options": ["vegetarian"],
+            "signature_dish": "Chicago Deep Dish Pizza",
+            "address": "123 Pizza Ave, Chicago, IL",
+            "hours": "11:00 AM - 11:00 PM"
+        },
+        {
+            "name": "Windy City Steakhouse",
+            "cuisine": "American",
+            "price_range": "$$$$",
+            "rating": 4.7,
+            "dietary_options": [],
+            "signature_dish": "Dry-aged Ribeye",
+            "address": "456 Steak Blvd, Chicago, IL",
+            "hours": "5:00 PM - 10:30 PM"
+        },
+        {
+            "name": "Little Saigon",
+            "cuisine": "Vietnamese",
+            "price_range": "$$",
+            "rating": 4.4,
+            "dietary_options": ["gluten-free"],
+            "signature_dish": "Pho",
+            "address": "789 Vietnam St, Chicago, IL",
+            "hours": "11:00 AM - 10:00 PM"
+        },
+        {
+            "name": "Taste of India",
+            "cuisine": "Indian",
+            "price_range": "$$",
+            "rating": 4.3,
+            "dietary_options": ["vegetarian", "halal"],
+            "signature_dish": "Chicken Tikka Masala",
+            "address": "101 Curry Lane, Chicago, IL",
+            "hours": "12:00 PM - 10:00 PM"
+        },
+        {
+            "name": "Green Leaf",
+            "cuisine": "Vegan",
+            "price_range": "$$",
+            "rating": 4.2,
+            "dietary_options": ["vegetarian", "vegan", "gluten-free"],
+            "signature_dish": "Vegan Chicago Dog",
+            "address": "202 Healthy Way, Chicago, IL",
+            "hours": "10:00 AM - 9:00 PM"
+        }
+    ]
+}
+
+# Food chain locations per city
+FOOD_CHAINS = {
+    "new york": {
+        "McDonald's": ["123 Broadway, New York, NY", "456 5th Ave, New York, NY", "789 Times Square, New York, NY"],
+        "Starbucks": ["111 Park Ave, New York, NY", "222 Broadway, New York, NY", "333 7th Ave, New York, NY"],
+        "Chipotle": ["444 8th Ave, New York, NY", "555 Broadway, New York, NY"],
+        "Subway": ["666 6th Ave, New York, NY", "777 Broadway, New York, NY"],
+        "Panda Express": ["888 Canal St, New York, NY"]
+    },
+    "chicago": {
+        "McDonald's": ["123 Michigan Ave, Chicago, IL", "456 State St, Chicago, IL"],
+        "Starbucks": ["111 Wacker Dr, Chicago, IL", "222 Michigan Ave, Chicago, IL"],
+        "Chipotle": ["444 State St, Chicago, IL"],
+        "Subway": ["666 Clark St, Chicago, IL", "777 Michigan Ave, Chicago, IL"],
+        "Portillo's": ["888 Clark St, Chicago, IL"]
+    },
+    "austin": {
+        "McDonald's": ["123 Congress Ave, Austin, TX", "456 Lamar Blvd, Austin, TX"],
+        "Starbucks": ["111 6th St, Austin, TX", "222 Congress Ave, Austin, TX"],
+        "Chipotle": ["444 Lamar Blvd, Austin, TX"],
+        "Subway": ["666 Congress Ave, Austin, TX"],
+        "Whataburger": ["888 Lamar Blvd, Austin, TX", "999 Congress Ave, Austin, TX"]
+    }
+}
+
+# Attractions per city, grouped by interest category
+ATTRACTIONS = {
+    "new york": {
+        "popular": ["Times Square", "Statue of Liberty", "Empire State Building", "Central Park", "Metropolitan Museum of Art"],
+        "history": ["Ellis Island", "9/11 Memorial & Museum", "American Museum of Natural History", "Tenement Museum"],
+        "culture": ["Broadway", "Metropolitan Opera", "Museum of Modern Art (MoMA)", "The High Line"],
+        "adventure": ["Hudson River Kayaking", "Coney Island", "Hell's Kitchen Food Tour"],
+        "nature": ["Central Park", "Brooklyn Botanic Garden", "Prospect Park"],
+        "romantic": ["Top of the Rock at sunset", "Central Park carriage ride", "Dinner cruise on Hudson River"],
+        "family": ["Central Park Zoo", "American Museum of Natural History", "Bronx Zoo", "Intrepid Sea, Air & Space Museum"],
+        "nightlife": ["Rooftop bars in Manhattan", "Comedy clubs", "Jazz clubs in Harlem", "Clubs in Meatpacking District"],
+        "shopping": ["Fifth Avenue", "SoHo", "Chelsea Market"]
+    },
+    "chicago": {
+        "popular": ["Millennium Park & Cloud Gate", "Navy Pier", "The Art Institute of Chicago", "Willis Tower Skydeck"],
+        "history": ["Chicago History Museum", "Field Museum", "Architecture River Cruise"],
+        "culture": ["The Art Institute of Chicago", "Symphony Center", "Chicago Theatre"],
+        "adventure": ["Lakefront Trail biking", "Chicago River kayaking", "Willis Tower Skydeck"],
+        "nature": ["Lincoln Park", "Garfield Park Conservatory", "Chicago Botanic Garden"],
+        "romantic": ["Navy Pier Ferris Wheel", "Signature Room at sunset", "Architecture River Cruise"],
+        "family": ["Shedd Aquarium", "Museum of Science and Industry", "Lincoln Park Zoo", "Navy Pier"],
+        "nightlife": ["River North bars", "Comedy clubs", "Jazz clubs", "Blue Chicago"],
+        "shopping": ["Magnificent Mile", "State Street", "Wicker Park boutiques"]
+    },
+    "miami": {
+        "popular": ["South Beach", "Art Deco Historic District", "Bayside Marketplace", "Wynwood Walls"],
+        "history": ["Vizcaya Museum & Gardens", "Freedom Tower", "Ancient Spanish Monastery"],
+        "culture": ["Pérez Art Museum", "Wynwood Walls", "Little Havana"],
+        "adventure": ["Everglades airboat tour", "Deep sea fishing", "Jet skiing", "Parasailing"],
+        "nature": ["Everglades National Park", "Biscayne National Park", "Miami Beach Botanical Garden"],
+        "romantic": ["South Beach sunset walk", "Dinner cruise on Biscayne Bay", "Vizcaya Gardens"],
+        "family": ["Miami Seaquarium", "Jungle Island", "Zoo Miami", "Miami Children's Museum"],
+        "nightlife": ["South Beach clubs", "Wynwood bars", "Ball & Chain in Little Havana"],
+        "shopping": ["Bayside Marketplace", "Aventura Mall", "Dolphin Mall"]
+    },
+    "austin": {
+        "popular": ["Texas State Capitol", "Lady Bird Lake", "Zilker Park", "South Congress Avenue"],
+        "history": ["Texas State Capitol", "Bullock Texas State History Museum", "LBJ Presidential Library"],
+        "culture": ["Austin City Limits Live", "The Contemporary Austin", "Live music on 6th Street"],
+        "adventure": ["Barton Springs Pool", "Lake Travis Zipline Adventures", "Paddleboarding on Lady Bird Lake"],
+        "nature": ["Zilker Park", "Lady Bird Johnson Wildflower Center", "Hamilton Pool Preserve"],
+        "romantic": ["Mount Bonnell at sunset", "Lake Austin dinner cruise", "Moonlight towers"],
+        "family": ["Thinkery Children's Museum", "Zilker Park Playground", "Austin Aquarium", "Texas Memorial Museum"],
+        "nightlife": ["6th Street bars", "Rainey Street", "Continental Club", "Antone's"],
+        "shopping": ["South Congress Avenue", "The Domain", "2nd Street District"]
+    },
+    "las vegas": {
+        "popular": ["The Strip", "Bellagio Fountains", "Fremont Street Experience", "High Roller Observation Wheel"],
+        "history": ["The Mob Museum", "Neon Museum", "Springs Preserve"],
+        "culture": ["Cirque du Soleil shows", "Bellagio Gallery of Fine Art", "Smith Center for the Performing Arts"],
+        "adventure": ["Grand Canyon helicopter tour", "Zip line on Fremont Street", "Dune buggy desert tour"],
+        "nature": ["Red Rock Canyon", "Valley of Fire State Park", "Hoover Dam"],
+        "romantic": ["Gondola ride at The Venetian", "Eiffel Tower viewing deck", "Bellagio Fountains at night"],
+        "family": ["Adventuredome at Circus Circus", "Shark Reef at Mandalay Bay", "Tournament of Kings"],
+        "nightlife": ["Casino nightclubs", "Fremont Street bars", "Rooftop lounges", "Magic shows"],
+        "shopping": ["The Forum Shops at Caesars", "Grand Canal Shoppes", "Las Vegas North Premium Outlets"]
+    }
+}
+
+# Interest categories shown for each traveler profile
+PROFILE_TO_INTERESTS = {
+    "single": ["popular", "adventure", "nightlife", "culture"],
+    "couple": ["romantic", "culture", "popular", "nightlife"],
+    "family_with_kids": ["family", "popular", "nature", "adventure"],
+    "seniors": ["history", "culture", "popular", "nature"]
+}
+
+# Intercity transportation options keyed by "from-to" route
+INTERCITY_ROUTES = {
+    "austin-new york": {
+        "air": [
+            {"airline": "American Airlines", "duration": "3h 50m", "price_range": "$200-450", "direct": True},
+            {"airline": "Delta", "duration": "3h 45m", "price_range": "$220-480", "direct": True},
+            {"airline": "United", "duration": "5h 30m", "price_range": "$180-350", "direct": False}
+        ],
+        "train": [
+            {"operator": "Amtrak", "duration": "2d 5h", "price_range": "$280-450", "transfers": 2}
+        ],
+        "bus": [
+            {"operator": "Greyhound", "duration": "1d 18h", "price_range": "$180-250", "transfers": 2}
+        ],
+        "car": {
+            "distance": "1,742 miles",
+            "duration": "26h (non-stop)",
+            "estimated_fuel": "$230-290",
+            "route": "I-35 N, I-40 E, I-81 N, I-78 E"
+        }
+    },
+    "new york-chicago": {
+        "air": [
+            {"airline": "United", "duration": "2h 20m", "price_range": "$150-300", "direct": True},
+            {"airline": "American Airlines", "duration": "2h 25m", "price_range": "$160-320", "direct": True}
+        ],
+        "train": [
+            {"operator": "Amtrak", "duration": "19h 30m", "price_range": "$120-210", "transfers": 0}
+        ],
+        "bus": [
+            {"operator": "Greyhound", "duration": "18h", "price_range": "$90-150", "transfers": 0},
+            {"operator": "Megabus", "duration": "17h 30m", "price_range": "$80-140", "transfers": 0}
+        ],
+        "car": {
+            "distance": "790 miles",
+            "duration": "12h (non-stop)",
+            "estimated_fuel": "$100-130",
+            "route": "I-80 W, I-90 W"
+        }
+    },
+    "los angeles-las vegas": {
+        "air": [
+            {"airline": "Southwest", "duration": "1h 10m", "price_range": "$80-180", "direct": True},
+            {"airline": "Spirit", "duration": "1h 15m", "price_range": "$60-150", "direct": True}
+        ],
+        "train": [],  # No direct train service
+        "bus": [
+            {"operator": "Greyhound", "duration": "5h 30m", "price_range": "$30-60", "transfers": 0},
+            {"operator": "Megabus", "duration": "5h 45m", "price_range": "$25-55", "transfers": 0},
+            {"operator": "Flixbus", "duration": "5h", "price_range": "$20-50", "transfers": 0}
+        ],
+        "car": {
+            "distance": "270 miles",
+            "duration": "4h (non-stop)",
+            "estimated_fuel": "$35-45",
+            "route": "I-15 N"
+        }
+    }
+}
+
+# Local transportation options per city
+LOCAL_TRANSPORT = {
+    "new york": {
+        "subway": {
+            "name": "New York City Subway",
+            "fare": "$2.75 per ride",
+            "pass_options": ["Day Pass: $13", "Week Pass: $33", "Month Pass: $127"],
+            "hours": "24/7 service with late-night changes",
+            "coverage": "Most parts of Manhattan, Brooklyn, Queens, and The Bronx",
+            "app": "NYC Subway Map or Google Maps",
+            "tips": "Subway is often the fastest way to move around Manhattan and between boroughs."
+        },
+        "bus": {
+            "name": "MTA Bus",
+            "fare": "$2.75 per ride",
+            "pass_options": ["Same as subway passes"],
+            "hours": "Varies by route, many run 24/7",
+            "coverage": "All five boroughs",
+            "app": "MTA Bus Time or Google Maps",
+            "tips": "Buses are good for crosstown travel in Manhattan where subway options are limited."
+        },
+        "rideshare": {
+            "options": ["Uber", "Lyft", "Via"],
+            "estimated_cost": "$20-40 for most Manhattan rides",
+            "availability": "Widely available 24/7",
+            "tips": "Can be expensive during rush hour or bad weather. Shared rides available for lower costs."
+        },
+        "taxi": {
+            "name": "Yellow Cab (in Manhattan) or Green Cab (outer boroughs)",
+            "fare_structure": "Base fare $2.50 + $0.50 per 1/5 mile or per 60 seconds in slow traffic",
+            "availability": "Abundant in Manhattan, less common in outer boroughs",
+            "tips": "Hail on street or use Curb app. 15-20% tip expected."
+        },
+        "rental": {
+            "car": ["Enterprise", "Hertz", "Avis", "Zipcar"],
+            "bike": ["Citi Bike: $3.50 per 30-minute ride or $15/day pass"],
+            "scooter": ["Lime", "Bird"],
+            "tips": "Car rental not recommended due to traffic and expensive parking. Citi Bike is great for short trips."
+        },
+        "routes": {
+            "times square-empire state building": {
+                "subway": "Take the N, Q, R, or W train from Times Square to Herald Square, then walk east.",
+                "bus": "Take the M42 crosstown bus east, then transfer to M5 southbound.",
+                "walking": "20-minute walk (0.8 miles) down Broadway or 7th Avenue."
+            },
+            "central park-brooklyn bridge": {
+                "subway": "Take the 4/5/6 train from 59th St-Lexington Ave to Brooklyn Bridge-City Hall.",
+                "bus": "Take the M5 bus southbound.",
+                "walking": "Long walk (4.5 miles) down 5th Avenue and Broadway."
+            }
+        }
+    },
+    "chicago": {
+        "subway": {
+            "name": "Chicago 'L' Train",
+            "fare": "$2.50 per ride",
+            "pass_options": ["Day Pass: $10", "3-Day Pass: $20", "Week Pass: $28"],
+            "hours": "Varies by line, some 24/7",
+            "coverage": "Downtown and many neighborhoods, airport connections",
+            "app": "Ventra app or Google Maps",
+            "tips": "The 'L' is great for travel to/from downtown and the airports."
+        },
+        "bus": {
+            "name": "CTA Bus",
+            "fare": "$2.25 per ride",
+            "pass_options": ["Same as 'L' passes"],
+            "hours": "Varies by route",
+            "coverage": "Extensive coverage throughout the city",
+            "app": "CTA Bus Tracker or Google Maps",
+            "tips": "Buses fill gaps in the 'L' network and are good for east-west travel."
+        },
+        "rideshare": {
+            "options": ["Uber", "Lyft"],
+            "estimated_cost": "$15-30 for most city rides",
+            "availability": "Widely available 24/7",
+            "tips": "Good option during non-rush hour times."
+        },
+        "taxi": {
+            "name": "Chicago Taxi",
+            "fare_structure": "Base fare $3.25 + $2.25 per mile",
+            "availability": "Common in downtown and near hotels",
+            "tips": "Hail on street or use Curb app. 15-20% tip expected."
+        },
+        "rental": {
+            "car": ["Enterprise", "Hertz", "Avis", "Zipcar"],
+            "bike": ["Divvy Bikes: $3.30 per 30-minute ride or $15/day pass"],
+            "scooter": ["Lime", "Bird"],
+            "tips": "Divvy bikes are great for lakefront trail and neighborhoods."
+        }
+    },
+    "san francisco": {
+        "subway": {
+            "name": "BART (regional) and Muni Metro (city)",
+            "fare": "BART: $2-12 depending on distance, Muni: $2.50 per ride",
+            "pass_options": ["Muni Day Pass: $5", "Clipper Card for all systems"],
+            "hours": "BART: 5am-midnight, Muni varies by line",
+            "coverage": "BART connects to East Bay and airport, Muni serves city neighborhoods",
+            "app": "BART app, Muni app, or Google Maps",
+            "tips": "BART for longer trips, Muni for within city travel."
+        },
+        "bus": {
+            "name": "Muni Bus",
+            "fare": "$2.50 per ride",
+            "pass_options": ["Muni Day Pass: $5", "Muni Monthly Pass: $81"],
+            "hours": "Varies by route, some 24/7 routes",
+            "coverage": "Extensive city coverage",
+            "app": "Muni Mobile or Google Maps",
+            "tips": "Buses go where BART and Muni Metro don't."
+        },
+        "rideshare": {
+            "options": ["Uber", "Lyft"],
+            "estimated_cost": "$15-35 for most city rides",
+            "availability": "Widely available 24/7",
+            "tips": "Can be expensive during peak times, but convenient for hills."
+        },
+        "taxi": {
+            "name": "SF Taxi",
+            "fare_structure": "Base fare $3.50 + $3.00 per mile",
+            "availability": "Common downtown and in tourist areas",
+            "tips": "Hail on street or use Flywheel app. 15-20% tip expected."
+        },
+        "rental": {
+            "car": ["Enterprise", "Hertz", "Avis", "Zipcar"],
+            "bike": ["Bay Wheels: $3.49 per 30-minute ride or $15/day pass"],
+            "scooter": ["Lime", "Spin", "Bird"],
+            "tips": "Car rental challenging due to hills and parking. Consider bike for Golden Gate Park and waterfront."
+        }
+    }
+}
+
+# Safety information and alerts per city
+SAFETY = {
+    "new york": {
+        "safety_rating": "Good",
+        "current_alerts": [
+            "Increased pickpocketing in popular tourist areas",
+            "Construction on Broadway between 42nd and 50th Streets"
+        ],
+        "safe_areas": ["Most of Manhattan", "Much of Brooklyn Heights", "Park Slope"],
+        "caution_areas": ["Parts of the Bronx at night", "Parts of East Harlem late at night"],
+        "emergency_numbers": {
+            "police": "911",
+            "tourist_police": "646-610-6655"
+        },
+        "tips": [
+            "Be aware of your surroundings in crowded tourist areas",
+            "Keep wallets and phones secure, especially on subway",
+            "Use licensed yellow or green taxis, or reputable rideshare apps",
+            "Be cautious with your belongings in Times Square and on the subway"
+        ]
+    },
+    "chicago": {
+        "safety_rating": "Good in tourist areas, variable elsewhere",
+        "current_alerts": [
+            "Increased car break-ins in downtown parking garages",
+            "Pickpocketing along Magnificent Mile"
+        ],
+        "safe_areas": ["Downtown/Loop", "North Michigan Ave", "Lincoln Park", "Lakeview"],
+        "caution_areas": ["Some South and West Side neighborhoods, especially at night"],
+        "emergency_numbers": {
+            "police": "911",
+            "non-emergency": "311"
+        },
+        "tips": [
+            "Stay in well-lit, busy areas at night",
+            "Use caution when using public transit late at night",
+            "Keep valuables out of sight in parked cars",
+            "Be aware of surroundings when using ATMs"
+        ]
+    },
+    "miami": {
+        "safety_rating": "Generally good in tourist areas",
+        "current_alerts": [
+            "Increased vehicle break-ins in South Beach parking areas",
+            "Be alert for hurricane warnings during season (June-November)"
+        ],
+        "safe_areas": ["South Beach (daytime)", "Downtown Miami", "Coral Gables", "Coconut Grove"],
+        "caution_areas": ["Liberty City", "Overtown", "Some areas of Little Haiti at night"],
+        "emergency_numbers": {
+            "police": "911",
+            "miami beach visitor center": "305-673-7400"
+        },
+        "tips": [
+            "Be cautious of scooter rental scams",
+            "Use hotel safes for valuables",
+            "Be aware of rip currents at beaches",
+            "Lock vehicles and don't leave valuables visible",
+            "Stay hydrated in hot weather"
+        ]
+    },
+    "las vegas": {
+        "safety_rating": "Good on Strip and tourist areas",
+        "current_alerts": [
+            "Street performers may be aggressive in soliciting tips",
+            "Drink spiking incidents reported in some clubs"
+        ],
+        "safe_areas": ["The Strip", "Downtown (Fremont St)", "Most casino properties"],
+        "caution_areas": ["Areas north and east of downtown", "Some parts of North Las Vegas"],
+        "emergency_numbers": {
+            "police": "911",
+            "tourist safety hotline": "702-229-3111"
+        },
+        "tips": [
+            "Stay hydrated and use sunscreen in hot weather",
+            "Be cautious of 'card slappers' offering adult services",
+            "Watch your drink at all times in bars and clubs",
+            "Use casino ATMs rather than those on side streets",
+            "Be wary of 'friendly strangers' offering deals or special access"
+        ]
+    }
+}
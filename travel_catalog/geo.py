@@ -0,0 +1,196 @@
+"""Offline geocoding and nearest-neighbour search for catalog addresses.
+
+The gazetteer is a local JSON file with, per city, a center point, named
+places (landmarks, airports) and street anchors. A street anchor is
+``[lat, lon, bearing_degrees, meters_per_100_numbers]``, so a house number
+is placed along the street from its anchor. Nothing here touches the
+network.
+"""
+import json
+import math
+import os
+import re
+
+from travel_catalog.cities import normalize_location
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(__file__), "gazetteer.json")
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_MILE = 1.609344
+
+# Canonical spellings applied to both gazetteer keys and user input
+_STREET_WORDS = {
+    "street": "st", "avenue": "ave", "av": "ave", "boulevard": "blvd", "drive": "dr",
+    "lane": "ln", "road": "rd", "place": "pl", "parkway": "pkwy", "square": "sq",
+    "sq": "sq", "west": "w", "east": "e", "north": "n", "south": "s",
+    "first": "1st", "second": "2nd", "third": "3rd", "fourth": "4th", "fifth": "5th",
+    "sixth": "6th", "seventh": "7th", "eighth": "8th", "ninth": "9th", "tenth": "10th",
+}
+_DIRECTIONS = frozenset(("n", "s", "e", "w"))
+_HOUSE_NUMBER = re.compile(r"^(\d+)\s+(.+)$")
+
+
+def normalize_street(value):
+    """Normalize a street or place name ('West 51st Street' -> 'w 51st st')."""
+    words = re.sub(r"[^a-z0-9 ]+", " ", value.lower().replace("'", "")).split()
+    return " ".join(_STREET_WORDS.get(word, word) for word in words)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlam = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlam / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _offset(lat, lon, bearing_degrees, meters):
+    """Move ``meters`` from a point along a bearing (flat-earth, fine at street scale)."""
+    bearing = math.radians(bearing_degrees)
+    dlat = meters * math.cos(bearing) / 111320.0
+    dlon = meters * math.sin(bearing) / (111320.0 * math.cos(math.radians(lat)))
+    return lat + dlat, lon + dlon
+
+
+class Gazetteer:
+    """Address and place lookup for the cities in the catalog.
+
+    Args:
+        cities: Mapping of city key -> ``{"center", "places", "streets"}`` as
+            stored in ``gazetteer.json``.
+    """
+
+    def __init__(self, cities):
+        self._centers = {}
+        self._places = {}
+        self._streets = {}
+        for city, info in cities.items():
+            self._centers[city] = tuple(info["center"])
+            self._places[city] = {normalize_street(name): tuple(point)
+                                  for name, point in info.get("places", {}).items()}
+            self._streets[city] = {normalize_street(name): tuple(anchor)
+                                   for name, anchor in info.get("streets", {}).items()}
+
+    @classmethod
+    def load(cls, path=GAZETTEER_PATH):
+        """Load a gazetteer from a local JSON file."""
+        with open(path, "r", encoding="utf-8") as stream:
+            return cls(json.load(stream)["cities"])
+
+    def center(self, city):
+        """Return the center point of ``city``, or None if it is not covered."""
+        return self._centers.get(city)
+
+    def geocode(self, city, text):
+        """Return ``(lat, lon)`` for a place name or street address in ``city``.
+
+        Only the part before the first comma is used, so full catalog
+        addresses ("123 Broadway, New York, NY") work as-is. Returns None
+        when the place or street is unknown.
+        """
+        places = self._places.get(city, {})
+        streets = self._streets.get(city, {})
+        head = text.split(",")[0].strip()
+
+        name = normalize_street(head)
+        if name in places:
+            return places[name]
+
+        number = 0
+        match = _HOUSE_NUMBER.match(head)
+        if match:
+            number, name = int(match.group(1)), normalize_street(match.group(2))
+            if name in places:
+                return places[name]
+
+        anchor = streets.get(name)
+        if anchor is None and name.split(" ", 1)[0] in _DIRECTIONS:
+            # "N Lamar Blvd" -> "lamar blvd"
+            anchor = streets.get(name.split(" ", 1)[-1])
+        if anchor is None:
+            return None
+        lat, lon, bearing, meters_per_100 = anchor
+        return _offset(lat, lon, bearing, number * meters_per_100 / 100.0)
+
+    def locate(self, city, text):
+        """Geocode ``text`` in ``city``, also accepting a city name for its center."""
+        point = self.geocode(city, text)
+        if point is None and normalize_location(text) == city:
+            point = self.center(city)
+        return point
+
+
+class GeoGrid:
+    """Uniform lat/lon grid for k-nearest and radius queries.
+
+    Args:
+        points: Iterable of ``(lat, lon, payload)`` tuples.
+        cell_degrees: Grid cell size; 0.01 degrees is roughly 1 km.
+    """
+
+    def __init__(self, points, cell_degrees=0.01):
+        self.cell = cell_degrees
+        self.points = tuple((float(lat), float(lon), payload) for lat, lon, payload in points)
+        self._cells = {}
+        for position, (lat, lon, _) in enumerate(self.points):
+            self._cells.setdefault(self._cell_of(lat, lon), []).append(position)
+        if self._cells:
+            rows = [row for row, _ in self._cells]
+            cols = [col for _, col in self._cells]
+            self._bounds = (min(rows), max(rows), min(cols), max(cols))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cell_of(self, lat, lon):
+        return math.floor(lat / self.cell), math.floor(lon / self.cell)
+
+    def _ring(self, row, col, radius):
+        """Yield the cells on the square ring ``radius`` cells away from (row, col)."""
+        if radius == 0:
+            yield row, col
+            return
+        for dc in range(-radius, radius + 1):
+            yield row - radius, col + dc
+            yield row + radius, col + dc
+        for dr in range(-radius + 1, radius):
+            yield row + dr, col - radius
+            yield row + dr, col + radius
+
+    def nearest(self, lat, lon, k=5, radius_km=None, predicate=None):
+        """Return up to ``k`` ``(distance_km, payload)`` pairs, closest first.
+
+        Rings of cells are searched outward from the query point and the
+        search stops once no unvisited cell can hold a closer point.
+        """
+        if not self.points or k <= 0:
+            return []
+        row, col = self._cell_of(lat, lon)
+        min_row, max_row, min_col, max_col = self._bounds
+        max_radius = max(abs(row - min_row), abs(row - max_row), abs(col - min_col), abs(col - max_col))
+        # Smallest ground distance covered by one cell (longitude shrinks with latitude)
+        cell_km = self.cell * 111.32 * max(math.cos(math.radians(abs(lat) + self.cell)), 0.01)
+
+        found = []
+        for radius in range(max_radius + 1):
+            for cell in self._ring(row, col, radius):
+                for position in self._cells.get(cell, ()):
+                    p_lat, p_lon, payload = self.points[position]
+                    if predicate is not None and not predicate(payload):
+                        continue
+                    distance = haversine_km(lat, lon, p_lat, p_lon)
+                    if radius_km is None or distance <= radius_km:
+                        found.append((distance, position))
+            # Anything in ring radius+1 is at least radius * cell_km away
+            bound = radius * cell_km
+            if radius_km is not None and bound > radius_km:
+                break
+            if len(found) >= k and sorted(found)[k - 1][0] <= bound:
+                break
+        found.sort()
+        return [(distance, self.points[position][2]) for distance, position in found[:k]]
+
+    def within(self, lat, lon, radius_km, predicate=None):
+        """Return every ``(distance_km, payload)`` within ``radius_km``, closest first."""
+        return self.nearest(lat, lon, k=len(self.points), radius_km=radius_km, predicate=predicate)
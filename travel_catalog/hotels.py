@@ -0,0 +1,172 @@
+"""Per-city hotel index: attribute bitsets with price/rating ranking.
+
+Hotels are stored in ascending price order, so bit ``i`` of every mask refers
+to the ``i``-th cheapest hotel. That makes a max-price filter a prefix mask
+and "cheapest first" ranking a walk over the lowest set bits. Ratings are
+bucketed to one decimal place, which keeps min-rating filters and
+"best rated first" ranking to a handful of big-int ANDs.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from types import MappingProxyType
+
+# Common ways travelers spell the amenities we index
+AMENITY_ALIASES = {
+    "pets": "pet friendly",
+    "pet": "pet friendly",
+    "pet friendly": "pet friendly",
+    "dog friendly": "pet friendly",
+    "wi fi": "wifi",
+    "internet": "wifi",
+    "fitness": "gym",
+    "fitness center": "gym",
+    "ac": "air conditioning",
+    "a c": "air conditioning",
+    "parking": "free parking",
+    "free breakfast": "breakfast",
+    "breakfast included": "breakfast",
+    "swimming pool": "pool",
+}
+
+SORT_KEYS = ("price", "rating")
+
+
+@lru_cache(maxsize=4096)
+def normalize_attribute(value):
+    """Normalize an amenity or room type for lookup ('Pet-Friendly' -> 'pet friendly')."""
+    value = re.sub(r"[-_/]+", " ", value.lower())
+    value = " ".join(value.split())
+    return AMENITY_ALIASES.get(value, value)
+
+
+def mask_from_positions(positions, size):
+    """Build a bitset with the given bit positions set, in linear time."""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, "little")
+
+
+def iter_bits(mask):
+    """Yield the positions of set bits in ``mask`` from lowest to highest."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class HotelIndex:
+    """Bitset index over one city's hotels.
+
+    Args:
+        hotels: Iterable of hotel mappings as stored in the catalog.
+    """
+
+    __slots__ = ("hotels", "all_mask", "_prices", "_levels", "_amenities",
+                 "_room_types", "_ratings", "_rating_masks", "_rating_at_least")
+
+    def __init__(self, hotels):
+        self.hotels = tuple(sorted(hotels, key=lambda h: (h["price"], -h["rating"])))
+        self.all_mask = (1 << len(self.hotels)) - 1
+        self._prices = [h["price"] for h in self.hotels]
+
+        size = len(self.hotels)
+        levels, amenities, room_types, by_rating = {}, {}, {}, {}
+        for position, hotel in enumerate(self.hotels):
+            levels.setdefault(hotel["level"], []).append(position)
+
+            tags = {normalize_attribute(f) for f in hotel.get("features", ())}
+            if hotel.get("breakfast", False):
+                tags.add("breakfast")
+            if hotel.get("pet_friendly", False):
+                tags.add("pet friendly")
+            for tag in tags:
+                amenities.setdefault(tag, []).append(position)
+
+            # Index full room type names and their words ("suite" matches "Junior Suite")
+            room_tags = set()
+            for room_type in hotel.get("room_types", ()):
+                name = normalize_attribute(room_type)
+                room_tags.add(name)
+                room_tags.update(name.split())
+            for tag in room_tags:
+                room_types.setdefault(tag, []).append(position)
+
+            by_rating.setdefault(round(hotel["rating"] * 10), []).append(position)
+
+        self._levels = MappingProxyType({k: mask_from_positions(v, size) for k, v in levels.items()})
+        self._amenities = MappingProxyType({k: mask_from_positions(v, size) for k, v in amenities.items()})
+        self._room_types = MappingProxyType({k: mask_from_positions(v, size) for k, v in room_types.items()})
+
+        # Ratings in descending order with exact and cumulative ("at least") masks
+        self._ratings = sorted(by_rating)
+        self._rating_masks = tuple(
+            (tenths, mask_from_positions(by_rating[tenths], size)) for tenths in reversed(self._ratings)
+        )
+        cumulative, at_least = 0, []
+        for _, bucket_mask in self._rating_masks:
+            cumulative |= bucket_mask
+            at_least.append(cumulative)
+        self._rating_at_least = tuple(reversed(at_least))
+
+    def __len__(self):
+        return len(self.hotels)
+
+    def resolve_preferences(self, preferences):
+        """Split preferences into (amenities, room types, unknown), all normalized."""
+        amenities, room_types, unknown = [], [], []
+        for preference in preferences:
+            key = normalize_attribute(preference)
+            if not key:
+                continue
+            if key in self._amenities:
+                amenities.append(key)
+            elif key in self._room_types:
+                room_types.append(key)
+            else:
+                unknown.append(preference)
+        return amenities, room_types, unknown
+
+    def match(self, level=None, amenities=(), room_types=(), max_price=None, min_rating=None):
+        """Return the bitset of hotels matching every given criterion."""
+        mask = self.all_mask
+        if level:
+            mask &= self._levels.get(level, 0)
+        for amenity in amenities:
+            mask &= self._amenities.get(amenity, 0)
+        for room_type in room_types:
+            mask &= self._room_types.get(room_type, 0)
+        if max_price is not None:
+            mask &= (1 << bisect_right(self._prices, max_price)) - 1
+        if min_rating is not None:
+            bucket = bisect_left(self._ratings, round(min_rating * 10))
+            mask &= self._rating_at_least[bucket] if bucket < len(self._ratings) else 0
+        return mask
+
+    def rank(self, mask, sort_by="price", limit=None):
+        """Return up to ``limit`` hotels from ``mask``, cheapest or best rated first."""
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {', '.join(SORT_KEYS)}")
+        limit = limit if limit and limit > 0 else len(self.hotels)
+        results = []
+        if sort_by == "price":
+            for position in iter_bits(mask):
+                results.append(self.hotels[position])
+                if len(results) == limit:
+                    break
+            return results
+
+        # Best rated first; ties within a rating bucket stay cheapest first
+        for _, bucket_mask in self._rating_masks:
+            for position in iter_bits(mask & bucket_mask):
+                results.append(self.hotels[position])
+                if len(results) == limit:
+                    return results
+        return results
+
+    def search(self, level=None, amenities=(), room_types=(), max_price=None, min_rating=None,
+               sort_by="price", limit=None):
+        """Filter and rank in one call; see :meth:`match` and :meth:`rank`."""
+        mask = self.match(level, amenities, room_types, max_price, min_rating)
+        return self.rank(mask, sort_by=sort_by, limit=limit)
@@ -0,0 +1,112 @@
+"""Per-city restaurant index keyed by cuisine, dietary tag and price tier.
+
+Each key maps to the positions of matching restaurants, with dietary tags
+normalized once at build time. Queries intersect the (small) position sets
+and pick the best rated with a bounded heap, so cost follows the number of
+matches rather than the size of the city.
+"""
+import heapq
+import re
+from functools import lru_cache
+from types import MappingProxyType
+
+# Common spellings of the dietary tags we index
+DIETARY_ALIASES = {
+    "veg": "vegetarian",
+    "veggie": "vegetarian",
+    "plant based": "vegan",
+    "gf": "gluten free",
+    "no gluten": "gluten free",
+    "kosher style": "kosher",
+}
+
+
+@lru_cache(maxsize=4096)
+def normalize_tag(value):
+    """Normalize a cuisine or dietary tag ('Gluten-Free' -> 'gluten free')."""
+    value = " ".join(re.sub(r"[-_/]+", " ", value.lower()).split())
+    return DIETARY_ALIASES.get(value, value)
+
+
+def normalize_price_tier(value):
+    """Normalize a price tier ('$$', ' $$ ' or '2') to its dollar-sign form."""
+    value = value.strip()
+    if value.isdigit():
+        return "$" * int(value)
+    return value
+
+
+class RestaurantIndex:
+    """Multi-attribute index over one city's restaurants.
+
+    Args:
+        restaurants: Iterable of restaurant mappings as stored in the catalog.
+    """
+
+    __slots__ = ("restaurants", "_by_cuisine", "_by_dietary", "_by_price", "_by_rating")
+
+    def __init__(self, restaurants):
+        self.restaurants = tuple(restaurants)
+        by_cuisine, by_dietary, by_price = {}, {}, {}
+        for position, restaurant in enumerate(self.restaurants):
+            by_cuisine.setdefault(normalize_tag(restaurant["cuisine"]), set()).add(position)
+            by_price.setdefault(restaurant["price_range"], set()).add(position)
+            for option in restaurant["dietary_options"]:
+                by_dietary.setdefault(normalize_tag(option), set()).add(position)
+
+        self._by_cuisine = MappingProxyType({k: frozenset(v) for k, v in by_cuisine.items()})
+        self._by_dietary = MappingProxyType({k: frozenset(v) for k, v in by_dietary.items()})
+        self._by_price = MappingProxyType({k: frozenset(v) for k, v in by_price.items()})
+        # Best rated first; catalog order breaks ties
+        self._by_rating = tuple(sorted(range(len(self.restaurants)), key=self._rank_key, reverse=True))
+
+    def __len__(self):
+        return len(self.restaurants)
+
+    def _rank_key(self, position):
+        return self.restaurants[position]["rating"], -position
+
+    @staticmethod
+    def _union(index, keys):
+        matches = set()
+        for key in keys:
+            matches |= index.get(key, frozenset())
+        return matches
+
+    def match(self, cuisines=(), dietary=(), price_range=""):
+        """Return the positions matching every given filter, or None if no filter is set.
+
+        Args:
+            cuisines: Cuisines to accept (any of them matches).
+            dietary: Dietary tags to accept (any of them matches).
+            price_range: Exact price tier such as '$$', or '' for any.
+        """
+        filters = []
+        if cuisines:
+            filters.append(self._union(self._by_cuisine, (normalize_tag(c) for c in cuisines)))
+        if dietary:
+            filters.append(self._union(self._by_dietary, (normalize_tag(d) for d in dietary)))
+        if price_range:
+            filters.append(self._by_price.get(normalize_price_tier(price_range), frozenset()))
+        if not filters:
+            return None
+
+        # Intersect starting from the most selective filter
+        filters.sort(key=len)
+        matches = set(filters[0])
+        for other in filters[1:]:
+            matches &= other
+        return matches
+
+    def search(self, cuisines=(), dietary=(), price_range="", limit=None):
+        """Return the best rated restaurants matching every given filter.
+
+        Takes the same filters as :meth:`match`; ``limit`` caps the number of
+        results (None for all matches).
+        """
+        matches = self.match(cuisines, dietary, price_range)
+        limit = limit if limit and limit > 0 else len(self.restaurants)
+        if matches is None:
+            return [self.restaurants[p] for p in self._by_rating[:limit]]
+        positions = heapq.nlargest(limit, matches, key=self._rank_key)
+        return [self.restaurants[p] for p in positions]
@@ -0,0 +1,191 @@
+"""Intercity route graph with multi-leg itineraries.
+
+Every air/train/bus option and the driving route of each catalog city pair
+becomes an edge in both directions, with duration and price parsed out of
+the display strings. Itineraries are found with Dijkstra over lexicographic
+cost tuples, and each source's shortest-path tree is cached so repeated
+queries from a popular city are a dictionary walk.
+"""
+import heapq
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+MODES = ("air", "train", "bus", "car")
+OBJECTIVES = ("fastest", "cheapest", "fewest_transfers")
+
+# Layover added between consecutive legs when comparing total travel time
+TRANSFER_MINUTES = 90
+
+_DURATION_PART = re.compile(r"(\d+)\s*([dhm])")
+_PRICE = re.compile(r"\$?\s*([\d,]+)(?:\s*-\s*\$?\s*([\d,]+))?")
+
+
+def parse_duration(text):
+    """Parse '2d 5h', '3h 50m' or '26h (non-stop)' into minutes."""
+    scale = {"d": 1440, "h": 60, "m": 1}
+    return sum(int(value) * scale[unit] for value, unit in _DURATION_PART.findall(text))
+
+
+def parse_price_range(text):
+    """Parse '$200-450' into ``(200, 450)``; a single price gives ``(p, p)``."""
+    match = _PRICE.search(text)
+    if not match:
+        return 0, 0
+    low = int(match.group(1).replace(",", ""))
+    high = int(match.group(2).replace(",", "")) if match.group(2) else low
+    return low, high
+
+
+def format_duration(minutes):
+    """Format minutes as '2d 5h' or '7h 5m'."""
+    days, rest = divmod(int(minutes), 1440)
+    hours, mins = divmod(rest, 60)
+    if days:
+        return f"{days}d {hours}h" if hours else f"{days}d"
+    return f"{hours}h {mins}m" if mins else f"{hours}h"
+
+
+class Leg(NamedTuple):
+    """One direct connection between two cities."""
+
+    origin: str
+    destination: str
+    mode: str
+    carrier: str
+    minutes: int
+    price_low: int
+    price_high: int
+    transfers: int
+    duration: str
+    price_range: str
+
+
+class Itinerary(NamedTuple):
+    """A sequence of legs from origin to destination."""
+
+    legs: tuple
+    minutes: int
+    price_low: int
+    price_high: int
+
+    @property
+    def transfers(self):
+        """Changes of vehicle: between legs plus stops inside each leg."""
+        return len(self.legs) - 1 + sum(leg.transfers for leg in self.legs)
+
+
+def _edge_cost(objective, leg, is_first):
+    minutes = leg.minutes + (0 if is_first else TRANSFER_MINUTES)
+    price = (leg.price_low + leg.price_high) / 2
+    if objective == "fastest":
+        return minutes, price
+    if objective == "cheapest":
+        return price, minutes
+    return 1 + leg.transfers, minutes
+
+
+class RouteGraph:
+    """Weighted multigraph of intercity connections.
+
+    Args:
+        legs: Iterable of :class:`Leg`; each is used in the given direction only.
+    """
+
+    def __init__(self, legs):
+        adjacency = {}
+        for leg in legs:
+            adjacency.setdefault(leg.origin, []).append(leg)
+            adjacency.setdefault(leg.destination, [])
+        self._adjacency = {city: tuple(edges) for city, edges in adjacency.items()}
+        self._tree = lru_cache(maxsize=1024)(self._shortest_path_tree)
+
+    @classmethod
+    def from_routes(cls, routes):
+        """Build the graph from catalog routes keyed by ``"from-to"``, in both directions."""
+        legs = []
+        for route_key, options in routes.items():
+            origin, destination = route_key.split("-", 1)
+            for a, b in ((origin, destination), (destination, origin)):
+                for mode in ("air", "train", "bus"):
+                    for option in options.get(mode, ()):
+                        low, high = parse_price_range(option["price_range"])
+                        if mode == "air":
+                            carrier, transfers = option["airline"], 0 if option["direct"] else 1
+                        else:
+                            carrier, transfers = option["operator"], option["transfers"]
+                        legs.append(Leg(a, b, mode, carrier, parse_duration(option["duration"]),
+                                        low, high, transfers, option["duration"], option["price_range"]))
+                car = options.get("car")
+                if car:
+                    low, high = parse_price_range(car["estimated_fuel"])
+                    legs.append(Leg(a, b, "car", "Drive " + car["route"], parse_duration(car["duration"]),
+                                    low, high, 0, car["duration"], car["estimated_fuel"]))
+        return cls(legs)
+
+    @property
+    def cities(self):
+        """Every city with at least one connection."""
+        return frozenset(self._adjacency)
+
+    def _shortest_path_tree(self, origin, objective, mode):
+        """Dijkstra from ``origin``; returns {city: (cost, previous leg)} for every reachable city."""
+        best = {origin: ((0, 0), None)}
+        heap = [((0, 0), origin)]
+        done = set()
+        while heap:
+            cost, city = heapq.heappop(heap)
+            if city in done:
+                continue
+            done.add(city)
+            for leg in self._adjacency.get(city, ()):
+                if mode != "all" and leg.mode != mode:
+                    continue
+                step = _edge_cost(objective, leg, city == origin)
+                new_cost = (cost[0] + step[0], cost[1] + step[1])
+                known = best.get(leg.destination)
+                if known is None or new_cost < known[0]:
+                    best[leg.destination] = (new_cost, leg)
+                    heapq.heappush(heap, (new_cost, leg.destination))
+        return best
+
+    def route(self, origin, destination, objective="fastest", mode="all") -> Optional[Itinerary]:
+        """Return the best itinerary for ``objective``, or None if unreachable.
+
+        Args:
+            origin: Catalog city key to leave from.
+            destination: Catalog city key to arrive at.
+            objective: One of 'fastest', 'cheapest' or 'fewest_transfers'.
+            mode: Restrict every leg to one of 'air', 'train', 'bus', 'car', or 'all'.
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"objective must be one of {', '.join(OBJECTIVES)}")
+        if mode != "all" and mode not in MODES:
+            raise ValueError(f"mode must be one of {', '.join(MODES)} or 'all'")
+        if origin == destination or origin not in self._adjacency:
+            return None
+
+        tree = self._tree(origin, objective, mode)
+        if destination not in tree:
+            return None
+        legs = []
+        city = destination
+        while city != origin:
+            leg = tree[city][1]
+            legs.append(leg)
+            city = leg.origin
+        legs.reverse()
+        minutes = sum(leg.minutes for leg in legs) + TRANSFER_MINUTES * (len(legs) - 1)
+        return Itinerary(tuple(legs), minutes,
+                         sum(leg.price_low for leg in legs), sum(leg.price_high for leg in legs))
+
+    def precompute(self, objectives=OBJECTIVES, modes=("all",) + MODES):
+        """Warm the cached shortest-path tree of every city (all-pairs table)."""
+        for origin in self._adjacency:
+            for objective in objectives:
+                for mode in modes:
+                    self._tree(origin, objective, mode)
+
+    def cache_info(self):
+        """Return hit/miss statistics of the shortest-path tree cache."""
+        return self._tree.cache_info()
@@ -0,0 +1,249 @@
+"""Hot-reloadable catalog snapshots built from per-city shard files.
+
+A catalog directory holds one JSON shard per city plus ``_shared.json``::
+
+    catalog/
+        _shared.json        {"profile_interests": {...}}
+        new-york.json       {"city": "new york", "hotels": [...], "safety": {...},
+                             "intercity_routes": {"chicago": {...}}, ...}
+
+A shard carries every section for its city. Intercity routes sit in the
+origin city's shard, keyed by destination. :class:`CatalogWatcher` polls
+the directory, re-parses only the shards whose size or modification time
+changed, builds a new immutable snapshot on its own thread and swaps it in
+with a single reference assignment. Tool calls that already hold the old
+snapshot finish on it.
+"""
+import json
+import os
+import re
+import threading
+import time
+from types import MappingProxyType
+
+from travel_catalog.columnar import freeze
+
+SHARED_SHARD = "_shared.json"
+
+# Sections stored per city; intercity_routes is regrouped by origin city
+CITY_SECTIONS = ("weather_alerts", "weather", "budget", "hotels", "restaurants", "food_chains",
+                 "attractions", "intercity_routes", "local_transport", "safety")
+SHARED_SECTIONS = ("profile_interests",)
+
+
+def shard_name(city):
+    """File name of a city's shard ('new york' -> 'new-york.json')."""
+    return re.sub(r"[^a-z0-9]+", "-", city.lower()).strip("-") + ".json"
+
+
+def export_shards(directory, sections):
+    """Write catalog sections (as in ``data.py``) out as shard files in ``directory``."""
+    os.makedirs(directory, exist_ok=True)
+    shards = {}
+    for name in CITY_SECTIONS:
+        for key, value in sections[name].items():
+            if name == "intercity_routes":
+                origin, destination = key.split("-", 1)
+                shards.setdefault(origin, {}).setdefault(name, {})[destination] = value
+            else:
+                shards.setdefault(key, {})[name] = value
+    for city, shard in shards.items():
+        _write_json(os.path.join(directory, shard_name(city)), {"city": city, **shard})
+    _write_json(os.path.join(directory, SHARED_SHARD), {name: sections[name] for name in SHARED_SECTIONS})
+
+
+def _write_json(path, value):
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as stream:
+        json.dump(value, stream, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+class ShardStore:
+    """Parsed shards of a catalog directory, re-read only when a file changes.
+
+    Args:
+        directory: Folder holding the shard files.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._stamps = {}
+        self._shards = {}
+
+    def _scan(self):
+        stamps = {}
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(".json"):
+                stat = entry.stat()
+                stamps[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def refresh(self):
+        """Re-parse changed shards.
+
+        Returns:
+            Tuple ``(changed, cities)``: names of added, modified or removed
+            shard files, and the city keys they cover. Nothing is updated if
+            any changed shard fails to parse.
+
+        Raises:
+            ValueError: If a shard is not valid JSON or lacks its city name.
+        """
+        stamps = self._scan()
+        changed = sorted(name for name in stamps.keys() | self._stamps.keys()
+                         if stamps.get(name) != self._stamps.get(name))
+        parsed = {}
+        for name in changed:
+            if name not in stamps:
+                continue
+            try:
+                with open(os.path.join(self.directory, name), "r", encoding="utf-8") as stream:
+                    shard = json.load(stream)
+            except (OSError, json.JSONDecodeError) as e:
+                raise ValueError(f"Could not read catalog shard {name}: {e}") from None
+            if name != SHARED_SHARD and not isinstance(shard.get("city"), str):
+                raise ValueError(f"Catalog shard {name} has no 'city' name")
+            parsed[name] = freeze(shard)
+
+        cities = {self._shards[name]["city"] for name in changed
+                  if name in self._shards and name != SHARED_SHARD}
+        cities.update(shard["city"] for name, shard in parsed.items() if name != SHARED_SHARD)
+        for name in changed:
+            if name in parsed:
+                self._shards[name] = parsed[name]
+            else:
+                self._shards.pop(name, None)
+        self._stamps = stamps
+        return changed, cities
+
+    def mark_stale(self, names):
+        """Forget the stamps of ``names`` so the next refresh parses them again."""
+        for name in names:
+            self._stamps.pop(name, None)
+
+    def sections(self):
+        """Assemble catalog sections from the parsed shards; no file is read."""
+        sections = {name: {} for name in CITY_SECTIONS + SHARED_SECTIONS}
+        for name in sorted(self._shards):
+            shard = self._shards[name]
+            if name == SHARED_SHARD:
+                for section in SHARED_SECTIONS:
+                    sections[section] = shard.get(section, {})
+                continue
+            city = shard["city"]
+            for section in CITY_SECTIONS:
+                if section not in shard:
+                    continue
+                if section == "intercity_routes":
+                    for destination, route in shard[section].items():
+                        sections[section][f"{city}-{destination}"] = route
+                else:
+                    sections[section][city] = shard[section]
+        # Shard values are already frozen; the wrappers keep freeze() from copying them
+        return {name: MappingProxyType(values) for name, values in sections.items()}
+
+
+class CatalogWatcher:
+    """Keeps the current catalog snapshot in sync with a shard directory.
+
+    Args:
+        directory: Folder holding the shard files.
+        build: Called as ``build(sections, version)`` to create a snapshot.
+        interval: Seconds between directory polls.
+        warm: Optional ``warm(snapshot, cities)`` run on the watcher thread
+            before a snapshot is published, e.g. to build changed indexes.
+    """
+
+    def __init__(self, directory, build, interval=2.0, warm=None):
+        self.store = ShardStore(directory)
+        self.interval = interval
+        self._build = build
+        self._warm = warm
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "version": 0,
+            "reloads": 0,
+            "failures": 0,
+            "last_error": None,
+            "last_reload": None,
+            "total_ms": 0.0,
+        }
+        self.current = None
+        self.reload()
+
+    def reload(self):
+        """Check the directory once and publish a new snapshot if anything changed.
+
+        Returns:
+            True if a new snapshot was swapped in.
+        """
+        with self._lock:
+            started = time.perf_counter()
+            changed = ()
+            try:
+                changed, cities = self.store.refresh()
+                if not changed:
+                    return False
+                parsed = time.perf_counter()
+                version = self._stats["version"] + 1
+                snapshot = self._build(self.store.sections(), version)
+                built = time.perf_counter()
+                if self._warm is not None:
+                    self._warm(snapshot, cities)
+                warmed = time.perf_counter()
+            except Exception as e:
+                if self.current is None:
+                    raise
+                self.store.mark_stale(changed)
+                # A half-written shard fails on every poll until it is saved; report it once
+                if str(e) != self._stats["last_error"]:
+                    self._stats["failures"] += 1
+                    self._stats["last_error"] = str(e)
+                    print(f"Catalog reload failed, keeping version {self._stats['version']}: {str(e)}")
+                return False
+
+            self.current = snapshot
+            total_ms = (warmed - started) * 1000
+            self._stats["version"] = version
+            self._stats["reloads"] += 1
+            self._stats["last_error"] = None
+            self._stats["total_ms"] += total_ms
+            self._stats["last_reload"] = {
+                "at": time.time(),
+                "changed_shards": changed,
+                "cities": sorted(cities),
+                "parse_ms": round((parsed - started) * 1000, 3),
+                "build_ms": round((built - parsed) * 1000, 3),
+                "warm_ms": round((warmed - built) * 1000, 3),
+                "total_ms": round(total_ms, 3),
+            }
+            print(f"Catalog version {version} loaded in {total_ms:.1f} ms ({len(changed)} shard(s) changed)")
+            return True
+
+    def stats(self):
+        """Return reload counters and the timing breakdown of the last reload."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["mean_ms"] = round(stats["total_ms"] / stats["reloads"], 3) if stats["reloads"] else 0.0
+        return stats
+
+    def start(self):
+        """Start polling on a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="catalog-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop polling; the current snapshot stays available."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.reload()
@@ -0,0 +1,315 @@
+"""Pluggable weather providers with batched fetches and an hourly cache.
+
+``get_weather_forecast`` asks a :class:`WeatherService` for a city's forecast.
+The service hands cache misses to a provider in batches:
+
+* :class:`CatalogWeatherProvider` reads the bundled catalog data (the default).
+* :class:`OpenMeteoProvider` calls an Open-Meteo style ``/v1/forecast`` API,
+  many coordinates per request. The local stand-in in ``weather_standin.py``
+  speaks the same API, so it can be exercised offline.
+
+Providers without a batch endpoint only implement :meth:`WeatherProvider.fetch`
+and get concurrent fetches from :meth:`WeatherProvider.fetch_many`.
+
+Every provider returns the same compact forecast::
+
+    {"alert": str or None,
+     "current": {"temp": 72, "condition": "Partly Cloudy", "humidity": 65},
+     "forecast": [{"day": "Tomorrow", "temp": 75, "condition": "Sunny"}, ...]}
+
+or None when it has no data for the location. Open-Meteo has no alerts, so
+:class:`OpenMeteoProvider` raises its own from severe weather codes and
+100°F highs, and says they are not official warnings. Forecasts are cached per
+location for the current hour. A lookup with nothing else in progress is
+fetched at once. Lookups that arrive while others are in progress, such as
+the later weather calls of one code action run by ``concurrent_tools``, are
+collected for ``batch_window`` seconds and fetched together.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+
+FORECAST_DAYS = ("Tomorrow", "Day 2", "Day 3")
+
+# WMO weather interpretation codes used by Open-Meteo
+WMO_CONDITIONS = {
+    0: "Clear", 1: "Mostly Clear", 2: "Partly Cloudy", 3: "Cloudy",
+    45: "Fog", 48: "Fog",
+    51: "Light Drizzle", 53: "Drizzle", 55: "Heavy Drizzle", 56: "Freezing Drizzle", 57: "Freezing Drizzle",
+    61: "Light Rain", 63: "Rain", 65: "Heavy Rain", 66: "Freezing Rain", 67: "Freezing Rain",
+    71: "Light Snow", 73: "Snow", 75: "Heavy Snow", 77: "Snow Grains",
+    80: "Rain Showers", 81: "Rain Showers", 82: "Heavy Rain Showers", 85: "Snow Showers", 86: "Snow Showers",
+    95: "Thunderstorm", 96: "Thunderstorm with Hail", 99: "Thunderstorm with Hail",
+}
+
+# Alert raised by each severe weather code
+WMO_ALERTS = {
+    56: "Freezing Rain Advisory", 57: "Freezing Rain Advisory", 66: "Freezing Rain Advisory", 67: "Freezing Rain Advisory",
+    65: "Flood Watch", 82: "Flood Watch",
+    75: "Winter Storm Warning", 86: "Winter Storm Warning",
+    95: "Thunderstorm Warning", 96: "Severe Thunderstorm Warning", 99: "Severe Thunderstorm Warning",
+}
+
+# Highs from this many degrees Fahrenheit raise a heat advisory
+HEAT_ADVISORY_F = 100
+
+
+class WeatherProvider:
+    """Source of forecasts for locations given as catalog city keys.
+
+    Subclasses implement :meth:`fetch`, and override :meth:`fetch_many` when
+    the upstream API can answer several locations in one request.
+
+    Args:
+        max_workers: Locations fetched at once by the default :meth:`fetch_many`,
+            on a thread pool the provider keeps for its lifetime.
+    """
+
+    name = "weather"
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="weather") if max_workers > 1 else None
+
+    def fetch(self, location):
+        """Forecast for one location, or None if there is no data for it."""
+        raise NotImplementedError
+
+    def fetch_many(self, locations):
+        """Forecasts keyed by location, fetched concurrently; raises if any fetch fails."""
+        if len(locations) <= 1 or self._pool is None:
+            return {location: self.fetch(location) for location in locations}
+        return dict(zip(locations, self._pool.map(self.fetch, locations)))
+
+
+class CatalogWeatherProvider(WeatherProvider):
+    """Forecasts and alerts from the travel catalog's mock data.
+
+    Args:
+        get_catalog: Returns the current catalog, so hot reloads are seen.
+    """
+
+    name = "catalog"
+
+    def __init__(self, get_catalog):
+        super().__init__(max_workers=1)
+        self.get_catalog = get_catalog
+
+    def fetch(self, location):
+        catalog = self.get_catalog()
+        alert = catalog.weather_alerts.get(location)
+        weather = catalog.weather.get(location)
+        if weather is None:
+            # Alerts without conditions still reach the user
+            return {"alert": alert, "current": None, "forecast": []} if alert else None
+        return {"alert": alert, "current": weather["current"], "forecast": weather["forecast"]}
+
+
+def _alert_from_open_meteo(current, daily):
+    """Alert text for severe codes or heat in an Open-Meteo forecast, or None."""
+    periods = [("now", current["weather_code"], current["temperature_2m"])]
+    periods += zip(("today",) + FORECAST_DAYS, daily["weather_code"], daily["temperature_2m_max"])
+    alerts = {}
+    for period, code, temp in periods:
+        if code in WMO_ALERTS:
+            alerts.setdefault(WMO_ALERTS[code], []).append(f"{WMO_CONDITIONS[code].lower()} {period.lower()}")
+        if temp >= HEAT_ADVISORY_F:
+            alerts.setdefault("Heat Advisory", []).append(f"{round(temp)}°F {period.lower()}")
+    if not alerts:
+        return None
+    text = " ".join(f"{title}: {', '.join(when)}." for title, when in alerts.items())
+    return f"{text} (From forecast conditions; official weather alerts are not available.)"
+
+
+def _forecast_from_open_meteo(entry):
+    """Compact forecast from one location of an Open-Meteo ``/v1/forecast`` response."""
+    current = entry["current"]
+    daily = entry["daily"]
+    # daily[0] is today; the catalog's forecast starts tomorrow
+    days = list(zip(daily["temperature_2m_max"][1:], daily["weather_code"][1:]))
+    return {
+        "alert": _alert_from_open_meteo(current, daily),
+        "current": {
+            "temp": round(current["temperature_2m"]),
+            "condition": WMO_CONDITIONS.get(current["weather_code"], "Unknown"),
+            "humidity": round(current["relative_humidity_2m"]),
+        },
+        "forecast": [
+            {"day": day, "temp": round(temp), "condition": WMO_CONDITIONS.get(code, "Unknown")}
+            for day, (temp, code) in zip(FORECAST_DAYS, days)
+        ],
+    }
+
+
+class OpenMeteoProvider(WeatherProvider):
+    """Forecasts from an Open-Meteo compatible API, many locations per request.
+
+    Alerts are derived from the forecast (see ``WMO_ALERTS``); the API has
+    no official warnings.
+
+    Args:
+        locate: Returns ``(lat, lon)`` for a city key, or None if unknown.
+        base_url: API root, e.g. ``https://api.open-meteo.com`` or a stand-in server.
+        session: ``requests`` session to send through, e.g. ``HttpPool.session()``.
+        batch_size: Most coordinates per request; 1 sends one request per location.
+        max_workers: Requests sent at once.
+        timeout: Seconds per request.
+    """
+
+    name = "open-meteo"
+
+    def __init__(self, locate, base_url="https://api.open-meteo.com", session=None, batch_size=50,
+                 max_workers=8, timeout=10.0):
+        super().__init__(max_workers=max_workers)
+        self.locate = locate
+        self.base_url = base_url.rstrip("/")
+        self.session = session if session is not None else requests.Session()
+        self.batch_size = batch_size
+        self.timeout = timeout
+
+    def _request(self, points):
+        response = self.session.get(
+            f"{self.base_url}/v1/forecast",
+            params={
+                "latitude": ",".join(f"{lat:.4f}" for lat, _ in points),
+                "longitude": ",".join(f"{lon:.4f}" for _, lon in points),
+                "current": "temperature_2m,relative_humidity_2m,weather_code",
+                "daily": "temperature_2m_max,weather_code",
+                "temperature_unit": "fahrenheit",
+                "forecast_days": len(FORECAST_DAYS) + 1,
+                "timezone": "auto",
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        body = response.json()
+        # One location answers with an object, several with a list in request order
+        entries = body if isinstance(body, list) else [body]
+        if len(entries) != len(points):
+            raise ValueError(f"Weather API answered {len(entries)} locations for {len(points)} requested")
+        return [_forecast_from_open_meteo(entry) for entry in entries]
+
+    def fetch(self, location):
+        point = self.locate(location)
+        return None if point is None else self._request([point])[0]
+
+    def fetch_many(self, locations):
+        points = {location: self.locate(location) for location in locations}
+        known = [location for location in locations if points[location] is not None]
+        results = {location: None for location in locations}
+        if self.batch_size <= 1:
+            results.update(super().fetch_many(known))
+            return results
+
+        def request(batch):
+            return self._request([points[location] for location in batch])
+
+        batches = [known[start:start + self.batch_size] for start in range(0, len(known), self.batch_size)]
+        run = map if len(batches) <= 1 or self._pool is None else self._pool.map
+        for batch, forecasts in zip(batches, run(request, batches)):
+            results.update(zip(batch, forecasts))
+        return results
+
+
+class WeatherService:
+    """Hourly cache and request batching in front of a :class:`WeatherProvider`.
+
+    Args:
+        provider: Where forecasts come from.
+        batch_window: Seconds a cache miss waits for concurrent lookups to join
+            its batch; 0 fetches at once. A miss with no other lookup in
+            progress never waits, since nothing could join it.
+        max_batch: Most locations handed to the provider in one call.
+        version: Optional callable whose value is part of every cache key,
+            e.g. the catalog version, so reloaded data is not served stale.
+    """
+
+    def __init__(self, provider, batch_window=0.02, max_batch=50, version=None):
+        self.provider = provider
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.version = version
+        self._cache = {}
+        self._pending = {}
+        self._batch = None
+        self._active = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0, "batches": 0, "fetched": 0, "errors": 0,
+                      "fetch_seconds": 0.0}
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def forecast(self, location):
+        """Forecast for a catalog city key, or None if the provider has no data for it."""
+        return self.forecasts([location])[location]
+
+    def forecasts(self, locations):
+        """Forecasts keyed by location, fetching all cache misses in one batch."""
+        hour = int(time.time() // 3600)
+        version = self.version() if self.version is not None else None
+        results, waiting, leader = {}, {}, False
+        with self._lock:
+            self._active += 1
+            # Forecasts from earlier hours are never read again
+            for key in [key for key in self._cache if key[2] != hour]:
+                del self._cache[key]
+            for location in dict.fromkeys(locations):
+                key = (version, location, hour)
+                if key in self._cache:
+                    self.stats["hits"] += 1
+                    results[location] = self._cache[key]
+                    continue
+                future = self._pending.get(key)
+                if future is None:
+                    self.stats["misses"] += 1
+                    future = self._pending[key] = Future()
+                    if self._batch is None:
+                        self._batch, leader = [], True
+                    self._batch.append((key, future))
+                else:
+                    self.stats["coalesced"] += 1
+                waiting[location] = future
+            # Alone, the leader already holds every location it can batch
+            wait = leader and self.batch_window > 0 and self._active > 1 and len(self._batch) < self.max_batch
+        try:
+            if leader:
+                if wait:
+                    # Let concurrent lookups add their locations to this batch
+                    time.sleep(self.batch_window)
+                self._flush()
+            for location, future in waiting.items():
+                results[location] = future.result()
+        finally:
+            with self._lock:
+                self._active -= 1
+        return results
+
+    def _flush(self):
+        with self._lock:
+            batch, self._batch = self._batch, None
+        for start in range(0, len(batch), self.max_batch):
+            chunk = batch[start:start + self.max_batch]
+            started = time.perf_counter()
+            try:
+                forecasts = self.provider.fetch_many([key[1] for key, _ in chunk])
+            except Exception as e:
+                self.record("errors")
+                for key, future in chunk:
+                    future.set_exception(e)
+            else:
+                with self._lock:
+                    self.stats["batches"] += 1
+                    self.stats["fetched"] += len(chunk)
+                    self.stats["fetch_seconds"] += time.perf_counter() - started
+                    for key, _ in chunk:
+                        self._cache[key] = forecasts.get(key[1])
+                for key, future in chunk:
+                    future.set_result(forecasts.get(key[1]))
+            finally:
+                with self._lock:
+                    for key, _ in chunk:
+                        self._pending.pop(key, None)
@@ -0,0 +1,217 @@
+"""Local stand-in for an Open-Meteo style forecast API.
+
+:class:`WeatherStandIn` serves ``GET /v1/forecast`` from ``weather_fixtures.json``,
+taking ``latency`` seconds per request the way a remote API would. Like
+Open-Meteo it accepts comma-separated ``latitude``/``longitude`` lists and
+answers a list for several locations. Coordinates with no fixture get a
+made-up but stable forecast. It needs no network access, so the weather
+provider's batching and latency can be tried offline::
+
+    python weather_standin.py serve --port 8765 --latency 0.2
+    WEATHER_PROVIDER=open-meteo WEATHER_API_URL=http://127.0.0.1:8765 python app.py
+
+    python weather_standin.py bench --latency 0.2
+
+``bench`` compares one request per city, concurrent requests and batched
+requests against the stand-in, then concurrent tool-style lookups through
+:class:`weather_provider.WeatherService`.
+"""
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weather_fixtures.json")
+
+# Fixtures farther than this from the requested point (about 10 km) do not match
+_MATCH_DEGREES = 0.1
+
+
+class WeatherStandIn:
+    """Threaded HTTP server answering forecast requests from fixtures.
+
+    Args:
+        fixtures: Path of the fixture file.
+        latency: Seconds each request takes before it is answered.
+        host: Interface to listen on.
+        port: Port to listen on; 0 picks a free one.
+    """
+
+    def __init__(self, fixtures=FIXTURES_PATH, latency=0.1, host="127.0.0.1", port=0):
+        with open(fixtures, "r", encoding="utf-8") as stream:
+            self.locations = json.load(stream)["locations"]
+        self.latency = latency
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "locations": 0}
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, name, amount=1):
+        with self._lock:
+            self.stats[name] += amount
+
+    def start(self):
+        """Serve on a background thread; returns the base URL."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="weather-standin", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def serve(self):
+        """Serve on this thread until interrupted."""
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def forecast(self, latitude, longitude, days):
+        """One location of a ``/v1/forecast`` response."""
+        entry = min(
+            self.locations.values(),
+            key=lambda entry: abs(entry["latitude"] - latitude) + abs(entry["longitude"] - longitude),
+        )
+        if abs(entry["latitude"] - latitude) > _MATCH_DEGREES or abs(entry["longitude"] - longitude) > _MATCH_DEGREES:
+            entry = _made_up(latitude, longitude)
+        today = datetime.date.today()
+        return {
+            "latitude": latitude,
+            "longitude": longitude,
+            "current": dict(entry["current"]),
+            "daily": {
+                "time": [(today + datetime.timedelta(days=offset)).isoformat() for offset in range(days)],
+                "temperature_2m_max": entry["daily"]["temperature_2m_max"][:days],
+                "weather_code": entry["daily"]["weather_code"][:days],
+            },
+        }
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                try:
+                    if url.path != "/v1/forecast":
+                        raise LookupError(f"No route {url.path}")
+                    latitudes = [float(value) for value in query["latitude"][0].split(",")]
+                    longitudes = [float(value) for value in query["longitude"][0].split(",")]
+                    if len(latitudes) != len(longitudes):
+                        raise ValueError("latitude and longitude must have the same number of values")
+                    days = int(query.get("forecast_days", ["4"])[0])
+                except (KeyError, LookupError, ValueError) as e:
+                    self._send(404 if isinstance(e, LookupError) else 400, {"error": True, "reason": str(e)})
+                    return
+                time.sleep(standin.latency)
+                standin.record("requests")
+                standin.record("locations", len(latitudes))
+                entries = [standin.forecast(lat, lon, days) for lat, lon in zip(latitudes, longitudes)]
+                self._send(200, entries if len(entries) > 1 else entries[0])
+
+            def _send(self, status, body):
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _made_up(latitude, longitude):
+    """Stable forecast for coordinates without a fixture, warmer further south."""
+    seed = zlib.crc32(f"{latitude:.2f},{longitude:.2f}".encode())
+    base = round(100 - (latitude - 25) * 1.5)
+    codes = [0, 1, 2, 3, 61, 80]
+    return {
+        "current": {"temperature_2m": base - seed % 7, "relative_humidity_2m": 30 + seed % 50,
+                    "weather_code": codes[seed % len(codes)]},
+        "daily": {"temperature_2m_max": [base + (seed >> shift) % 6 for shift in range(4)],
+                  "weather_code": [codes[(seed >> shift) % len(codes)] for shift in range(4)]},
+    }
+
+
+def bench(latency, rounds=3):
+    """Time the ways of fetching every fixture city from a stand-in with ``latency``."""
+    from weather_provider import OpenMeteoProvider, WeatherService
+
+    standin = WeatherStandIn(latency=latency)
+    url = standin.start()
+    points = {city: (entry["latitude"], entry["longitude"]) for city, entry in standin.locations.items()}
+    cities = list(points)
+    print(f"Stand-in at {url}, {latency * 1000:.0f} ms per request, {len(cities)} cities")
+
+    def timed(label, run):
+        before = dict(standin.stats)
+        walls = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            run()
+            walls.append(time.perf_counter() - started)
+        requests = (standin.stats["requests"] - before["requests"]) / rounds
+        print(f"  {label:<34} {min(walls) * 1000:8.1f} ms  {requests:5.1f} requests")
+
+    try:
+        timed("one request per city, in turn", lambda: OpenMeteoProvider(points.get, url, batch_size=1, max_workers=1).fetch_many(cities))
+        timed("one request per city, concurrent", lambda: OpenMeteoProvider(points.get, url, batch_size=1).fetch_many(cities))
+        timed("batched", lambda: OpenMeteoProvider(points.get, url).fetch_many(cities))
+
+        def lookups():
+            # A fresh service each round, so every round misses the cache
+            service = WeatherService(OpenMeteoProvider(points.get, url), batch_window=0.02)
+            threads = [threading.Thread(target=service.forecast, args=(city,)) for city in cities]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            return service
+
+        timed("concurrent lookups, 20 ms window", lookups)
+        service = lookups()
+        timed("same lookups, cached this hour", lambda: [service.forecast(city) for city in cities])
+    finally:
+        standin.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Local stand-in for an Open-Meteo style forecast API.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serve forecasts until interrupted")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--latency", type=float, default=0.1, help="seconds per request")
+    measure = commands.add_parser("bench", help="compare unbatched, concurrent and batched fetches")
+    measure.add_argument("--latency", type=float, default=0.1, help="seconds per request")
+    measure.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        bench(args.latency, args.rounds)
+        return
+    standin = WeatherStandIn(latency=args.latency, host=args.host, port=args.port)
+    print(f"Weather stand-in serving {len(standin.locations)} cities at {standin.url} ({args.latency * 1000:.0f} ms per request)")
+    standin.serve()
+
+
+if __name__ == "__main__":
+    main()